@@ -0,0 +1,144 @@
+"""
+Synthetic Recruitment Corpus Generator
+"""
+
+import os
+import random
+from typing import List, Dict, Any
+
+SKILLS = [
+    'python', 'java', 'javascript', 'typescript', 'react', 'node.js', 'sql', 'postgresql',
+    'mongodb', 'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'machine learning', 'tensorflow',
+    'pytorch', 'pandas', 'flask', 'django', 'spring', 'git', 'linux', 'terraform', 'scala',
+    'spark', 'kafka', 'redis', 'graphql', 'c++', 'go', 'rust', 'excel', 'tableau'
+]
+
+TITLES = [
+    'Software Engineer', 'Data Scientist', 'Backend Developer', 'Frontend Developer',
+    'DevOps Engineer', 'Machine Learning Engineer', 'Data Analyst', 'Full Stack Developer'
+]
+
+VERBS = ['Built', 'Designed', 'Maintained', 'Migrated', 'Optimized', 'Led', 'Automated', 'Deployed']
+
+OBJECTS = [
+    'a payment processing service', 'internal reporting dashboards', 'a recommendation pipeline',
+    'customer-facing REST APIs', 'the CI/CD platform', 'a real-time analytics stack',
+    'data ingestion jobs', 'a microservice architecture'
+]
+
+DEGREES = ["Bachelor's in Computer Science", "Master's in Data Science", 'BSc in Mathematics',
+           "Master's in Software Engineering"]
+
+
+def _sentence(rng: random.Random, skills: List[str]) -> str:
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {' and '.join(rng.sample(skills, min(2, len(skills))))}."
+
+
+def resume_text(rng: random.Random, paragraphs: int = 6) -> Dict[str, Any]:
+    """One synthetic resume as plain text plus its skills"""
+    skills = rng.sample(SKILLS, rng.randint(4, 10))
+    lines = [
+        f"{rng.choice(TITLES)} with {rng.randint(1, 15)} years of experience.",
+        f"Education: {rng.choice(DEGREES)}.",
+        f"Skills: {', '.join(skills)}."
+    ]
+    for _ in range(paragraphs):
+        lines.append(' '.join(_sentence(rng, skills) for _ in range(rng.randint(2, 4))))
+    return {'text': '\n'.join(lines), 'skills': skills}
+
+
+def job_posting(rng: random.Random, job_id: str) -> Dict[str, Any]:
+    """One synthetic job posting"""
+    skills = rng.sample(SKILLS, rng.randint(3, 6))
+    title = rng.choice(TITLES)
+    return {
+        'job_id': job_id,
+        'title': title,
+        'company': f'Company {rng.randint(1, 500)}',
+        'description': f"We are hiring a {title}. " + ' '.join(_sentence(rng, skills) for _ in range(4)),
+        'requirements': {
+            'skills': skills,
+            'experience_years': rng.randint(0, 10),
+            'education': rng.choice(DEGREES)
+        },
+        'location': rng.choice(['Remote', 'London', 'Berlin', 'New York']),
+        'salary_range': {'min': 50000, 'max': 150000}
+    }
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path: str, text: str, lines_per_page: int = 45):
+    """Write text as a minimal single-font PDF, without a PDF library"""
+    lines = [line[i:i + 90] for line in text.splitlines() for i in range(0, max(len(line), 1), 90)]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    font = 3 + 2 * len(pages)
+    objects = [
+        '<< /Type /Catalog /Pages 2 0 R >>',
+        f"<< /Type /Pages /Kids [{' '.join(f'{3 + 2 * i} 0 R' for i in range(len(pages)))}] /Count {len(pages)} >>"
+    ]
+    for i, page in enumerate(pages):
+        stream = 'BT /F1 10 Tf 14 TL 50 750 Td ' + ' '.join(f'({_pdf_escape(line)}) Tj T*' for line in page) + ' ET'
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R '
+                       f'/Resources << /Font << /F1 {font} 0 R >> >> >>')
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream')
+    objects.append('<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f'{number} 0 obj\n{obj}\nendobj\n'.encode('latin-1')
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('ascii')
+    out += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode('ascii')
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode('ascii')
+
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+def write_docx(path: str, text: str, skills: List[str]):
+    """Write text as a DOCX document with a skills table"""
+    from docx import Document
+
+    document = Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    table = document.add_table(rows=len(skills), cols=2)
+    for row, skill in zip(table.rows, skills):
+        row.cells[0].text = skill
+        row.cells[1].text = 'Advanced'
+    document.save(path)
+
+
+def generate_corpus(directory: str, resumes: int = 100, jobs: int = 20, seed: int = 42,
+                    paragraphs: int = 6, formats=('txt', 'pdf', 'docx')) -> Dict[str, Any]:
+    """Generate resumes (as text, and as PDF/DOCX files) and job postings"""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+
+    candidates = []
+    files = {fmt: [] for fmt in formats if fmt != 'txt'}
+    for i in range(resumes):
+        resume = resume_text(rng, paragraphs)
+        candidate_id = f'cand_{i:06d}'
+        candidates.append({'candidate_id': candidate_id, 'resume_text': resume['text'], 'skills': resume['skills']})
+
+        if 'pdf' in files:
+            path = os.path.join(directory, f'{candidate_id}.pdf')
+            write_pdf(path, resume['text'])
+            files['pdf'].append(path)
+        if 'docx' in files:
+            path = os.path.join(directory, f'{candidate_id}.docx')
+            write_docx(path, resume['text'], resume['skills'])
+            files['docx'].append(path)
+
+    return {
+        'candidates': candidates,
+        'jobs': [job_posting(rng, f'job_{i:05d}') for i in range(jobs)],
+        'files': files
+    }
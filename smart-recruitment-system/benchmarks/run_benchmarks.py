@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Smart Recruitment System - Microbenchmarks
+
+Usage:
+    python benchmarks/run_benchmarks.py --resumes 200 --jobs 20 --output results.json
+    python benchmarks/run_benchmarks.py --baseline baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Any, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_corpus
+
+
+class SkipBenchmark(Exception):
+    """Raised when a benchmark cannot run in this environment"""
+
+
+def measure(func: Callable[[], Any], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    """Time repeated calls of func"""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        'median': statistics.median(timings),
+        'min': min(timings),
+        'mean': statistics.mean(timings),
+        'repeat': repeat
+    }
+
+
+def build_benchmarks(corpus: Dict[str, Any], workdir: str) -> Dict[str, Callable[[], Any]]:
+    """Benchmark cases over the generated corpus, by name"""
+    from flask import Flask
+
+    from services.file_processor import extract_text_from_docx, extract_text_from_pdf
+    from services.match_store import MatchStore
+    from services.ml_matcher import MLMatcher
+    from services.nlp_engine import nlp_bp
+    from services.recommendation import RecommendationEngine
+
+    candidates = corpus['candidates']
+    jobs = corpus['jobs']
+    texts = [candidate['resume_text'] for candidate in candidates]
+
+    app = Flask(__name__)
+    app.register_blueprint(nlp_bp, url_prefix='/api/nlp')
+    client = app.test_client()
+
+    def post(path: str, payload: Dict[str, Any]) -> Callable[[], Any]:
+        def call():
+            response = client.post(path, json=payload)
+            if response.status_code != 200:
+                raise SkipBenchmark(response.get_json().get('error', response.status))
+            return response
+        return call
+
+    matcher = MLMatcher()
+    matches = [match for job in jobs for match in matcher.match_job_with_candidates(job, candidates)]
+    engine = RecommendationEngine(store=MatchStore(os.path.join(workdir, 'matches.db')))
+    engine.store.save_matches(matches)
+    job_id = jobs[0]['job_id']
+
+    benchmarks = {
+        'extract_text_from_pdf': lambda: [extract_text_from_pdf(path) for path in corpus['files'].get('pdf', [])],
+        'extract_text_from_docx': lambda: [extract_text_from_docx(path) for path in corpus['files'].get('docx', [])],
+        'nlp.preprocess_text': post('/api/nlp/preprocess-text', {'text': texts[0]}),
+        'nlp.preprocess_text_batch': post('/api/nlp/preprocess-text-batch', {'texts': texts}),
+        'nlp.extract_keywords': post('/api/nlp/extract-keywords', {'text': texts[0]}),
+        'nlp.extract_keywords_batch': post('/api/nlp/extract-keywords-batch', {'texts': texts}),
+        'nlp.extract_skills': post('/api/nlp/extract-skills', {'text': texts[0]}),
+        'nlp.extract_skills_batch': post('/api/nlp/extract-skills-batch', {'texts': texts}),
+        'ml.match_job_with_candidates': lambda: [matcher.match_job_with_candidates(job, candidates) for job in jobs],
+        'recommendation.get_top_candidates': lambda: engine.get_top_candidates(matches, 10),
+        'recommendation.get_top_candidates_for_job': lambda: engine.get_top_candidates_for_job(job_id, 10),
+        'recommendation.generate_report': lambda: engine.generate_recommendation_report(matches)
+    }
+    if not corpus['files'].get('pdf'):
+        del benchmarks['extract_text_from_pdf']
+    if not corpus['files'].get('docx'):
+        del benchmarks['extract_text_from_docx']
+    return benchmarks
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Generate a corpus, run the selected benchmarks and collect results"""
+    workdir = tempfile.mkdtemp(prefix='srs-bench-')
+    os.environ.setdefault('UPLOAD_FOLDER', os.path.join(workdir, 'uploads'))
+    os.environ.setdefault('PROCESSED_FOLDER', os.path.join(workdir, 'processed'))
+
+    corpus = generate_corpus(os.path.join(workdir, 'corpus'), resumes=args.resumes, jobs=args.jobs,
+                             seed=args.seed, paragraphs=args.paragraphs, formats=args.formats)
+    benchmarks = build_benchmarks(corpus, workdir)
+
+    results = {}
+    for name, func in benchmarks.items():
+        if args.filter and not any(pattern in name for pattern in args.filter):
+            continue
+        try:
+            results[name] = measure(func, args.repeat, args.warmup)
+            print(f"{name:45s} {results[name]['median'] * 1000:10.2f} ms")
+        except SkipBenchmark as e:
+            results[name] = {'skipped': str(e)}
+            print(f"{name:45s}    skipped ({e})")
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'resumes': args.resumes,
+            'jobs': args.jobs,
+            'paragraphs': args.paragraphs,
+            'seed': args.seed,
+            'formats': list(args.formats)
+        },
+        'benchmarks': results
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Benchmarks whose median time regressed by more than threshold against the baseline"""
+    regressions = []
+    print(f"\n{'benchmark':45s} {'baseline':>12s} {'current':>12s} {'change':>8s}")
+    for name, current in results['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if not previous or 'median' not in previous or 'median' not in current:
+            continue
+        change = current['median'] / previous['median'] - 1.0 if previous['median'] else 0.0
+        flag = ''
+        if change > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:45s} {previous['median'] * 1000:10.2f}ms {current['median'] * 1000:10.2f}ms "
+              f"{change:+8.1%}{flag}")
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Run Smart Recruitment System microbenchmarks')
+    parser.add_argument('--resumes', type=int, default=100, help='Synthetic resumes to generate')
+    parser.add_argument('--jobs', type=int, default=10, help='Synthetic job postings to generate')
+    parser.add_argument('--paragraphs', type=int, default=6, help='Experience paragraphs per resume')
+    parser.add_argument('--formats', nargs='+', default=['txt', 'pdf', 'docx'], choices=['txt', 'pdf', 'docx'])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per benchmark')
+    parser.add_argument('--warmup', type=int, default=1, help='Untimed runs per benchmark')
+    parser.add_argument('--filter', nargs='*', help='Only run benchmarks whose name contains one of these')
+    parser.add_argument('--output', default='benchmark-results.json', help='Where to write results')
+    parser.add_argument('--baseline', help='Results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed slowdown against the baseline, as a fraction')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    results = run(args)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}: "
+                  f"{', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -18,4 +18,8 @@ if __name__ == '__main__':
     print("Health check: http://localhost:5000/health")
     print("API docs: See README.md")
     
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    app.run(
+        host=os.getenv('FLASK_HOST', '0.0.0.0'),
+        port=int(os.getenv('FLASK_PORT', 5000)),
+        debug=os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
+    )
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Production server for Smart Recruitment System
+
+Runs the app under gunicorn with ``preload_app``: the app, NLP models and
+candidate vectors are loaded once in the master process, and the forked
+workers share that memory copy-on-write. Workers pool their metrics through
+a shared directory, so /metrics reports the whole server.
+"""
+
+import gc
+import os
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from gunicorn.app.base import BaseApplication
+
+from main import create_app, start_background_workers
+from services.file_processor import reset_extraction_pool
+from services.nlp_engine import warmup
+from services.vectorizers import reset_shard_pool
+from utils.config import Config
+from utils.metrics import metrics
+from utils.timing import boot_stage
+
+
+class RecruitmentServer(BaseApplication):
+    """Gunicorn application serving an already created Flask app"""
+
+    def __init__(self, app, options=None):
+        self.application = app
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+
+def post_fork(server, worker):
+    """Start per-process threads in each worker; threads and process pools do not survive fork"""
+    reset_extraction_pool()
+    reset_shard_pool()
+    # Start from empty metrics rather than a copy of the master's
+    metrics.reset()
+    start_background_workers()
+
+
+def main():
+    metrics.multiprocess_dir = Config.METRICS_MULTIPROCESS_DIR or os.path.join(Config.PROCESSED_FOLDER, 'metrics')
+    metrics.clear_multiprocess_dir()
+    
+    app = create_app(background_workers=False)
+
+    # Load the heavy models before forking
+    with boot_stage('preload_models'):
+        timings = warmup(ignore_missing=True)
+    for name, timing in timings.items():
+        if 'error' in timing:
+            print(f"Not preloaded: {name}: {timing['error']}")
+
+    # Keep the preloaded objects out of garbage collection passes, which would
+    # otherwise touch their pages in every worker and undo the sharing
+    gc.freeze()
+
+    options = {
+        'bind': f'{Config.SERVER_HOST}:{Config.SERVER_PORT}',
+        'workers': Config.SERVER_WORKERS,
+        'threads': Config.SERVER_THREADS,
+        'worker_class': 'gthread' if Config.SERVER_THREADS > 1 else 'sync',
+        'timeout': Config.SERVER_TIMEOUT,
+        'preload_app': True,
+        'post_fork': post_fork
+    }
+    print(f"Starting Smart Recruitment System on {options['bind']} "
+          f"with {Config.SERVER_WORKERS} workers x {Config.SERVER_THREADS} threads")
+    RecruitmentServer(app, options).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -4,21 +4,47 @@ Smart Recruitment System - Main Application Entry Point
 """
 
 import os
-from flask import Flask
+import time
+from flask import Flask, Response, g, request
 from flask_cors import CORS
 from dotenv import load_dotenv
 
+from utils.timing import boot_stage, boot_timings
+
 # Load environment variables
 load_dotenv()
 
 # Import blueprints
-from services.file_processor import file_bp
-from services.nlp_engine import nlp_bp
-from services.ml_matcher import ml_bp
-from services.recommendation import rec_bp
+with boot_stage('import_file_processor'):
+    from services.file_processor import file_bp
+with boot_stage('import_nlp_engine'):
+    from services.nlp_engine import nlp_bp, warmup
+with boot_stage('import_ml_matcher'):
+    from services.ml_matcher import ml_bp
+with boot_stage('import_recommendation'):
+    from services.recommendation import rec_bp
+from services.vector_store import candidate_store
+from services.ingestion import ingestion_queue
+from utils.config import Config
+from utils.metrics import PROMETHEUS_MIMETYPE, metrics
+
+def start_background_workers():
+    """Start this process's ingestion, compaction and metrics threads"""
+    # Resume any ingestion jobs left unfinished by a previous run
+    ingestion_queue.start()
+    
+    # Fold incremental candidate updates into new generations in the background
+    candidate_store.start_compaction(Config.VECTOR_COMPACTION_INTERVAL)
+    
+    # Share this process's metrics with the other workers, when configured
+    metrics.start_flushing(Config.METRICS_FLUSH_INTERVAL)
 
-def create_app():
-    """Create and configure the Flask application"""
+def create_app(background_workers=True):
+    """Create and configure the Flask application
+    
+    Pre-fork servers pass ``background_workers=False`` and start the threads
+    in each worker instead, since threads do not survive fork.
+    """
     app = Flask(__name__)
     
     # Configure CORS
@@ -29,12 +55,41 @@ def create_app():
     app.config['UPLOAD_FOLDER'] = os.getenv('UPLOAD_FOLDER', 'src/data/uploads')
     app.config['PROCESSED_FOLDER'] = os.getenv('PROCESSED_FOLDER', 'src/data/processed')
     
+    # Request latency middleware; not installed at all when metrics are disabled
+    if metrics.enabled:
+        @app.before_request
+        def start_request_timer():
+            g.request_start = time.perf_counter()
+        
+        @app.after_request
+        def record_request_latency(response):
+            start = g.pop('request_start', None)
+            if start is not None:
+                metrics.observe(
+                    'http_request_duration_seconds', time.perf_counter() - start,
+                    endpoint=request.url_rule.rule if request.url_rule else 'unmatched',
+                    method=request.method, status=response.status_code
+                )
+            return response
+    
     # Register blueprints
     app.register_blueprint(file_bp, url_prefix='/api/files')
     app.register_blueprint(nlp_bp, url_prefix='/api/nlp')
     app.register_blueprint(ml_bp, url_prefix='/api/ml')
     app.register_blueprint(rec_bp, url_prefix='/api/recommendations')
     
+    # Memory-map the persisted candidate vectors
+    with boot_stage('load_candidate_store'):
+        candidate_store.load()
+    
+    # Models load lazily on first use unless preloading is requested
+    if Config.NLP_PRELOAD:
+        with boot_stage('nlp_warmup'):
+            warmup()
+    
+    if background_workers:
+        start_background_workers()
+    
     # Health check endpoint
     @app.route('/')
     def index():
@@ -44,6 +99,14 @@ def create_app():
     def health_check():
         return {'status': 'healthy', 'service': 'smart-recruitment-system'}
     
+    @app.route('/metrics')
+    def metrics_endpoint():
+        return Response(metrics.render(), content_type=PROMETHEUS_MIMETYPE)
+    
+    @app.route('/health/startup')
+    def startup_timings():
+        return {'boot_timings': boot_timings, 'total_seconds': round(sum(boot_timings.values()), 6)}
+    
     return app
 
 if __name__ == '__main__':
@@ -51,5 +114,5 @@ if __name__ == '__main__':
     app.run(
         host=os.getenv('FLASK_HOST', '0.0.0.0'),
         port=int(os.getenv('FLASK_PORT', 5000)),
-        debug=os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
+        debug=os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     )
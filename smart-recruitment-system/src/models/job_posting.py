@@ -3,8 +3,18 @@ Job Posting Data Model
 """
 
 from dataclasses import dataclass
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import json
+import re
+
+# Education requirements by ordinal level, most advanced first
+EDUCATION_LEVELS = [
+    (5, r'\b(phd|ph\.d|doctorate|doctoral)\b'),
+    (4, r"\b(master'?s?|msc|m\.sc|mba|m\.s)\b"),
+    (3, r"\b(bachelor'?s?|bsc|b\.sc|ba|b\.a|bs|b\.s|degree)\b"),
+    (2, r'\bassociate'),
+    (1, r'\b(high school|diploma|ged)\b')
+]
 
 @dataclass
 class JobPosting:
@@ -56,3 +66,19 @@ class JobPosting:
     def get_required_education(self) -> str:
         """Get required education"""
         return self.requirements.get('education', "")
+    
+    def get_required_experience_years(self) -> Optional[float]:
+        """Minimum years of experience, from 'experience_years' or text such as '3+ years'"""
+        years = self.requirements.get('experience_years')
+        if isinstance(years, (int, float)) and not isinstance(years, bool):
+            return float(years)
+        match = re.search(r'\d+(?:\.\d+)?', str(years if years is not None else self.get_required_experience()))
+        return float(match.group()) if match else None
+    
+    def get_required_education_level(self) -> Optional[int]:
+        """Ordinal education level (see EDUCATION_LEVELS), or None when unspecified"""
+        education = self.get_required_education().lower()
+        for level, pattern in EDUCATION_LEVELS:
+            if re.search(pattern, education):
+                return level
+        return None
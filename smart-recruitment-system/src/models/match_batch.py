@@ -0,0 +1,149 @@
+"""
+Match Result Batch Data Model
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+import numpy as np
+
+from models.match_result import MatchResult
+
+# One record per candidate; 'candidate' indexes candidate_ids and skill_offsets
+MATCH_DTYPE = np.dtype([
+    ('candidate', np.int64),
+    ('match_score', np.float64),
+    ('skill_match_score', np.float64),
+    ('experience_match_score', np.float64),
+    ('education_match_score', np.float64),
+    ('overall_match_score', np.float64)
+])
+
+@dataclass
+class MatchResultBatch:
+    """Columnar match results of one job against a candidate pool
+
+    Scores live in a NumPy structured array. Matched skills are stored as
+    indices into ``job_skills``, with the skills of candidate ``i`` at
+    ``skill_indices[skill_offsets[i]:skill_offsets[i + 1]]``. Sorting and
+    filtering only reorder ``records``; dicts and ``MatchResult`` objects are
+    built on demand for the rows that are returned.
+    """
+    job_id: Optional[str]
+    job_skills: List[str]
+    candidate_ids: List[str]
+    records: np.ndarray
+    skill_indices: np.ndarray
+    skill_offsets: np.ndarray
+
+    @classmethod
+    def from_scores(cls, job_data: Dict[str, Any], candidate_ids: List[str], candidate_skill_lists: List[List[str]],
+                    similarities: np.ndarray, weights: Dict[str, float],
+                    skill_matches: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> 'MatchResultBatch':
+        """Score a candidate pool given its text similarities
+
+        ``skill_matches`` may supply the matched skill indices and offsets
+        already, e.g. from a SkillIndex, in place of ``candidate_skill_lists``.
+        """
+        required_skills = job_data.get('requirements', {}).get('skills', [])
+        job_skills = list(dict.fromkeys(required_skills))
+
+        if skill_matches is not None:
+            skill_indices, skill_offsets = skill_matches
+        else:
+            # Matched skills as index offsets
+            skill_index = {skill: i for i, skill in enumerate(job_skills)}
+            skill_indices = []
+            skill_offsets = np.zeros(len(candidate_ids) + 1, dtype=np.int64)
+            for i, candidate_skills in enumerate(candidate_skill_lists):
+                matched = sorted({skill_index[skill] for skill in candidate_skills if skill in skill_index})
+                skill_indices.extend(matched)
+                skill_offsets[i + 1] = len(skill_indices)
+
+        records = np.zeros(len(candidate_ids), dtype=MATCH_DTYPE)
+        records['candidate'] = np.arange(len(candidate_ids))
+        records['match_score'] = np.asarray(similarities, dtype=np.float64)
+        if required_skills:
+            records['skill_match_score'] = np.diff(skill_offsets) / len(required_skills)
+        records['experience_match_score'] = 0.5  # Placeholder
+        records['education_match_score'] = 0.5  # Placeholder
+        records['overall_match_score'] = (
+            records['match_score'] * weights['text'] +
+            records['skill_match_score'] * weights['skills'] +
+            records['experience_match_score'] * weights['experience'] +
+            records['education_match_score'] * weights['education']
+        )
+
+        return cls(
+            job_id=job_data.get('job_id'),
+            job_skills=job_skills,
+            candidate_ids=list(candidate_ids),
+            records=records,
+            skill_indices=np.asarray(skill_indices, dtype=np.int64),
+            skill_offsets=skill_offsets
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _with_records(self, records: np.ndarray) -> 'MatchResultBatch':
+        return MatchResultBatch(self.job_id, self.job_skills, self.candidate_ids, records,
+                                self.skill_indices, self.skill_offsets)
+
+    def sorted(self) -> 'MatchResultBatch':
+        """Order by overall match score, highest first (stable for ties)"""
+        order = np.argsort(-self.records['overall_match_score'], kind='stable')
+        return self._with_records(self.records[order])
+
+    def threshold(self, min_score: float) -> 'MatchResultBatch':
+        """Keep matches with an overall score of at least min_score"""
+        return self._with_records(self.records[self.records['overall_match_score'] >= min_score])
+
+    def top_k(self, k: int) -> 'MatchResultBatch':
+        """The k best matches, sorted"""
+        if k >= len(self.records):
+            return self.sorted()
+        if k <= 0:
+            return self._with_records(self.records[:0])
+        best = np.argpartition(-self.records['overall_match_score'], k - 1)[:k]
+        return self._with_records(self.records[best]).sorted()
+
+    def matched_skills(self, candidate: int) -> List[str]:
+        start, end = self.skill_offsets[candidate], self.skill_offsets[candidate + 1]
+        return [self.job_skills[i] for i in self.skill_indices[start:end]]
+
+    def missing_skills(self, candidate: int) -> List[str]:
+        start, end = self.skill_offsets[candidate], self.skill_offsets[candidate + 1]
+        matched = set(self.skill_indices[start:end].tolist())
+        return [skill for i, skill in enumerate(self.job_skills) if i not in matched]
+
+    def iter_match_results(self) -> Iterator[MatchResult]:
+        """Lazily convert rows to MatchResult objects"""
+        for record in self.records:
+            candidate = int(record['candidate'])
+            yield MatchResult(
+                job_id=self.job_id,
+                candidate_id=self.candidate_ids[candidate],
+                match_score=float(record['match_score']),
+                skill_match_score=float(record['skill_match_score']),
+                experience_match_score=float(record['experience_match_score']),
+                education_match_score=float(record['education_match_score']),
+                overall_match_score=float(record['overall_match_score']),
+                matched_skills=self.matched_skills(candidate),
+                missing_skills=self.missing_skills(candidate)
+            )
+
+    def to_match_results(self) -> List[MatchResult]:
+        """Convert every row to a MatchResult"""
+        return list(self.iter_match_results())
+
+    def iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        """Lazily convert rows to the match dicts returned by the API"""
+        for result in self.iter_match_results():
+            match = result.to_dict()
+            del match['explanation']
+            yield match
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Convert every row to the match dict returned by the API"""
+        return list(self.iter_dicts())
@@ -0,0 +1,167 @@
+"""
+Corpus Statistics Service
+"""
+
+import heapq
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from typing import List, Dict, Iterable, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+from utils.config import Config
+from utils.metrics import metrics
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS corpus_terms (
+    term TEXT PRIMARY KEY,
+    df INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS corpus_documents (
+    doc_key TEXT PRIMARY KEY,
+    terms TEXT NOT NULL,
+    length INTEGER NOT NULL
+);
+"""
+
+SCORING_METHODS = ('tfidf', 'bm25')
+
+# Stay below SQLite's bound parameter limit
+LOOKUP_CHUNK = 500
+
+
+class CorpusStats:
+    """Document frequencies over every ingested resume and job posting
+
+    Each document is recorded once under a stable key (the upload's content
+    hash, or the job ID) with its distinct terms, so re-ingesting a document
+    is a no-op and replacing a job posting swaps its terms' counts. Keyword
+    extraction weights a document's term counts by these frequencies.
+    """
+
+    def __init__(self, db_path: str, k1: float = 1.2, b: float = 0.75):
+        self.db_path = db_path
+        self.k1 = k1
+        self.b = b
+        # Three-letter minimum, like the frequency keyword extractor
+        self.analyzer = CountVectorizer(stop_words='english', token_pattern=r'(?u)\b\w\w\w+\b').build_analyzer()
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        self._ensure_schema()
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _ensure_schema(self):
+        if self._initialized:
+            return
+        with self._lock:
+            if not self._initialized:
+                os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+                with closing(sqlite3.connect(self.db_path, timeout=30)) as connection:
+                    connection.execute('PRAGMA journal_mode=WAL')
+                    connection.executescript(SCHEMA)
+                self._initialized = True
+
+    def add_documents(self, documents: Iterable[Tuple[str, str]]) -> int:
+        """Count (key, text) documents into the corpus; returns how many changed it"""
+        changed = 0
+        with closing(self._connect()) as connection, connection:
+            for doc_key, text in documents:
+                tokens = self.analyzer(text or '')
+                terms = ' '.join(sorted(set(tokens)))
+                row = connection.execute(
+                    'SELECT terms FROM corpus_documents WHERE doc_key = ?', (doc_key,)
+                ).fetchone()
+                if row is not None:
+                    if row[0] == terms:
+                        continue
+                    connection.executemany(
+                        'UPDATE corpus_terms SET df = df - 1 WHERE term = ?', ((term,) for term in row[0].split())
+                    )
+                connection.executemany(
+                    'INSERT INTO corpus_terms (term, df) VALUES (?, 1) '
+                    'ON CONFLICT(term) DO UPDATE SET df = df + 1', ((term,) for term in terms.split())
+                )
+                connection.execute(
+                    'INSERT OR REPLACE INTO corpus_documents (doc_key, terms, length) VALUES (?, ?, ?)',
+                    (doc_key, terms, len(tokens))
+                )
+                changed += 1
+        return changed
+
+    def totals(self) -> Tuple[int, int]:
+        """Number of documents and their total length in terms"""
+        with closing(self._connect()) as connection:
+            n_docs, total_length = connection.execute(
+                'SELECT COUNT(*), COALESCE(SUM(length), 0) FROM corpus_documents'
+            ).fetchone()
+        return n_docs, total_length
+
+    def document_frequencies(self, terms: List[str]) -> np.ndarray:
+        """Document frequency of each term, zero for terms never seen"""
+        found: Dict[str, int] = {}
+        with closing(self._connect()) as connection:
+            for start in range(0, len(terms), LOOKUP_CHUNK):
+                chunk = terms[start:start + LOOKUP_CHUNK]
+                found.update(connection.execute(
+                    f"SELECT term, df FROM corpus_terms WHERE term IN ({', '.join('?' * len(chunk))})", chunk
+                ))
+        return np.array([found.get(term, 0) for term in terms], dtype=np.float64)
+
+    @metrics.timed('nlp.extract_keywords_corpus')
+    def top_keywords(self, texts: List[str], scoring: str = 'bm25', top_n: int = 20,
+                     chunk_size: int = 1000) -> List[List[Tuple[str, float]]]:
+        """Top keywords of each document, weighted by corpus document frequencies"""
+        if scoring not in SCORING_METHODS:
+            raise ValueError(f'Unknown keyword scoring: {scoring}')
+
+        n_docs, total_length = self.totals()
+        results = []
+        for start in range(0, len(texts), chunk_size):
+            results.extend(self._score_chunk(texts[start:start + chunk_size], scoring, top_n, n_docs, total_length))
+        return results
+
+    def _score_chunk(self, texts: List[str], scoring: str, top_n: int,
+                     n_docs: int, total_length: int) -> List[List[Tuple[str, float]]]:
+        vectorizer = CountVectorizer(analyzer=self.analyzer)
+        try:
+            counts = vectorizer.fit_transform([text or '' for text in texts])
+        except ValueError:  # No document has a single term
+            return [[] for _ in texts]
+        terms = vectorizer.get_feature_names_out().tolist()
+        df = self.document_frequencies(terms)
+        tf = counts.data.astype(np.float64)
+
+        if scoring == 'tfidf':
+            # Smooth IDF, as computed by scikit-learn's TfidfTransformer
+            idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+            scores = tf * idf[counts.indices]
+        else:
+            idf = np.log1p((np.maximum(n_docs - df, 0.0) + 0.5) / (df + 0.5))
+            lengths = np.asarray(counts.sum(axis=1), dtype=np.float64).ravel()
+            # At least one term, so a corpus of empty documents cannot divide by zero
+            average_length = max(total_length / n_docs if n_docs else lengths.mean(), 1.0)
+            norms = self.k1 * (1.0 - self.b + self.b * lengths / average_length)
+            scores = idf[counts.indices] * tf * (self.k1 + 1.0) / (tf + np.repeat(norms, np.diff(counts.indptr)))
+
+        results = []
+        indptr, indices = counts.indptr, counts.indices
+        for row in range(counts.shape[0]):
+            start, end = indptr[row], indptr[row + 1]
+            row_scores = scores[start:end]
+            # Partition out the top_n candidates, then rank only those
+            if end - start > top_n:
+                best = np.argpartition(-row_scores, top_n - 1)[:top_n]
+            else:
+                best = np.arange(end - start)
+            ranked = heapq.nlargest(top_n, best.tolist(), key=row_scores.__getitem__)
+            results.append([(terms[indices[start + i]], float(row_scores[i])) for i in ranked])
+        return results
+
+
+# Initialize corpus statistics
+corpus_stats = CorpusStats(os.path.join(Config.PROCESSED_FOLDER, 'corpus.db'), k1=Config.BM25_K1, b=Config.BM25_B)
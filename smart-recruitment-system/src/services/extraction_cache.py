@@ -0,0 +1,128 @@
+"""
+Extraction Cache Service
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from utils.config import Config
+
+
+class ExtractionCache:
+    """Content-addressed cache of extracted text and skills
+
+    Entries are JSON files named after the SHA-256 of the uploaded bytes.
+    The total size on disk is bounded; the least recently used entries are
+    evicted first, using file modification time as the access clock so the
+    order survives restarts.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, int]' = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(content: bytes) -> str:
+        """Content hash used as the cache key"""
+        return hashlib.sha256(content).hexdigest()
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], f'{digest}.json')
+
+    def _load_index(self):
+        """Rebuild the in-memory LRU index from the files on disk"""
+        if self._loaded:
+            return
+        entries = []
+        if os.path.isdir(self.directory):
+            for root, _, names in os.walk(self.directory):
+                for name in names:
+                    if name.endswith('.json'):
+                        stat = os.stat(os.path.join(root, name))
+                        entries.append((stat.st_mtime, name[:-5], stat.st_size))
+        for _, digest, size in sorted(entries):
+            self._entries[digest] = size
+            self._total_bytes += size
+        self._loaded = True
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Return the cached record for a digest, or None on a miss"""
+        with self._lock:
+            self._load_index()
+            path = self._path(digest)
+            try:
+                with open(path) as f:
+                    record = json.load(f)
+                os.utime(path)
+            except (OSError, ValueError):
+                self._forget(digest)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return record
+
+    def put(self, digest: str, record: Dict[str, Any]):
+        """Store a record and evict old entries beyond the size limit"""
+        payload = json.dumps(record).encode('utf-8')
+        path = self._path(digest)
+
+        with self._lock:
+            self._load_index()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+
+            self._forget(digest)
+            self._entries[digest] = len(payload)
+            self._total_bytes += len(payload)
+            self._evict()
+
+    def _forget(self, digest: str):
+        size = self._entries.pop(digest, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits"""
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            digest, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(digest))
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters for this process"""
+        with self._lock:
+            self._load_index()
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'size_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+
+# Initialize extraction cache
+extraction_cache = ExtractionCache(
+    os.path.join(Config.PROCESSED_FOLDER, 'extraction_cache'),
+    Config.EXTRACTION_CACHE_MAX_BYTES
+)
@@ -2,46 +2,483 @@
 File Processing Service
 """
 
+import io
 import os
+import re
+import signal
+import threading
+import time
 import uuid
-from flask import Blueprint, request, jsonify
+import zipfile
+from xml.etree import ElementTree
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from flask import Blueprint, request, jsonify, url_for
 from werkzeug.utils import secure_filename
 import PyPDF2
 from docx import Document
-import magic
+
+try:
+    import magic
+except ImportError:  # python-magic or libmagic missing; fall back to file signatures
+    magic = None
+
+from models.job_posting import JobPosting
+from services.corpus_stats import corpus_stats
+from services.extraction_cache import extraction_cache
+from services.ingestion import ingestion_queue
+from services.job_store import job_store, job_text
+from services.skill_extractor import get_skill_extractor
+from utils.config import Config
+from utils.metrics import metrics
+from utils.streaming import excluded_fields, iter_json_array, ndjson_response, wants_ndjson, without_fields
 
 file_bp = Blueprint('file_processor', __name__)
 
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc'}
 MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB
 
+# Sniffed MIME types and the extractor each is routed to
+MIME_TYPES = {
+    'application/pdf': 'pdf',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': 'docx'
+}
+LEGACY_DOC_MIME_TYPES = {'application/msword', 'application/x-ole-storage', 'application/cdfv2'}
+
+# WordprocessingML elements read by the fast DOCX extractor
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_P, _W_T, _W_TAB = f'{_W}p', f'{_W}t', f'{_W}tab'
+_W_BREAKS = {f'{_W}br', f'{_W}cr'}
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+_DOCX_HEADER = re.compile(r'word/header\d*\.xml')
+
+_extraction_pool = None
+_extraction_pool_lock = threading.Lock()
+_persist_pool = None
+
+def get_extraction_pool():
+    """Return the shared process pool used for text extraction"""
+    global _extraction_pool
+    if _extraction_pool is None:
+        with _extraction_pool_lock:
+            if _extraction_pool is None:
+                _extraction_pool = ProcessPoolExecutor(max_workers=Config.EXTRACTION_WORKERS)
+    return _extraction_pool
+
+def reset_extraction_pool(broken=None, terminate=False):
+    """Discard the process pool, e.g. after a worker crashed or hung
+    
+    With ``broken``, the pool is only discarded if it is still the current
+    one, so concurrent failures replace it once. ``terminate`` kills the old
+    workers, since a worker stuck in a parse never frees its slot otherwise.
+    """
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if broken is not None and _extraction_pool is not broken:
+            pool = broken
+        else:
+            pool, _extraction_pool = _extraction_pool, None
+    if pool is not None:
+        processes = list((pool._processes or {}).values()) if terminate else []
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+def get_persist_pool():
+    """Return the thread pool that writes uploaded originals to disk"""
+    global _persist_pool
+    if _persist_pool is None:
+        with _extraction_pool_lock:
+            if _persist_pool is None:
+                _persist_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='upload-persist')
+    return _persist_pool
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def extract_text_from_pdf(file_path):
-    """Extract text from PDF file"""
+def detect_file_type(content):
+    """Sniff the real type of an upload from its leading bytes
+    
+    Returns 'pdf', 'docx', 'doc' (legacy Word) or None when unsupported.
+    """
+    header = content[:Config.UPLOAD_SNIFF_BYTES]
+    mime_type = magic.from_buffer(header, mime=True) if magic is not None else None
+    
+    if mime_type in MIME_TYPES:
+        return MIME_TYPES[mime_type]
+    if mime_type in LEGACY_DOC_MIME_TYPES or header.startswith(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'):
+        return 'doc'
+    if header.lstrip()[:5] == b'%PDF-':
+        return 'pdf'
+    if header.startswith(b'PK\x03\x04'):
+        # A generic ZIP is only a DOCX if it holds a Word document part
+        try:
+            with zipfile.ZipFile(io.BytesIO(content)) as archive:
+                archive.getinfo('word/document.xml')
+            return 'docx'
+        except (zipfile.BadZipFile, KeyError):
+            return None
+    return None
+
+def _as_stream(source):
+    """Wrap in-memory content as a file object; paths and streams pass through"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+def iter_pdf_text(source, max_pages=None, max_chars=None):
+    """Yield PDF text page by page, stopping early at the page or character limit
+    
+    ``source`` is a file path, a binary stream or the file's bytes.
+    """
+    max_pages = Config.PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = Config.PDF_MAX_CHARS if max_chars is None else max_chars
+    
+    pdf_reader = PyPDF2.PdfReader(_as_stream(source))
+    total_chars = 0
+    
+    for page_number, page in enumerate(pdf_reader.pages):
+        if max_pages and page_number >= max_pages:
+            break
+        
+        text = page.extract_text() or ""
+        if max_chars and total_chars + len(text) > max_chars:
+            text = text[:max_chars - total_chars]
+        total_chars += len(text)
+        
+        yield text
+        
+        if max_chars and total_chars >= max_chars:
+            break
+
+def extract_text_from_pdf(source, max_pages=None, max_chars=None):
+    """Extract text from a PDF path, stream or bytes"""
     try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text.strip()
+        return "\n".join(iter_pdf_text(source, max_pages, max_chars)).strip()
     except Exception as e:
         raise Exception(f"Error extracting text from PDF: {str(e)}")
 
-def extract_text_from_docx(file_path):
-    """Extract text from DOCX file"""
+def _iter_wordml_paragraphs(stream):
+    """Yield the paragraph texts of a WordprocessingML part in document order
+    
+    Table cells and text boxes are made of paragraphs too, so they are
+    included; a text box is yielded just before the paragraph anchoring it.
+    VML fallback copies of text boxes are skipped.
+    """
+    buffers = []
+    fallback_depth = 0
+    
+    for event, element in ElementTree.iterparse(stream, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            if tag == _W_P:
+                buffers.append([])
+            elif tag == _MC_FALLBACK:
+                fallback_depth += 1
+            continue
+        
+        if tag == _MC_FALLBACK:
+            fallback_depth -= 1
+        elif fallback_depth or not buffers:
+            pass
+        elif tag == _W_T:
+            buffers[-1].append(element.text or '')
+        elif tag == _W_TAB:
+            buffers[-1].append('\t')
+        elif tag in _W_BREAKS:
+            buffers[-1].append('\n')
+        elif tag == _W_P:
+            yield ''.join(buffers.pop())
+            if not buffers:
+                element.clear()  # Free finished top-level paragraphs
+
+def _extract_docx_xml(source):
+    """Fast path: stream headers and the main document part out of the zip"""
+    with zipfile.ZipFile(_as_stream(source)) as archive:
+        names = set(archive.namelist())
+        headers = sorted(name for name in names if _DOCX_HEADER.fullmatch(name))
+        lines = []
+        for name in headers + ['word/document.xml']:
+            with archive.open(name) as part:
+                lines.extend(_iter_wordml_paragraphs(part))
+    return '\n'.join(lines).strip()
+
+def _extract_docx_object_model(source):
+    """Fallback through python-docx for files the fast path cannot read"""
+    doc = Document(_as_stream(source))
+    lines = [paragraph.text for section in doc.sections for paragraph in section.header.paragraphs]
+    lines.extend(paragraph.text for paragraph in doc.paragraphs)
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                lines.extend(paragraph.text for paragraph in cell.paragraphs)
+    return '\n'.join(lines).strip()
+
+def extract_text_from_docx(source):
+    """Extract text from a DOCX path, stream or bytes, including tables, headers and text boxes"""
     try:
-        doc = Document(file_path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text.strip()
+        try:
+            return _extract_docx_xml(source)
+        except (zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+            if hasattr(source, 'seek'):
+                source.seek(0)
+            return _extract_docx_object_model(source)
     except Exception as e:
         raise Exception(f"Error extracting text from DOCX: {str(e)}")
 
+def extract_text(source, file_extension):
+    """Extract text from a path, stream or bytes based on file type"""
+    if file_extension == 'pdf':
+        return extract_text_from_pdf(source)
+    elif file_extension in ['docx', 'doc']:
+        return extract_text_from_docx(source)
+    raise ValueError(f"Unsupported file type: {file_extension}")
+
+def _timed_extract_text(content, file_type):
+    """Extract text from in-memory content in a worker process, returning it with the time taken"""
+    start = time.perf_counter()
+    text = extract_text(content, file_type)
+    return text, time.perf_counter() - start
+
+class ExtractionTimeout(Exception):
+    """Raised when a file's text extraction runs past EXTRACTION_TIMEOUT"""
+
+def _extract_with_deadline(content, file_type, timeout):
+    """Run _timed_extract_text in a worker, interrupting it once it runs past the timeout
+    
+    The alarm fails only this file and leaves the worker to take the next
+    one. It cannot interrupt a parse stuck inside a C extension; those are
+    left to the caller's backstop.
+    """
+    if not timeout or not hasattr(signal, 'setitimer'):
+        return _timed_extract_text(content, file_type)
+    
+    expired = []
+    def expire(signum, frame):
+        expired.append(True)
+        raise ExtractionTimeout()
+    
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return _timed_extract_text(content, file_type)
+    except Exception:
+        # The extractors wrap their errors, so check whether the alarm caused this one
+        if expired:
+            raise ExtractionTimeout() from None
+        raise
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+class ExtractionBatch:
+    """One request's extractions on the shared process pool
+    
+    Each file gets EXTRACTION_TIMEOUT in its worker. Only a worker stuck past
+    EXTRACTION_KILL_GRACE more forces the pool to be replaced, which loses
+    every request's in-flight work; each batch then resubmits all of its own
+    lost files to the new pool at once, each at most once.
+    """
+    
+    def __init__(self):
+        self.pool = get_extraction_pool()
+        self.tasks = []
+        self.futures = []
+        self.retried = set()
+    
+    def _submit(self, content, file_type):
+        return self.pool.submit(_extract_with_deadline, content, file_type, Config.EXTRACTION_TIMEOUT)
+    
+    def submit(self, content, file_type):
+        """Queue a file for extraction, returning its task number"""
+        self.tasks.append((content, file_type))
+        self.futures.append(self._submit(content, file_type))
+        return len(self.futures) - 1
+    
+    def result(self, task):
+        """Wait for a file's (text, seconds), raising ExtractionTimeout or the extraction error"""
+        while True:
+            future = self.futures[task]
+            try:
+                return future.result(timeout=Config.EXTRACTION_TIMEOUT + Config.EXTRACTION_KILL_GRACE)
+            except FutureTimeoutError:
+                if not future.running():
+                    continue  # Still queued behind other work; its deadline starts when it runs
+                # The worker's own deadline did not fire, so it is stuck outside Python
+                self._replace_pool(failed=task)
+                raise ExtractionTimeout() from None
+            except (BrokenProcessPool, CancelledError):
+                if task in self.retried:
+                    raise
+                self._replace_pool()
+    
+    def _replace_pool(self, failed=None):
+        """Replace a broken or stuck pool and resubmit every file of the batch it took down"""
+        reset_extraction_pool(broken=self.pool, terminate=True)
+        self.pool = get_extraction_pool()
+        for task, future in enumerate(self.futures):
+            if task == failed or task in self.retried or not _lost(future):
+                continue
+            self.retried.add(task)
+            self.futures[task] = self._submit(*self.tasks[task])
+
+def _lost(future):
+    """Whether a future's extraction was lost with its pool"""
+    if future.cancelled() or not future.done():
+        return True
+    return isinstance(future.exception(), BrokenProcessPool)
+
+def _persist_upload(file_path, content):
+    """Write an uploaded original atomically"""
+    temp_path = f'{file_path}.part'
+    with open(temp_path, 'wb') as f:
+        f.write(content)
+    os.replace(temp_path, file_path)
+
+def process_resumes(uploads, upload_dir):
+    """Extract (filename, content) uploads, returning an iterator of per-file results in order
+    
+    The file type is sniffed from the content rather than trusted from the
+    extension, and unsupported files are rejected before any parsing. Workers
+    parse the content from memory; the original is written to ``upload_dir``
+    in the background when ``PERSIST_UPLOADS`` is set. All files are submitted
+    for extraction before this returns; the iterator yields each result as
+    soon as it and its predecessors are ready. Files already seen are served
+    from the content-addressed extraction cache without being parsed or
+    stored again. Failed files yield a dict with an 'error' key.
+    """
+    batch = ExtractionBatch()
+    pending = []
+    in_flight = {}
+    
+    for original_filename, content in uploads:
+        filename = secure_filename(original_filename or '') or 'upload'
+        declared_type = filename.rsplit('.', 1)[1].lower() if '.' in filename else None
+        with metrics.span('extract.sniff'):
+            file_type = detect_file_type(content)
+        if file_type is None:
+            pending.append(({'filename': original_filename or '', 'error': 'Unsupported file type'}, None))
+            continue
+        if file_type == 'doc':
+            pending.append(({'filename': original_filename, 'error': 'Legacy .doc files are not supported; upload DOCX or PDF'}, None))
+            continue
+        
+        content_hash = extraction_cache.digest(content)
+        
+        # Serve repeated uploads from the cache
+        cached = extraction_cache.get(content_hash)
+        if cached is not None:
+            pending.append((dict(cached, filename=filename, cached=True), None))
+            continue
+        
+        # Identical files within one batch share a single extraction
+        if content_hash in in_flight:
+            pending.append(({'filename': filename, 'content_hash': content_hash}, in_flight[content_hash]))
+            continue
+        
+        file_id = str(uuid.uuid4())
+        file_path = None
+        if Config.PERSIST_UPLOADS:
+            # Keep the original off the request path
+            os.makedirs(upload_dir, exist_ok=True)
+            file_path = os.path.join(upload_dir, f"{file_id}_{filename}")
+            get_persist_pool().submit(_persist_upload, file_path, content)
+        
+        # Extract text from memory in a worker process
+        task = batch.submit(content, file_type)
+        in_flight[content_hash] = task
+        file_info = {
+            'file_id': file_id,
+            'filename': filename,
+            'file_type': file_type,
+            'file_path': file_path,
+            'content_hash': content_hash
+        }
+        if declared_type != file_type:
+            file_info['declared_type'] = declared_type
+        pending.append((file_info, task))
+    
+    return _collect_resume_results(batch, pending)
+
+def _collect_resume_results(batch, pending):
+    """Yield extraction results in submission order"""
+    # Duplicates within the batch reuse the first copy's result, which the cache may already have evicted
+    repeated = {file_info['content_hash'] for file_info, task in pending
+                if task is not None and 'file_id' not in file_info}
+    first_results = {}
+    
+    for file_info, task in pending:
+        if task is None:
+            yield file_info
+            continue
+        
+        content_hash = file_info['content_hash']
+        if 'file_id' not in file_info:
+            result = dict(first_results[content_hash], filename=file_info['filename'])
+            result.pop('declared_type', None)
+            if 'error' not in result:
+                result['cached'] = True
+            yield result
+            continue
+        
+        result = _extract_resume_result(file_info, batch, task)
+        if content_hash in repeated:
+            first_results[content_hash] = result
+        yield result
+
+def _extract_resume_result(file_info, batch, task):
+    """Wait for one file's extraction and build its record, or an error dict"""
+    try:
+        text, seconds = batch.result(task)
+    except ExtractionTimeout:
+        return {'filename': file_info['filename'], 'error': 'Text extraction timed out'}
+    except (BrokenProcessPool, CancelledError):
+        return {'filename': file_info['filename'], 'error': 'Extraction worker crashed'}
+    except Exception as e:
+        return {'filename': file_info['filename'], 'error': str(e)}
+    
+    # Workers cannot record into this process's metrics, so they report the time taken
+    metrics.observe('stage_duration_seconds', seconds, stage=f"extract.{file_info['file_type']}")
+    
+    with metrics.span('extract.skills'):
+        skills = get_skill_extractor().extract(text)
+    
+    record = {
+        'file_id': file_info['file_id'],
+        'filename': file_info['filename'],
+        'file_type': file_info['file_type'],
+        'extracted_text': text,
+        'file_path': file_info['file_path'],
+        'content_hash': file_info['content_hash'],
+        'skills': skills
+    }
+    extraction_cache.put(file_info['content_hash'], record)
+    corpus_stats.add_documents([(f"resume:{file_info['content_hash']}", text)])
+    
+    if 'declared_type' in file_info:
+        record = dict(record, declared_type=file_info['declared_type'])
+    return dict(record, cached=False)
+
+def _stream_resume_results(results):
+    """NDJSON records for streamed resume uploads"""
+    processed = 0
+    cache_hits = 0
+    
+    for result in results:
+        if 'error' in result:
+            yield dict(result, type='error')
+            continue
+        processed += 1
+        cache_hits += result['cached']
+        yield dict(result, type='file')
+    
+    yield {
+        'type': 'summary',
+        'message': f'Processed {processed} files',
+        'cache': {'hits': cache_hits, 'misses': processed - cache_hits}
+    }
+
 @file_bp.route('/upload-resumes', methods=['POST'])
 def upload_resumes():
     """Upload and process multiple resumes"""
@@ -53,68 +490,205 @@ def upload_resumes():
         if not files or files[0].filename == '':
             return jsonify({'error': 'No files selected'}), 400
         
+        if _is_async_request():
+            # Stage the files durably, then hand the batch to the ingestion workers
+            ingestion_id = ingestion_queue.new_id()
+            staging_dir = ingestion_queue.staging_path(ingestion_id)
+            os.makedirs(staging_dir, exist_ok=True)
+            
+            payloads = []
+            for position, file in enumerate(files):
+                path = os.path.join(staging_dir, f"{position}_{secure_filename(file.filename) or 'upload'}")
+                file.save(path)
+                payloads.append({'filename': file.filename, 'path': path})
+            
+            ingestion_queue.submit('resumes', payloads, ingestion_id=ingestion_id)
+            return _accepted(ingestion_id, len(payloads))
+        
+        upload_dir = os.path.join(file_bp.root_path, 'data/uploads')
+        uploads = ((file.filename, file.read()) for file in files if file)
+        results = process_resumes(uploads, upload_dir)
+        exclude = excluded_fields()
+        
+        if wants_ndjson():
+            # Send each file as soon as it is ready, then a summary line
+            return ndjson_response(_stream_resume_results(results), exclude)
+        
         processed_files = []
+        errors = []
+        cache_hits = 0
         
-        for file in files:
-            if file and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                file_id = str(uuid.uuid4())
-                file_path = os.path.join(file_bp.root_path, 'data/uploads', f"{file_id}_{filename}")
-                
-                # Save file
-                file.save(file_path)
-                
-                # Extract text based on file type
-                file_extension = filename.rsplit('.', 1)[1].lower()
-                
-                if file_extension == 'pdf':
-                    text = extract_text_from_pdf(file_path)
-                elif file_extension in ['docx', 'doc']:
-                    text = extract_text_from_docx(file_path)
-                else:
-                    continue
-                
-                processed_files.append({
-                    'file_id': file_id,
-                    'filename': filename,
-                    'file_type': file_extension,
-                    'extracted_text': text,
-                    'file_path': file_path
-                })
+        for result in results:
+            if 'error' in result:
+                errors.append(result)
+                continue
+            cache_hits += result['cached']
+            processed_files.append(without_fields(result, exclude))
         
         return jsonify({
             'message': f'Processed {len(processed_files)} files',
-            'files': processed_files
+            'files': processed_files,
+            'errors': errors,
+            'cache': {
+                'hits': cache_hits,
+                'misses': len(processed_files) - cache_hits
+            }
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@file_bp.route('/cache-stats', methods=['GET'])
+def cache_stats():
+    """Report extraction cache counters"""
+    try:
+        return jsonify(extraction_cache.stats()), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def process_job_postings(jobs_data):
+    """Validate job postings, yielding each posting or an error dict in order"""
+    required_fields = ['job_id', 'title', 'description', 'requirements']
+    for job_data in jobs_data:
+        # Validate required fields
+        if not isinstance(job_data, dict) or not all(field in job_data for field in required_fields):
+            yield {'error': 'Missing required fields'}
+            continue
+        
+        # Features are computed from the requirements, so check their shape before anything is stored
+        requirements = job_data['requirements']
+        if not isinstance(requirements, dict):
+            yield {'error': "'requirements' must be an object"}
+            continue
+        if not isinstance(requirements.get('skills', []), list):
+            yield {'error': "'requirements.skills' must be a list"}
+            continue
+        if not isinstance(requirements.get('education', ''), str):
+            yield {'error': "'requirements.education' must be a string"}
+            continue
+        
+        yield job_data
+
+def _save_postings(postings):
+    """Store postings and count them into the keyword corpus"""
+    job_store.save_postings(postings)
+    corpus_stats.add_documents((f'job:{posting.job_id}', job_text(posting.to_dict())) for posting in postings)
+
+def store_job_postings(jobs_data, chunk_size=500):
+    """Validate and store job postings with their features, yielding {'job_id'} or an error dict per posting in order"""
+    results = []
+    postings = []
+    
+    for job_data in process_job_postings(jobs_data):
+        if 'error' in job_data:
+            results.append(job_data)
+        else:
+            postings.append(JobPosting.from_json(job_data))
+            results.append({'job_id': str(job_data['job_id'])})
+        
+        if len(postings) >= chunk_size:
+            _save_postings(postings)
+            yield from results
+            postings, results = [], []
+    
+    if postings:
+        _save_postings(postings)
+    yield from results
+
+def _process_staged_resumes(items):
+    """Ingestion handler for resumes staged on disk"""
+    def uploads():
+        for item in items:
+            with open(item['path'], 'rb') as f:
+                yield item['filename'], f.read()
+    
+    upload_dir = os.path.join(file_bp.root_path, 'data/uploads')
+    return process_resumes(uploads(), upload_dir)
+
+ingestion_queue.register_handler('resumes', _process_staged_resumes)
+ingestion_queue.register_handler('jobs', store_job_postings)
+
+def _is_async_request():
+    """Whether the client asked for asynchronous ingestion"""
+    return request.args.get('async', 'false').lower() == 'true'
+
+def _accepted(ingestion_id, total):
+    """202 response pointing at the ingestion job status"""
+    return jsonify({
+        'message': f'Accepted {total} items for ingestion',
+        'ingestion_id': ingestion_id,
+        'status_url': url_for('file_processor.get_ingestion_status', ingestion_id=ingestion_id)
+    }), 202
+
 @file_bp.route('/upload-jobs', methods=['POST'])
 def upload_jobs():
-    """Upload job postings in JSON format"""
+    """Upload job postings in JSON format, storing them for matching by job_id"""
     try:
         if not request.is_json:
             return jsonify({'error': 'Content-Type must be application/json'}), 400
         
-        jobs_data = request.get_json()
+        # Postings are decoded one at a time from the request stream
+        jobs_data = iter_json_array(request.stream)
         
-        if not isinstance(jobs_data, list):
-            return jsonify({'error': 'Expected a list of job postings'}), 400
+        if _is_async_request():
+            try:
+                # Nothing is queued unless the whole array parses
+                ingestion_id = ingestion_queue.submit('jobs', jobs_data)
+            except ValueError as e:
+                return jsonify({'error': f'Expected a list of job postings: {e}'}), 400
+            status = ingestion_queue.get_status(ingestion_id, include_items=False)
+            return _accepted(ingestion_id, status['total'])
         
-        processed_jobs = []
-        for job_data in jobs_data:
-            # Validate required fields
-            required_fields = ['job_id', 'title', 'description', 'requirements']
-            if not all(field in job_data for field in required_fields):
-                continue
-            
-            processed_jobs.append(job_data)
+        job_ids = []
+        errors = []
+        try:
+            for position, result in enumerate(store_job_postings(jobs_data)):
+                if 'error' in result:
+                    errors.append({'position': position, 'error': result['error']})
+                else:
+                    job_ids.append(result['job_id'])
+        except ValueError as e:
+            # Postings are stored a chunk at a time, so report the ones stored before the malformed element
+            return jsonify({
+                'error': f'Expected a list of job postings: {e}',
+                'job_ids': job_ids,
+                'errors': errors
+            }), 400
         
         return jsonify({
-            'message': f'Processed {len(processed_jobs)} job postings',
-            'jobs': processed_jobs
+            'message': f'Processed {len(job_ids)} job postings',
+            'job_ids': job_ids,
+            'errors': errors
         }), 200
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+@file_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Return a stored job posting with its precomputed features"""
+    try:
+        job = job_store.get_job(job_id)
+        
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify(job), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@file_bp.route('/ingestion/<ingestion_id>', methods=['GET'])
+def get_ingestion_status(ingestion_id):
+    """Report progress, per-item results and errors of an ingestion job"""
+    try:
+        include_items = request.args.get('items', 'true').lower() == 'true'
+        status = ingestion_queue.get_status(ingestion_id, include_items=include_items)
+        
+        if status is None:
+            return jsonify({'error': 'Ingestion job not found'}), 404
+        
+        return jsonify(status), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,286 @@
+"""
+Asynchronous Ingestion Service
+"""
+
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional
+
+from utils.config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingestion_jobs (
+    ingestion_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    processed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    lease_expires REAL NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS ingestion_jobs_pending ON ingestion_jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS ingestion_items (
+    ingestion_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    PRIMARY KEY (ingestion_id, position)
+);
+"""
+
+# A handler receives the pending item payloads of a job and yields one result per item, in order
+Handler = Callable[[List[Dict[str, Any]]], Iterator[Dict[str, Any]]]
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionQueue:
+    """Persistent ingestion queue processed by an in-process worker pool
+
+    Jobs and their items live in SQLite, so accepted work survives restarts.
+    Workers claim a job by taking a lease, renewed by a heartbeat while the
+    job runs; a job whose lease expired (its process died) is claimed again
+    and resumes at its first unfinished item.
+    """
+
+    def __init__(self, db_path: str, staging_dir: str, workers: int = 2, lease_seconds: float = 60.0):
+        self.db_path = db_path
+        self.staging_dir = staging_dir
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.handlers: Dict[str, Handler] = {}
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def register_handler(self, kind: str, handler: Handler):
+        """Register the function that processes items of a job kind"""
+        self.handlers[kind] = handler
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _ensure_schema(self):
+        if self._initialized:
+            return
+        with self._lock:
+            if not self._initialized:
+                os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+                with closing(self._connect()) as connection:
+                    connection.execute('PRAGMA journal_mode=WAL')
+                    connection.executescript(SCHEMA)
+                self._initialized = True
+
+    def staging_path(self, ingestion_id: str) -> str:
+        """Directory where a job's uploaded files wait to be processed"""
+        return os.path.join(self.staging_dir, ingestion_id)
+
+    def new_id(self) -> str:
+        return str(uuid.uuid4())
+
+    def submit(self, kind: str, payloads: Iterable[Dict[str, Any]], ingestion_id: Optional[str] = None) -> str:
+        """Persist a job and its items, then wake a worker"""
+        self._ensure_schema()
+        ingestion_id = ingestion_id or self.new_id()
+        rows = [(ingestion_id, position, 'queued', json.dumps(payload))
+                for position, payload in enumerate(payloads)]
+        now = time.time()
+
+        connection = self._connect()
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            connection.executemany(
+                'INSERT INTO ingestion_items (ingestion_id, position, status, payload) VALUES (?, ?, ?, ?)', rows
+            )
+            connection.execute(
+                'INSERT INTO ingestion_jobs (ingestion_id, kind, status, total, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (ingestion_id, kind, 'queued', len(rows), now, now)
+            )
+            connection.execute('COMMIT')
+        finally:
+            connection.close()
+
+        self.start()
+        self._wakeup.set()
+        return ingestion_id
+
+    def get_status(self, ingestion_id: str, include_items: bool = True) -> Optional[Dict[str, Any]]:
+        """Progress, per-item results and errors for a job"""
+        self._ensure_schema()
+        with closing(self._connect()) as connection:
+            job = connection.execute(
+                'SELECT * FROM ingestion_jobs WHERE ingestion_id = ?', (ingestion_id,)
+            ).fetchone()
+            if job is None:
+                return None
+
+            status = {
+                'ingestion_id': job['ingestion_id'],
+                'kind': job['kind'],
+                'status': job['status'],
+                'total': job['total'],
+                'processed': job['processed'],
+                'failed': job['failed'],
+                'created_at': job['created_at'],
+                'updated_at': job['updated_at'],
+                'error': job['error']
+            }
+            if include_items:
+                items = connection.execute(
+                    'SELECT position, status, result, error FROM ingestion_items '
+                    'WHERE ingestion_id = ? ORDER BY position', (ingestion_id,)
+                )
+                status['items'] = [{
+                    'position': item['position'],
+                    'status': item['status'],
+                    'result': json.loads(item['result']) if item['result'] else None,
+                    'error': item['error']
+                } for item in items]
+            return status
+
+    def start(self):
+        """Start the worker threads once per process"""
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            if self._threads:
+                return
+            self._stop.clear()
+            for number in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f'ingestion-worker-{number}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None):
+        """Ask the worker threads to exit"""
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        """Lease the oldest queued job, or one whose previous lease expired"""
+        now = time.time()
+        connection = self._connect()
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            job = connection.execute(
+                "SELECT ingestion_id, kind FROM ingestion_jobs "
+                "WHERE status = 'queued' OR (status = 'running' AND lease_expires < ?) "
+                "ORDER BY created_at LIMIT 1", (now,)
+            ).fetchone()
+            if job is not None:
+                connection.execute(
+                    "UPDATE ingestion_jobs SET status = 'running', lease_expires = ?, updated_at = ? "
+                    "WHERE ingestion_id = ?", (now + self.lease_seconds, now, job['ingestion_id'])
+                )
+            connection.execute('COMMIT')
+            return job
+        finally:
+            connection.close()
+
+    def _run(self):
+        """Worker loop"""
+        while not self._stop.is_set():
+            try:
+                self._ensure_schema()
+                job = self._claim()
+                if job is not None:
+                    self._process(job['ingestion_id'], job['kind'])
+                    continue
+            except Exception:
+                # Keep the worker alive; an unfinished job is claimed again once its lease expires
+                logger.exception('Ingestion worker error')
+            self._wakeup.wait(Config.INGESTION_POLL_INTERVAL)
+            self._wakeup.clear()
+
+    def _heartbeat(self, ingestion_id: str, done: threading.Event):
+        """Renew a job's lease until its worker is done with it"""
+        while not done.wait(self.lease_seconds / 3):
+            try:
+                with closing(self._connect()) as connection:
+                    connection.execute(
+                        "UPDATE ingestion_jobs SET lease_expires = ? WHERE ingestion_id = ? AND status = 'running'",
+                        (time.time() + self.lease_seconds, ingestion_id)
+                    )
+            except sqlite3.Error:
+                pass  # Retried on the next beat
+
+    def _process(self, ingestion_id: str, kind: str):
+        """Run the handler over a job's unfinished items, recording each result"""
+        done = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(ingestion_id, done),
+                         name=f'ingestion-heartbeat-{ingestion_id}', daemon=True).start()
+        connection = self._connect()
+        try:
+            items = connection.execute(
+                "SELECT position, payload FROM ingestion_items "
+                "WHERE ingestion_id = ? AND status = 'queued' ORDER BY position", (ingestion_id,)
+            ).fetchall()
+
+            handler = self.handlers.get(kind)
+            if handler is None:
+                self._finish(connection, ingestion_id, 'failed', f'No handler for {kind}')
+                return
+
+            try:
+                results = handler([json.loads(item['payload']) for item in items])
+                for item, result in zip(items, results):
+                    failed = 'error' in result
+                    now = time.time()
+                    connection.execute('BEGIN IMMEDIATE')
+                    connection.execute(
+                        'UPDATE ingestion_items SET status = ?, result = ?, error = ? '
+                        'WHERE ingestion_id = ? AND position = ?',
+                        ('failed' if failed else 'done', None if failed else json.dumps(result),
+                         result.get('error'), ingestion_id, item['position'])
+                    )
+                    connection.execute(
+                        'UPDATE ingestion_jobs SET processed = processed + 1, failed = failed + ?, '
+                        'lease_expires = ?, updated_at = ? WHERE ingestion_id = ?',
+                        (int(failed), now + self.lease_seconds, now, ingestion_id)
+                    )
+                    connection.execute('COMMIT')
+            except Exception as e:
+                if connection.in_transaction:
+                    connection.execute('ROLLBACK')
+                self._finish(connection, ingestion_id, 'failed', str(e))
+                return
+
+            self._finish(connection, ingestion_id, 'completed', None)
+        finally:
+            done.set()
+            connection.close()
+
+    def _finish(self, connection: sqlite3.Connection, ingestion_id: str, status: str, error: Optional[str]):
+        """Mark a job finished and remove its staged files"""
+        connection.execute(
+            'UPDATE ingestion_jobs SET status = ?, error = ?, lease_expires = 0, updated_at = ? '
+            'WHERE ingestion_id = ?', (status, error, time.time(), ingestion_id)
+        )
+        shutil.rmtree(self.staging_path(ingestion_id), ignore_errors=True)
+
+
+# Initialize ingestion queue
+ingestion_queue = IngestionQueue(
+    os.path.join(Config.PROCESSED_FOLDER, 'ingestion.db'),
+    os.path.join(Config.UPLOAD_FOLDER, 'staging'),
+    workers=Config.INGESTION_WORKERS
+)
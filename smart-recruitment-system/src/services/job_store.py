@@ -0,0 +1,145 @@
+"""
+Job Posting Store Service
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import closing
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+from sklearn.feature_extraction.text import CountVectorizer
+
+from models.job_posting import JobPosting
+from services.skill_extractor import get_skill_extractor
+from utils.config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    posting TEXT NOT NULL,
+    skills TEXT NOT NULL,
+    term_counts TEXT NOT NULL,
+    experience_years REAL,
+    education_level INTEGER,
+    updated_at REAL NOT NULL
+);
+"""
+
+# Same analyzer as the candidate vector store, so stored term counts can query it directly
+_analyzer = CountVectorizer(stop_words='english').build_analyzer()
+
+
+def job_text(job_data: Dict[str, Any]) -> str:
+    """Text used to represent a job posting"""
+    return f"{job_data.get('title', '')} {job_data.get('description', '')}"
+
+
+def compute_job_features(posting: JobPosting) -> Dict[str, Any]:
+    """Match features of a posting: canonical skills, term counts and parsed requirements"""
+    return {
+        'skills': get_skill_extractor().canonicalize_all(posting.get_required_skills()),
+        'term_counts': dict(Counter(_analyzer(job_text(posting.to_dict())))),
+        'experience_years': posting.get_required_experience_years(),
+        'education_level': posting.get_required_education_level()
+    }
+
+
+class JobStore:
+    """Embedded SQLite store of ingested job postings and their precomputed features"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        self._ensure_schema()
+        return self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _ensure_schema(self):
+        if self._initialized:
+            return
+        with self._lock:
+            if not self._initialized:
+                os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+                with closing(self._open()) as connection:
+                    connection.execute('PRAGMA journal_mode=WAL')
+                    connection.executescript(SCHEMA)
+                self._initialized = True
+
+    def save_postings(self, postings: Iterable[JobPosting]) -> int:
+        """Insert or replace postings, computing their features"""
+        now = time.time()
+        rows = []
+        for posting in postings:
+            features = compute_job_features(posting)
+            rows.append((
+                str(posting.job_id),
+                json.dumps(posting.to_dict()),
+                json.dumps(features['skills']),
+                json.dumps(features['term_counts']),
+                features['experience_years'],
+                features['education_level'],
+                now
+            ))
+
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO jobs (job_id, posting, skills, term_counts, experience_years, '
+                'education_level, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)', rows
+            )
+        return len(rows)
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        """Job dict ready for matching: the posting as uploaded, plus its features
+
+        The matcher compares canonical skills on both sides, so it reads them
+        from the features rather than canonicalizing the requirements again.
+        """
+        job = json.loads(row['posting'])
+        job['features'] = {
+            'skills': json.loads(row['skills']),
+            'term_counts': json.loads(row['term_counts']),
+            'experience_years': row['experience_years'],
+            'education_level': row['education_level']
+        }
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A stored job, or None"""
+        jobs, _ = self.get_jobs([job_id])
+        return jobs[0] if jobs else None
+
+    def get_jobs(self, job_ids: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Stored jobs in the requested order, plus the IDs that are unknown"""
+        job_ids = [str(job_id) for job_id in job_ids]
+        found = {}
+        with closing(self._connect()) as connection:
+            # Stay below SQLite's bound parameter limit
+            for start in range(0, len(job_ids), 500):
+                chunk = job_ids[start:start + 500]
+                for row in connection.execute(
+                    f"SELECT * FROM jobs WHERE job_id IN ({', '.join('?' * len(chunk))})", chunk
+                ):
+                    found[row['job_id']] = self._to_job(row)
+
+        missing = [job_id for job_id in job_ids if job_id not in found]
+        return [found[job_id] for job_id in job_ids if job_id in found], missing
+
+    def count(self) -> int:
+        with closing(self._connect()) as connection:
+            return connection.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+
+# Initialize job store
+job_store = JobStore(os.path.join(Config.PROCESSED_FOLDER, 'jobs.db'))
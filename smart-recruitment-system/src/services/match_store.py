@@ -0,0 +1,204 @@
+"""
+Match Store Service
+"""
+
+import base64
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from utils.config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    job_id TEXT NOT NULL,
+    candidate_id TEXT NOT NULL,
+    overall_match_score REAL NOT NULL,
+    match_score REAL NOT NULL,
+    skill_match_score REAL NOT NULL,
+    experience_match_score REAL NOT NULL,
+    education_match_score REAL NOT NULL,
+    matched_skills TEXT NOT NULL,
+    missing_skills TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (job_id, candidate_id)
+);
+CREATE INDEX IF NOT EXISTS matches_job_score ON matches (job_id, overall_match_score, candidate_id);
+"""
+
+COLUMNS = (
+    'job_id', 'candidate_id', 'overall_match_score', 'match_score', 'skill_match_score',
+    'experience_match_score', 'education_match_score', 'matched_skills', 'missing_skills'
+)
+
+
+def encode_cursor(score: float, candidate_id: str) -> str:
+    """Opaque keyset cursor pointing after a (score, candidate_id) row"""
+    return base64.urlsafe_b64encode(json.dumps([score, candidate_id]).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    """Inverse of encode_cursor"""
+    try:
+        score, candidate_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return float(score), str(candidate_id)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+
+class MatchStore:
+    """Embedded SQLite store of computed match results
+
+    Rows are indexed on (job_id, overall_match_score, candidate_id), so top-k,
+    threshold and paginated queries are index range scans. Pages are ordered
+    by score descending, then candidate ID descending, and continue from a
+    keyset cursor rather than an offset.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        self._ensure_schema()
+        return self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _ensure_schema(self):
+        if self._initialized:
+            return
+        with self._lock:
+            if not self._initialized:
+                os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+                with closing(self._open()) as connection:
+                    connection.execute('PRAGMA journal_mode=WAL')
+                    connection.executescript(SCHEMA)
+                self._initialized = True
+
+    def save_matches(self, matches: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace match results"""
+        now = time.time()
+        rows = [(
+            str(match['job_id']),
+            str(match['candidate_id']),
+            float(match['overall_match_score']),
+            float(match.get('match_score', 0.0)),
+            float(match.get('skill_match_score', 0.0)),
+            float(match.get('experience_match_score', 0.0)),
+            float(match.get('education_match_score', 0.0)),
+            json.dumps(list(match.get('matched_skills', []))),
+            json.dumps(list(match.get('missing_skills', []))),
+            now
+        ) for match in matches if match.get('job_id') is not None and match.get('candidate_id') is not None]
+
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                f"INSERT OR REPLACE INTO matches ({', '.join(COLUMNS)}, updated_at) "
+                f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))})", rows
+            )
+        return len(rows)
+
+    def save_batch(self, batch) -> int:
+        """Insert or replace the rows of a MatchResultBatch in one statement, column by column
+
+        Only the batch's current records are written, so callers persist the
+        rows they return after thresholding or taking the top k.
+        """
+        if batch.job_id is None:
+            return 0
+
+        records = batch.records
+        candidates = records['candidate'].tolist()
+        if any(batch.candidate_ids[candidate] is None for candidate in candidates):
+            records = records[[batch.candidate_ids[candidate] is not None for candidate in candidates]]
+            candidates = records['candidate'].tolist()
+
+        columns = (
+            itertools.repeat(str(batch.job_id)),
+            [str(batch.candidate_ids[candidate]) for candidate in candidates],
+            records['overall_match_score'].tolist(),
+            records['match_score'].tolist(),
+            records['skill_match_score'].tolist(),
+            records['experience_match_score'].tolist(),
+            records['education_match_score'].tolist(),
+            [json.dumps(batch.matched_skills(candidate)) for candidate in candidates],
+            [json.dumps(batch.missing_skills(candidate)) for candidate in candidates],
+            itertools.repeat(time.time())
+        )
+
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                f"INSERT OR REPLACE INTO matches ({', '.join(COLUMNS)}, updated_at) "
+                f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))})", zip(*columns)
+            )
+        return len(candidates)
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        match = {column: row[column] for column in COLUMNS}
+        match['matched_skills'] = json.loads(match['matched_skills'])
+        match['missing_skills'] = json.loads(match['missing_skills'])
+        return match
+
+    def _range(self, job_id: str, min_score: Optional[float], max_score: Optional[float],
+               cursor: Optional[str]) -> Tuple[str, List[Any]]:
+        """WHERE clause for a score range on one job, continuing after a cursor"""
+        clauses = ['job_id = ?']
+        params: List[Any] = [job_id]
+        if min_score is not None:
+            clauses.append('overall_match_score >= ?')
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append('overall_match_score < ?')
+            params.append(max_score)
+        if cursor:
+            clauses.append('(overall_match_score, candidate_id) < (?, ?)')
+            params.extend(decode_cursor(cursor))
+        return ' AND '.join(clauses), params
+
+    def top_matches(self, job_id: str, limit: int = 10, min_score: Optional[float] = None,
+                    max_score: Optional[float] = None, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One page of a job's matches by descending score, plus the cursor of the next page"""
+        where, params = self._range(job_id, min_score, max_score, cursor)
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM matches WHERE {where} "
+                f"ORDER BY overall_match_score DESC, candidate_id DESC LIMIT ?", params + [limit + 1]
+            ).fetchall()
+
+        matches = [self._to_dict(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit and matches:
+            last = matches[-1]
+            next_cursor = encode_cursor(last['overall_match_score'], last['candidate_id'])
+        return matches, next_cursor
+
+    def iter_matches(self, job_id: str, min_score: Optional[float] = None,
+                     page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Stream all of a job's matches by descending score, one page at a time"""
+        cursor = None
+        while True:
+            matches, cursor = self.top_matches(job_id, page_size, min_score=min_score, cursor=cursor)
+            yield from matches
+            if cursor is None:
+                return
+
+    def count(self, job_id: str, min_score: Optional[float] = None, max_score: Optional[float] = None) -> int:
+        """Number of stored matches for a job within a score range"""
+        where, params = self._range(job_id, min_score, max_score, None)
+        with closing(self._connect()) as connection:
+            return connection.execute(f"SELECT COUNT(*) FROM matches WHERE {where}", params).fetchone()[0]
+
+
+# Initialize match store
+match_store = MatchStore(os.path.join(Config.PROCESSED_FOLDER, 'matches.db'))
@@ -2,25 +2,99 @@
 ML Matching Service
 """
 
+import heapq
+import itertools
+import json
 import numpy as np
-from flask import Blueprint, request, jsonify
+import scipy.sparse as sp
+from flask import Blueprint, current_app, request, jsonify
+from sklearn.base import clone
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional
+
+from models.match_batch import MatchResultBatch
+from services.job_store import job_store
+from services.match_store import match_store
+from services.result_cache import normalize_text, result_cache
+from services.skill_extractor import get_skill_extractor
+from services.skill_index import SkillIndex
+from services.vector_store import CandidateVectorStore, candidate_store
+from services.vectorizers import HashingEngine
+from utils.config import Config
+from utils.metrics import metrics
+from utils.streaming import excluded_fields, ndjson_response, wants_ndjson
 
 ml_bp = Blueprint('ml_matcher', __name__)
 
 class MLMatcher:
     """ML-based job-candidate matching engine"""
     
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
-        
+    def __init__(self, store: Optional[CandidateVectorStore] = None, engine: str = 'tfidf'):
+        if engine not in ('tfidf', 'hashing'):
+            raise ValueError(f'Unknown vectorizer engine: {engine}')
+        self.engine = engine
+        # Uncapped by default: the vocabulary is fit over the whole pool, where a cap would drop rare, distinctive terms
+        self.vectorizer = TfidfVectorizer(max_features=Config.TFIDF_MAX_FEATURES or None, stop_words='english')
+        self.hashing = HashingEngine(Config.HASHING_N_FEATURES) if engine == 'hashing' else None
+        self.store = store
+        self.weights = {'text': 0.4, 'skills': 0.4, 'experience': 0.1, 'education': 0.1}
+        self._vectorizer_params = (
+            {'n_features': self.hashing.n_features, 'use_idf': Config.HASHING_USE_IDF} if self.hashing is not None
+            else {key: str(value) for key, value in self.vectorizer.get_params().items()}
+        )
+    
+    def vectorize(self, texts: List[str]) -> sp.csr_matrix:
+        """L2-normalised vectors for a pool of texts, with IDF computed over the pool"""
+        if self.hashing is not None:
+            return self.hashing.fit_transform(texts, use_idf=Config.HASHING_USE_IDF, workers=Config.HASHING_WORKERS,
+                                              shard_size=Config.HASHING_SHARD_SIZE)
+        return clone(self.vectorizer).fit_transform(texts)
+    
+    def fingerprint(self, store_version: Optional[str] = None) -> Dict[str, Any]:
+        """Settings that affect scores, part of every result cache key"""
+        if store_version is not None:
+            # Store-backed scores use the store's own TF-IDF, whatever the engine
+            return {'weights': self.weights, 'store_version': store_version}
+        return {
+            'engine': self.engine,
+            'vectorizer': self._vectorizer_params,
+            'weights': self.weights,
+            'store_version': None
+        }
+
+    def match_cache_inputs(self, job_data: Dict[str, Any], candidates: List[Dict[str, Any]],
+                           candidate_ids: List[str]) -> Dict[str, Any]:
+        """The parts of a match request that affect its scores, in a canonical form
+
+        Texts are lowercased with whitespace collapsed, as the vectorizers see
+        them, skills are canonicalized, as they are matched, and the candidate
+        pool is ordered, so requests that differ only in these respects share
+        a cache key. Job skills keep their order, which is that of the matched
+        skill lists.
+        """
+        job_data = self._canonical_job(job_data)
+        extractor = get_skill_extractor()
+        return {
+            'job_id': job_data.get('job_id'),
+            'job_text': normalize_text(self._job_text(job_data)),
+            'job_skills': self._job_skills(job_data),
+            'job_term_counts': self._job_term_counts(job_data),
+            'candidates': sorted((
+                {
+                    'candidate_id': candidate.get('candidate_id'),
+                    'resume_text': normalize_text(candidate.get('resume_text', '')),
+                    'skills': sorted(extractor.canonicalize_all(candidate.get('skills')))
+                } for candidate in candidates
+            ), key=lambda candidate: json.dumps(candidate, sort_keys=True, default=str)),
+            'candidate_ids': sorted(candidate_ids, key=str)
+        }
+
     def calculate_similarity(self, job_text: str, candidate_text: str) -> float:
         """Calculate similarity between job and candidate"""
         try:
             # Create TF-IDF vectors
-            vectors = self.vectorizer.fit_transform([job_text, candidate_text])
+            vectors = self.vectorize([job_text, candidate_text])
             
             # Calculate cosine similarity
             similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
@@ -30,57 +104,341 @@ class MLMatcher:
         except Exception as e:
             return 0.0
     
-    def match_job_with_candidates(self, job_data: Dict[str, Any], candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Match a job with multiple candidates"""
-        job_text = f"{job_data.get('title', '')} {job_data.get('description', '')}"
-        job_skills = job_data.get('requirements', {}).get('skills', [])
+    def calculate_batch_similarity(self, job_text: str, candidate_texts: List[str]) -> np.ndarray:
+        """Calculate similarity between a job and a whole candidate pool with a single TF-IDF fit"""
+        if not candidate_texts:
+            return np.zeros(0)
         
-        matches = []
-        
-        for candidate in candidates:
-            candidate_text = candidate.get('resume_text', '')
-            candidate_skills = candidate.get('skills', [])
-            
-            # Calculate overall similarity
-            overall_similarity = self.calculate_similarity(job_text, candidate_text)
+        try:
+            # One vocabulary/IDF over the job and the whole pool
+            with metrics.span('match.vectorize'):
+                vectors = self.vectorize([job_text] + list(candidate_texts))
             
-            # Calculate skill match
-            skill_matches = set(job_skills).intersection(set(candidate_skills))
-            skill_match_score = len(skill_matches) / len(job_skills) if job_skills else 0
+            # TF-IDF rows are L2-normalised, so cosine similarity is one sparse matrix-vector product
+            with metrics.span('match.similarity'):
+                similarities = vectors[1:] @ vectors[0].T
             
-            # Calculate experience match (simplified)
-            experience_match_score = 0.5  # Placeholder
+            return similarities.toarray().ravel()
+        
+        except Exception as e:
+            return np.zeros(len(candidate_texts))
+    
+    def match_job_with_candidates(self, job_data: Dict[str, Any], candidates: List[Dict[str, Any]],
+                                  min_required_skills: int = 0) -> List[Dict[str, Any]]:
+        """Match a job with multiple candidates"""
+        return self.match_job_batch(job_data, candidates, min_required_skills).sorted().to_dicts()
+    
+    def match_job_with_candidate_ids(self, job_data: Dict[str, Any], candidate_ids: List[str],
+                                     min_required_skills: int = 0) -> List[Dict[str, Any]]:
+        """Match a job with candidates already indexed in the vector store"""
+        return self.match_job_batch_by_ids(job_data, candidate_ids, min_required_skills).sorted().to_dicts()
+    
+    def match_job_batch(self, job_data: Dict[str, Any], candidates: List[Dict[str, Any]],
+                        min_required_skills: int = 0) -> MatchResultBatch:
+        """Score a job against raw candidates into a columnar batch
+        
+        Candidates listing fewer than ``min_required_skills`` of the job's
+        skills are dropped before vectorizing, so the TF-IDF fit covers only
+        the remaining pool.
+        """
+        job_data = self._canonical_job(job_data)
+        candidates = self._canonical_candidates(candidates)
+        job_text = self._job_text(job_data)
+        job_skills = self._job_skills(job_data)
+        
+        with metrics.span('match.skill_index'):
+            index = SkillIndex.from_skill_lists(candidate.get('skills', []) for candidate in candidates)
+            rows = index.filter(job_skills, min_required_skills, np.arange(len(candidates)))
+        if len(rows) < len(candidates):
+            candidates = [candidates[row] for row in rows]
+        
+        # Calculate text similarity for the whole pool at once
+        similarities = self.calculate_batch_similarity(
+            job_text, [candidate.get('resume_text', '') for candidate in candidates]
+        )
+        
+        with metrics.span('match.skill_overlap'):
+            return MatchResultBatch.from_scores(
+                job_data,
+                [candidate.get('candidate_id') for candidate in candidates],
+                [candidate.get('skills', []) for candidate in candidates],
+                similarities,
+                self.weights,
+                skill_matches=index.matches(job_skills, rows)
+            )
+    
+    def match_job_batch_by_ids(self, job_data: Dict[str, Any], candidate_ids: List[str],
+                               min_required_skills: int = 0) -> MatchResultBatch:
+        """Score a job against vector store candidates into a columnar batch
+        
+        Candidates listing fewer than ``min_required_skills`` of the job's
+        skills are dropped before text similarity is computed.
+        """
+        job_data = self._canonical_job(job_data)
+        store = self.store
+        store.refresh()
+        
+        rows, missing = store.rows_for(candidate_ids)
+        if missing:
+            raise KeyError(f"Unknown candidate IDs: {', '.join(map(str, missing[:10]))}")
+        
+        job_skills = self._job_skills(job_data)
+        index = store.skill_index()
+        with metrics.span('match.skill_index'):
+            rows = index.filter(job_skills, min_required_skills, rows)
+        
+        job_text = self._job_text(job_data)
+        with metrics.span('match.similarity'):
+            similarities = store.similarities(job_text, rows, term_counts=self._job_term_counts(job_data))
+        
+        with metrics.span('match.skill_overlap'):
+            return MatchResultBatch.from_scores(
+                job_data,
+                [store.candidate_ids[row] for row in rows],
+                [store.candidate_skills[row] for row in rows],
+                similarities,
+                self.weights,
+                skill_matches=index.matches(job_skills, rows)
+            )
+    
+    def match_jobs_batch(self, jobs: List[Dict[str, Any]], candidates: Optional[List[Dict[str, Any]]] = None,
+                         candidate_ids: Optional[List[str]] = None, top_k: int = 10,
+                         min_required_skills: int = 0) -> List[Dict[str, Any]]:
+        """Match many jobs against one candidate pool, keeping only the top-k candidates per job
+        
+        Candidates come from ``candidates`` (raw resume text) or, when it is not
+        given, from the vector store (``candidate_ids`` or the whole store).
+        A candidate must list at least ``min_required_skills`` of a job's skills
+        to be ranked for it; candidates eligible for no job are dropped before
+        any text similarity is computed.
+        """
+        jobs = [self._canonical_job(job) for job in jobs]
+        job_texts = [self._job_text(job) for job in jobs]
+        
+        if candidates is not None:
+            candidates = self._canonical_candidates(candidates)
+            if min_required_skills > 0:
+                with metrics.span('match.skill_index'):
+                    index = SkillIndex.from_skill_lists(candidate.get('skills', []) for candidate in candidates)
+                    rows = self._eligible_rows(index, jobs, min_required_skills, np.arange(len(candidates)))
+                candidates = [candidates[row] for row in rows]
             
-            # Calculate education match (simplified)
-            education_match_score = 0.5  # Placeholder
+            ids = [candidate.get('candidate_id') for candidate in candidates]
+            skill_lists = [candidate.get('skills', []) for candidate in candidates]
             
-            # Overall match score
-            overall_match_score = (
-                overall_similarity * 0.4 +
-                skill_match_score * 0.4 +
-                experience_match_score * 0.1 +
-                education_match_score * 0.1
-            )
+            # One TF-IDF fit over every job and candidate in the batch
+            try:
+                with metrics.span('match.vectorize'):
+                    vectors = self.vectorize(job_texts + [c.get('resume_text', '') for c in candidates])
+            except ValueError:
+                vectors = sp.csr_matrix((len(jobs) + len(candidates), 1))
+            job_matrix = vectors[:len(jobs)]
+            candidate_matrix = vectors[len(jobs):]
+            candidate_vectors = lambda rows: candidate_matrix[rows]
+            candidate_rows = np.arange(len(candidates))
+            candidate_scale = None
+        else:
+            store = self.store
+            store.refresh()
+            if candidate_ids is None:
+                candidate_rows = store.live_rows()
+            else:
+                candidate_rows, missing = store.rows_for(candidate_ids)
+                if missing:
+                    raise KeyError(f"Unknown candidate IDs: {', '.join(map(str, missing[:10]))}")
+            if min_required_skills > 0:
+                with metrics.span('match.skill_index'):
+                    candidate_rows = self._eligible_rows(store.skill_index(), jobs, min_required_skills, candidate_rows)
+            ids = [store.candidate_ids[row] for row in candidate_rows]
+            skill_lists = [store.candidate_skills[row] for row in candidate_rows]
             
-            matches.append({
+            with metrics.span('match.vectorize'):
+                job_matrix = store.query_matrix_from_counts([
+                    self._job_term_counts(job) or store.count_terms(text) for job, text in zip(jobs, job_texts)
+                ])
+            candidate_vectors = store.row_matrix
+            norms = store.row_norms(candidate_rows)
+            candidate_scale = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        
+        with metrics.span('match.blocked_top_k'):
+            heaps = self._blocked_top_k(jobs, skill_lists, job_matrix, candidate_vectors,
+                                        candidate_rows, candidate_scale, top_k, min_required_skills)
+        
+        results = []
+        for job_data, heap in zip(jobs, heaps):
+            ranked = sorted(heap, reverse=True)
+            results.append({
                 'job_id': job_data.get('job_id'),
-                'candidate_id': candidate.get('candidate_id'),
-                'match_score': overall_similarity,
-                'skill_match_score': skill_match_score,
-                'experience_match_score': experience_match_score,
-                'education_match_score': education_match_score,
-                'overall_match_score': overall_match_score,
-                'matched_skills': list(skill_matches),
-                'missing_skills': list(set(job_skills) - set(candidate_skills))
+                'matches': [
+                    self._match_record(job_data, ids[-position], skill_lists[-position], similarity)
+                    for _, position, similarity in ranked
+                ]
             })
         
-        # Sort by overall match score
-        matches.sort(key=lambda x: x['overall_match_score'], reverse=True)
+        return results
+    
+    def _blocked_top_k(self, jobs: List[Dict[str, Any]], skill_lists: List[List[str]], job_matrix: sp.csr_matrix,
+                       candidate_vectors: Callable[[np.ndarray], sp.csr_matrix], candidate_rows: np.ndarray,
+                       candidate_scale: Optional[np.ndarray], top_k: int, min_required_skills: int = 0) -> List[list]:
+        """Score jobs x candidates tile by tile, keeping a bounded min-heap per job
+        
+        Heap entries are ``(overall_score, -position, text_similarity)`` so that
+        ties keep the earlier candidate. Pairs with fewer than
+        ``min_required_skills`` matched skills never enter a heap.
+        """
+        n_jobs, n_candidates = len(jobs), len(candidate_rows)
+        heaps = [[] for _ in range(n_jobs)]
+        if n_jobs == 0 or n_candidates == 0 or top_k <= 0:
+            return heaps
+        
+        # Binary skill matrices restricted to skills that some job requires
+        skill_index = {}
+        job_skill_counts = np.zeros(n_jobs)
+        job_skill_matrix = self._skill_matrix(
+            [job.get('requirements', {}).get('skills', []) for job in jobs], skill_index, grow=True
+        )
+        for i, job in enumerate(jobs):
+            job_skill_counts[i] = len(job.get('requirements', {}).get('skills', []))
+        candidate_skill_matrix = self._skill_matrix(skill_lists, skill_index, grow=False)
+        job_skill_scale = np.divide(1.0, job_skill_counts, out=np.zeros(n_jobs), where=job_skill_counts > 0)
+        
+        weights = self.weights
+        constant = weights['experience'] * 0.5 + weights['education'] * 0.5  # Placeholder scores
+        job_block = Config.MATCH_JOB_BLOCK_SIZE
+        candidate_block = Config.MATCH_CANDIDATE_BLOCK_SIZE
+        
+        for j0 in range(0, n_jobs, job_block):
+            j1 = min(j0 + job_block, n_jobs)
+            job_tile = job_matrix[j0:j1]
+            job_skill_tile = job_skill_matrix[j0:j1]
+            
+            for c0 in range(0, n_candidates, candidate_block):
+                c1 = min(c0 + candidate_block, n_candidates)
+                
+                # Dense tile of at most job_block x candidate_block scores
+                similarity = (job_tile @ candidate_vectors(candidate_rows[c0:c1]).T).toarray()
+                if candidate_scale is not None:
+                    similarity *= candidate_scale[c0:c1]
+                overlap = (job_skill_tile @ candidate_skill_matrix[c0:c1].T).toarray()
+                scores = (weights['text'] * similarity +
+                          weights['skills'] * overlap * job_skill_scale[j0:j1, None] +
+                          constant)
+                if min_required_skills > 0:
+                    scores[overlap < min_required_skills] = -np.inf
+                
+                # Only the tile's k best per job can enter the heap
+                k = min(top_k, c1 - c0)
+                best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                for i, columns in enumerate(best):
+                    heap = heaps[j0 + i]
+                    for column in columns:
+                        if scores[i, column] == -np.inf:
+                            continue
+                        entry = (float(scores[i, column]), -(c0 + int(column)), float(similarity[i, column]))
+                        if len(heap) < top_k:
+                            heapq.heappush(heap, entry)
+                        elif entry > heap[0]:
+                            heapq.heapreplace(heap, entry)
+        
+        return heaps
+    
+    @staticmethod
+    def _eligible_rows(index: SkillIndex, jobs: List[Dict[str, Any]], min_required_skills: int,
+                       rows: np.ndarray) -> np.ndarray:
+        """Rows listing at least min_required_skills of the skills of some job"""
+        eligible = np.zeros(len(rows), dtype=bool)
+        for job in jobs:
+            eligible |= index.match_counts(MLMatcher._job_skills(job), rows) >= min_required_skills
+        return rows[eligible]
+    
+    @staticmethod
+    def _skill_matrix(skill_lists: List[List[str]], skill_index: Dict[str, int], grow: bool) -> sp.csr_matrix:
+        """Build a binary rows x skills matrix, optionally growing the skill index"""
+        indptr = [0]
+        indices = []
+        for skills in skill_lists:
+            row = set()
+            for skill in skills:
+                index = skill_index.get(skill)
+                if index is None and grow:
+                    index = skill_index[skill] = len(skill_index)
+                if index is not None:
+                    row.add(index)
+            indices.extend(row)
+            indptr.append(len(indices))
+        
+        return sp.csr_matrix(
+            (np.ones(len(indices)), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(skill_lists), max(len(skill_index), 1))
+        )
+    
+    @staticmethod
+    def _job_text(job_data: Dict[str, Any]) -> str:
+        """Text used to represent a job posting"""
+        return f"{job_data.get('title', '')} {job_data.get('description', '')}"
+    
+    @staticmethod
+    def _job_skills(job_data: Dict[str, Any]) -> List[str]:
+        """Required skills of a job"""
+        return job_data.get('requirements', {}).get('skills', [])
+    
+    @staticmethod
+    def _canonical_job(job_data: Dict[str, Any]) -> Dict[str, Any]:
+        """The job with its required skills canonicalized, as stored jobs have them precomputed"""
+        skills = job_data.get('features', {}).get('skills')
+        if skills is None:
+            skills = get_skill_extractor().canonicalize_all(MLMatcher._job_skills(job_data))
+        return dict(job_data, requirements=dict(job_data.get('requirements', {}), skills=skills))
+    
+    @staticmethod
+    def _canonical_candidates(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Candidates with their skills canonicalized like job skills"""
+        extractor = get_skill_extractor()
+        return [dict(candidate, skills=extractor.canonicalize_all(candidate.get('skills'))) for candidate in candidates]
+    
+    @staticmethod
+    def _job_term_counts(job_data: Dict[str, Any]) -> Optional[Dict[str, int]]:
+        """Term counts precomputed when the job was stored, if any"""
+        return job_data.get('features', {}).get('term_counts')
+    
+    def _match_record(self, job_data: Dict[str, Any], candidate_id: str,
+                      candidate_skills: List[str], similarity: float) -> Dict[str, Any]:
+        """Score a single job-candidate pair given its text similarity"""
+        job_skills = job_data.get('requirements', {}).get('skills', [])
+        overall_similarity = float(similarity)
+        
+        # Calculate skill match
+        skill_matches = set(job_skills).intersection(set(candidate_skills))
+        skill_match_score = len(skill_matches) / len(job_skills) if job_skills else 0
+        
+        # Calculate experience match (simplified)
+        experience_match_score = 0.5  # Placeholder
+        
+        # Calculate education match (simplified)
+        education_match_score = 0.5  # Placeholder
         
-        return matches
+        # Overall match score
+        overall_match_score = (
+            overall_similarity * self.weights['text'] +
+            skill_match_score * self.weights['skills'] +
+            experience_match_score * self.weights['experience'] +
+            education_match_score * self.weights['education']
+        )
+        
+        return {
+            'job_id': job_data.get('job_id'),
+            'candidate_id': candidate_id,
+            'match_score': overall_similarity,
+            'skill_match_score': skill_match_score,
+            'experience_match_score': experience_match_score,
+            'education_match_score': education_match_score,
+            'overall_match_score': overall_match_score,
+            'matched_skills': list(skill_matches),
+            'missing_skills': list(set(job_skills) - set(candidate_skills))
+        }
 
 # Initialize matcher
-matcher = MLMatcher()
+matcher = MLMatcher(store=candidate_store, engine=Config.VECTORIZER_ENGINE)
 
 @ml_bp.route('/match', methods=['POST'])
 def match_candidates():
@@ -89,16 +447,167 @@ def match_candidates():
         data = request.get_json()
         job_data = data.get('job')
         candidates = data.get('candidates', [])
+        candidate_ids = data.get('candidate_ids', [])
+        min_required_skills = int(data.get('min_required_skills', 0))
+        
+        if not job_data and data.get('job_id') is not None:
+            # Stored job with precomputed features
+            job_data = job_store.get_job(data['job_id'])
+            if job_data is None:
+                return jsonify({'error': f"Unknown job ID: {data['job_id']}"}), 404
+        
+        if not job_data or not (candidates or candidate_ids):
+            return jsonify({'error': 'Job data or job_id and candidates or candidate_ids are required'}), 400
+        
+        # Repeated requests are answered from the result cache; NDJSON streams are not cached
+        cache_key = None
+        if not wants_ndjson():
+            store_version = None
+            if candidate_ids:
+                candidate_store.refresh()
+                store_version = candidate_store.version
+            cache_key = result_cache.key('match', matcher.fingerprint(store_version), dict(
+                matcher.match_cache_inputs(job_data, candidates, candidate_ids),
+                min_score=data.get('min_score'),
+                top_k=data.get('top_k'),
+                min_required_skills=min_required_skills
+            ))
+            cached = result_cache.get(cache_key)
+            if cached is not None:
+                # Upsert the returned rows again (idempotent), so the match store agrees with
+                # this response even if it was reset or overwritten since the result was cached
+                if job_data.get('job_id') is not None:
+                    with metrics.span('match.persist'):
+                        match_store.save_matches(json.loads(cached)['matches'])
+                return current_app.response_class(cached, mimetype='application/json'), 200
+        
+        if candidate_ids:
+            try:
+                batch = matcher.match_job_batch_by_ids(job_data, candidate_ids, min_required_skills)
+            except KeyError as e:
+                return jsonify({'error': str(e.args[0])}), 404
+        else:
+            batch = matcher.match_job_batch(job_data, candidates, min_required_skills)
+        
+        # Threshold and rank vectorized; only returned rows become dicts
+        total_candidates = len(batch)
+        if data.get('min_score') is not None:
+            batch = batch.threshold(float(data['min_score']))
+        batch = batch.top_k(int(data['top_k'])) if data.get('top_k') is not None else batch.sorted()
+        
+        # Persist the returned results for the recommendation endpoints
+        with metrics.span('match.persist'):
+            match_store.save_batch(batch)
+        
+        if wants_ndjson():
+            summary = {'type': 'summary', 'job_id': job_data.get('job_id'), 'total_candidates': total_candidates}
+            records = itertools.chain(
+                [summary], (dict(match, type='match') for match in batch.iter_dicts())
+            )
+            return ndjson_response(records, excluded_fields())
+        
+        with metrics.span('match.serialize'):
+            body = current_app.json.dumps({
+                'job_id': job_data.get('job_id'),
+                'total_candidates': total_candidates,
+                'matches': batch.to_dicts()
+            })
+        result_cache.put(cache_key, body)
+        
+        return current_app.response_class(body, mimetype='application/json'), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@ml_bp.route('/match-batch', methods=['POST'])
+def match_candidates_batch():
+    """Match many jobs against a candidate pool, returning the top-k candidates per job"""
+    try:
+        data = request.get_json()
+        jobs = data.get('jobs', [])
+        candidates = data.get('candidates')
+        
+        if not jobs and data.get('job_ids'):
+            jobs, missing = job_store.get_jobs(data['job_ids'])
+            if missing:
+                return jsonify({'error': f"Unknown job IDs: {', '.join(missing[:10])}"}), 404
+        candidate_ids = data.get('candidate_ids')
+        top_k = int(data.get('top_k', Config.MAX_RECOMMENDATIONS))
+        min_required_skills = int(data.get('min_required_skills', 0))
+        
+        if not jobs:
+            return jsonify({'error': 'Jobs are required'}), 400
+        if candidates is None and candidate_ids is None and not len(candidate_store):
+            return jsonify({'error': 'Candidates or candidate_ids are required'}), 400
+        
+        try:
+            results = matcher.match_jobs_batch(jobs, candidates=candidates, candidate_ids=candidate_ids, top_k=top_k,
+                                               min_required_skills=min_required_skills)
+        except KeyError as e:
+            return jsonify({'error': str(e.args[0])}), 404
+        
+        match_store.save_matches(match for result in results for match in result['matches'])
+        
+        return jsonify({
+            'total_jobs': len(jobs),
+            'top_k': top_k,
+            'results': results
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@ml_bp.route('/candidates', methods=['POST'])
+def index_candidates():
+    """Add or replace candidates in the persistent vector store"""
+    try:
+        data = request.get_json()
+        candidates = data.get('candidates', [])
         
-        if not job_data or not candidates:
-            return jsonify({'error': 'Job data and candidates are required'}), 400
+        if not candidates:
+            return jsonify({'error': 'Candidates are required'}), 400
         
-        matches = matcher.match_job_with_candidates(job_data, candidates)
+        indexed = candidate_store.add_candidates(candidates)
         
         return jsonify({
-            'job_id': job_data.get('job_id'),
-            'total_candidates': len(candidates),
-            'matches': matches
+            'indexed': indexed,
+            'total_candidates': len(candidate_store),
+            'generation': candidate_store.generation
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@ml_bp.route('/candidates', methods=['DELETE'])
+def remove_candidates():
+    """Remove candidates from the persistent vector store"""
+    try:
+        data = request.get_json()
+        candidate_ids = data.get('candidate_ids', [])
+        
+        if not candidate_ids:
+            return jsonify({'error': 'candidate_ids are required'}), 400
+        
+        removed = candidate_store.remove_candidates(candidate_ids)
+        
+        return jsonify({
+            'removed': removed,
+            'total_candidates': len(candidate_store),
+            'generation': candidate_store.generation
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@ml_bp.route('/candidates/compact', methods=['POST'])
+def compact_candidates():
+    """Fold pending vector store updates into a new generation"""
+    try:
+        candidate_store.compact(force=True)
+        
+        return jsonify({
+            'total_candidates': len(candidate_store),
+            'generation': candidate_store.generation
         }), 200
         
     except Exception as e:
@@ -115,7 +624,16 @@ def calculate_similarity_endpoint():
         if not text1 or not text2:
             return jsonify({'error': 'Both texts are required'}), 400
         
-        similarity = matcher.calculate_similarity(text1, text2)
+        cache_key = result_cache.key('similarity', matcher.fingerprint(), {
+            'text1': normalize_text(text1),
+            'text2': normalize_text(text2)
+        })
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            similarity = float(cached)
+        else:
+            similarity = matcher.calculate_similarity(text1, text2)
+            result_cache.put(cache_key, repr(similarity))
         
         return jsonify({
             'text1': text1[:100] + '...' if len(text1) > 100 else text1,
@@ -125,3 +643,19 @@ def calculate_similarity_endpoint():
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+@ml_bp.route('/cache-stats', methods=['GET'])
+def result_cache_stats():
+    """Report result cache counters"""
+    try:
+        return jsonify(result_cache.stats()), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@ml_bp.route('/cache', methods=['DELETE'])
+def clear_result_cache():
+    """Drop every cached similarity and match result"""
+    try:
+        return jsonify({'cleared': result_cache.invalidate()}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
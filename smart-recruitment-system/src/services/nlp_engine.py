@@ -3,37 +3,211 @@ NLP Processing Service
 """
 
 import re
-import nltk
+import threading
+import time
 from flask import Blueprint, request, jsonify
 from typing import List, Dict, Any
-import spacy
+
+from services.corpus_stats import SCORING_METHODS, corpus_stats
+from services.skill_extractor import get_skill_extractor
+from utils.config import Config
+from utils.metrics import metrics
 
 nlp_bp = Blueprint('nlp_engine', __name__)
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# NLTK resources required by the preprocessing endpoints
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet'
+}
+
+# Models are loaded on first use, never at import time
+_models: Dict[str, Any] = {}
+_models_lock = threading.Lock()
+
+def _ensure_nltk_resource(package):
+    """Make sure an NLTK resource is installed, downloading only if allowed"""
+    import nltk
+    
+    try:
+        nltk.data.find(NLTK_RESOURCES[package])
+    except LookupError:
+        if not Config.NLTK_AUTO_DOWNLOAD:
+            raise LookupError(
+                f"NLTK resource '{package}' is not installed; run: python -m nltk.downloader {package}"
+            )
+        nltk.download(package, quiet=True)
+
+def _get_model(name, loader):
+    """Load a model once, thread-safely"""
+    if name not in _models:
+        with _models_lock:
+            if name not in _models:
+                _models[name] = loader()
+    return _models[name]
+
+def _load_stop_words():
+    _ensure_nltk_resource('stopwords')
+    from nltk.corpus import stopwords
+    return set(stopwords.words('english'))
+
+def _load_lemmatizer():
+    _ensure_nltk_resource('wordnet')
+    from nltk.stem import WordNetLemmatizer
+    lemmatizer = WordNetLemmatizer()
+    lemmatizer.lemmatize('warmup')  # Force the lazy WordNet corpus to load
+    return lemmatizer
+
+def _load_tokenizer():
+    _ensure_nltk_resource('punkt')
+    from nltk.tokenize import word_tokenize
+    word_tokenize('warmup')  # Force the punkt model to load
+    return word_tokenize
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+def _load_spacy():
+    try:
+        import spacy
+        return spacy.load("en_core_web_sm")
+    except (ImportError, OSError):
+        return None
+
+def get_stop_words():
+    """English stop words"""
+    return _get_model('stop_words', _load_stop_words)
+
+def get_lemmatizer():
+    """WordNet lemmatizer"""
+    return _get_model('lemmatizer', _load_lemmatizer)
+
+def get_tokenizer():
+    """NLTK word tokenizer"""
+    return _get_model('tokenizer', _load_tokenizer)
 
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
+def get_nlp():
+    """spaCy pipeline, or None when the model is not installed"""
+    return _get_model('spacy', _load_spacy)
+
+def warmup(include_spacy=True, ignore_missing=False):
+    """Preload models before traffic arrives, returning load time per model in seconds
+    
+    With ``ignore_missing``, models whose data is not installed are reported
+    instead of raising, and are left to load lazily.
+    """
+    loaders = [
+        ('stop_words', get_stop_words),
+        ('lemmatizer', get_lemmatizer),
+        ('tokenizer', get_tokenizer),
+        ('skill_extractor', get_skill_extractor)
+    ]
+    if include_spacy:
+        loaders.append(('spacy', get_nlp))
+    
+    timings = {}
+    for name, loader in loaders:
+        start = time.perf_counter()
+        try:
+            model = loader()
+        except LookupError as e:
+            if not ignore_missing:
+                raise
+            timings[name] = {'seconds': round(time.perf_counter() - start, 6), 'loaded': False, 'error': str(e)}
+            continue
+        timings[name] = {
+            'seconds': round(time.perf_counter() - start, 6),
+            'loaded': model is not None
+        }
+    return timings
+
+@metrics.timed('nlp.preprocess')
+def preprocess_batch(texts, engine='nltk', batch_size=None, n_process=None):
+    """Clean, tokenize, drop stop words and lemmatize many documents
+    
+    The NLTK engine memoizes lemmas across the batch; the spaCy engine streams
+    the documents through ``nlp.pipe``.
+    """
+    batch_size = batch_size or Config.NLP_BATCH_SIZE
+    n_process = n_process or Config.NLP_N_PROCESS
+    
+    # Clean text
+    cleaned_texts = [re.sub(r'[^\w\s]', '', (text or '').lower()) for text in texts]
+    
+    if engine == 'spacy':
+        nlp = get_nlp()
+        if nlp is None:
+            raise LookupError("spaCy model 'en_core_web_sm' is not installed")
+        
+        return [
+            [token.lemma_ for token in doc if not token.is_stop and len(token.text) > 2 and not token.is_space]
+            for doc in nlp.pipe(cleaned_texts, batch_size=batch_size, n_process=n_process,
+                                disable=['parser', 'ner'])
+        ]
+    
+    tokenize = get_tokenizer()
+    lemmatizer = get_lemmatizer()
+    stop_words = get_stop_words()
+    lemmas = {}
+    
+    results = []
+    for cleaned_text in cleaned_texts:
+        processed_tokens = []
+        for token in tokenize(cleaned_text):
+            if token in stop_words or len(token) <= 2:
+                continue
+            lemma = lemmas.get(token)
+            if lemma is None:
+                lemma = lemmas[token] = lemmatizer.lemmatize(token)
+            processed_tokens.append(lemma)
+        results.append(processed_tokens)
+    
+    return results
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    nlp = None
+@metrics.timed('nlp.extract_keywords')
+def extract_keyword_frequencies(text, top_n=20):
+    """Top keywords of a document ranked by raw frequency"""
+    # Simple keyword extraction based on frequency
+    words = re.findall(r'\b\w+\b', (text or '').lower())
+    stop_words = get_stop_words()
+    word_freq = {}
+    
+    for word in words:
+        if word not in stop_words and len(word) > 2:
+            word_freq[word] = word_freq.get(word, 0) + 1
+    
+    # Get top keywords
+    return sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:top_n]
 
-# Initialize lemmatizer
-lemmatizer = WordNetLemmatizer()
-stop_words = set(stopwords.words('english'))
+def score_keywords(texts, scoring='frequency', top_n=20):
+    """Top keywords of many documents by raw frequency, or by TF-IDF/BM25 over the ingested corpus"""
+    if scoring == 'frequency':
+        return [extract_keyword_frequencies(text, top_n) for text in texts]
+    return corpus_stats.top_keywords(texts, scoring=scoring, top_n=top_n)
+
+def _keyword_options(data):
+    """Validate the scoring and top_n of a keyword request, returning (scoring, top_n, error)"""
+    scoring = data.get('scoring', Config.KEYWORD_SCORING)
+    if scoring not in ('frequency',) + SCORING_METHODS:
+        return None, None, f"scoring must be one of: {', '.join(('frequency',) + SCORING_METHODS)}"
+    try:
+        top_n = int(data.get('top_n', 20))
+    except (TypeError, ValueError):
+        top_n = 0
+    if top_n < 1:
+        return None, None, 'top_n must be a positive integer'
+    return scoring, top_n, None
+
+def _keyword_result(top_keywords, scoring):
+    """Response body for one document's keywords"""
+    if scoring == 'frequency':
+        return {'keywords': [kw[0] for kw in top_keywords], 'keyword_frequencies': dict(top_keywords)}
+    return {'keywords': [kw[0] for kw in top_keywords], 'keyword_scores': dict(top_keywords), 'scoring': scoring}
+
+def _get_texts(data):
+    """Validate the list of documents of a batch request"""
+    texts = data.get('texts', [])
+    if not isinstance(texts, list) or not texts:
+        return None
+    return texts
 
 @nlp_bp.route('/preprocess-text', methods=['POST'])
 def preprocess_text():
@@ -45,18 +219,7 @@ def preprocess_text():
         if not text:
             return jsonify({'error': 'No text provided'}), 400
         
-        # Clean text
-        cleaned_text = re.sub(r'[^\w\s]', '', text.lower())
-        
-        # Tokenize
-        tokens = word_tokenize(cleaned_text)
-        
-        # Remove stopwords and lemmatize
-        processed_tokens = [
-            lemmatizer.lemmatize(token) 
-            for token in tokens 
-            if token not in stop_words and len(token) > 2
-        ]
+        processed_tokens = preprocess_batch([text])[0]
         
         return jsonify({
             'original_text': text,
@@ -67,6 +230,39 @@ def preprocess_text():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@nlp_bp.route('/preprocess-text-batch', methods=['POST'])
+def preprocess_text_batch():
+    """Preprocess many documents through the batched pipeline"""
+    try:
+        data = request.get_json()
+        texts = _get_texts(data)
+        
+        if texts is None:
+            return jsonify({'error': 'Expected a non-empty list of texts'}), 400
+        
+        engine = data.get('engine', 'nltk')
+        if engine not in ('nltk', 'spacy'):
+            return jsonify({'error': "engine must be 'nltk' or 'spacy'"}), 400
+        
+        batches = preprocess_batch(
+            texts,
+            engine=engine,
+            batch_size=data.get('batch_size'),
+            n_process=data.get('n_process')
+        )
+        
+        return jsonify({
+            'results': [{
+                'original_text': text,
+                'processed_tokens': processed_tokens,
+                'token_count': len(processed_tokens)
+            } for text, processed_tokens in zip(texts, batches)],
+            'total_documents': len(texts)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @nlp_bp.route('/extract-keywords', methods=['POST'])
 def extract_keywords():
     """Extract keywords from text"""
@@ -77,20 +273,39 @@ def extract_keywords():
         if not text:
             return jsonify({'error': 'No text provided'}), 400
         
-        # Simple keyword extraction based on frequency
-        words = re.findall(r'\b\w+\b', text.lower())
-        word_freq = {}
+        scoring, top_n, error = _keyword_options(data)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        top_keywords = score_keywords([text], scoring, top_n)[0]
+        
+        return jsonify(_keyword_result(top_keywords, scoring)), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@nlp_bp.route('/extract-keywords-batch', methods=['POST'])
+def extract_keywords_batch():
+    """Extract keywords from many documents in one call"""
+    try:
+        data = request.get_json()
+        texts = _get_texts(data)
+        
+        if texts is None:
+            return jsonify({'error': 'Expected a non-empty list of texts'}), 400
         
-        for word in words:
-            if word not in stop_words and len(word) > 2:
-                word_freq[word] = word_freq.get(word, 0) + 1
+        scoring, top_n, error = _keyword_options(data)
+        if error:
+            return jsonify({'error': error}), 400
         
-        # Get top keywords
-        top_keywords = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:20]
+        results = [
+            _keyword_result(top_keywords, scoring)
+            for top_keywords in score_keywords(texts, scoring, top_n)
+        ]
         
         return jsonify({
-            'keywords': [kw[0] for kw in top_keywords],
-            'keyword_frequencies': dict(top_keywords)
+            'results': results,
+            'total_documents': len(results)
         }), 200
         
     except Exception as e:
@@ -106,18 +321,9 @@ def extract_skills():
         if not text:
             return jsonify({'error': 'No text provided'}), 400
         
-        # Common technical skills list (simplified)
-        technical_skills = [
-            'python', 'java', 'javascript', 'react', 'angular', 'vue', 'node.js',
-            'sql', 'mongodb', 'postgresql', 'mysql', 'redis', 'docker', 'kubernetes',
-            'aws', 'azure', 'gcp', 'machine learning', 'deep learning', 'ai', 'nlp',
-            'data science', 'data analysis', 'pandas', 'numpy', 'scikit-learn', 'tensorflow',
-            'pytorch', 'git', 'linux', 'agile', 'scrum', 'rest api', 'microservices'
-        ]
-        
-        # Extract skills from text
-        text_lower = text.lower()
-        found_skills = [skill for skill in technical_skills if skill in text_lower]
+        # Single pass over the text with the compiled skill taxonomy
+        with metrics.span('nlp.extract_skills'):
+            found_skills = get_skill_extractor().extract(text)
         
         return jsonify({
             'extracted_skills': found_skills,
@@ -126,3 +332,34 @@ def extract_skills():
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+@nlp_bp.route('/extract-skills-batch', methods=['POST'])
+def extract_skills_batch():
+    """Extract skills from many resume texts in one call"""
+    try:
+        data = request.get_json()
+        texts = _get_texts(data)
+        
+        if texts is None:
+            return jsonify({'error': 'Expected a non-empty list of texts'}), 400
+        
+        with metrics.span('nlp.extract_skills'):
+            skill_lists = get_skill_extractor().extract_batch(texts)
+        results = [{'extracted_skills': skills, 'skill_count': len(skills)} for skills in skill_lists]
+        
+        return jsonify({
+            'results': results,
+            'total_documents': len(results)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@nlp_bp.route('/warmup', methods=['POST'])
+def warmup_models():
+    """Preload NLP models and report how long each took"""
+    try:
+        include_spacy = request.args.get('spacy', 'true').lower() == 'true'
+        return jsonify({'models': warmup(include_spacy=include_spacy)}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
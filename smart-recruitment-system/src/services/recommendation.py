@@ -2,16 +2,28 @@
 Recommendation Service
 """
 
-from flask import Blueprint, request, jsonify
-from typing import List, Dict, Any
+from flask import Blueprint, request, jsonify, url_for
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+from services.match_store import MatchStore, match_store
+from utils.config import Config
 
 rec_bp = Blueprint('recommendation', __name__)
 
+# Report categories as (name, min_score, max_score)
+REPORT_CATEGORIES = [
+    ('highly_recommended', 0.8, None),
+    ('recommended', 0.6, 0.8),
+    ('consider', 0.4, 0.6)
+]
+REPORT_QUANTILES = (0.25, 0.5, 0.75, 0.9)
+
 class RecommendationEngine:
     """Generate recommendations based on match scores"""
     
-    def __init__(self):
-        self.min_match_threshold = 0.3
+    def __init__(self, store: Optional[MatchStore] = None):
+        self.min_match_threshold = Config.MIN_MATCH_THRESHOLD
+        self.store = store
     
     def get_top_candidates(self, matches: List[Dict[str, Any]], limit: int = 10) -> List[Dict[str, Any]]:
         """Get top N candidates based on match scores"""
@@ -24,80 +36,129 @@ class RecommendationEngine:
         # Limit results
         return sorted_matches[:limit]
     
-    def generate_recommendation_report(self, matches: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Generate detailed recommendation report"""
-        if not matches:
+    def get_top_candidates_for_job(self, job_id: str, limit: int = 10, min_score: Optional[float] = None,
+                                   max_score: Optional[float] = None,
+                                   cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get a page of a job's top candidates from the match store index"""
+        if min_score is None:
+            min_score = self.min_match_threshold
+        return self.store.top_matches(job_id, limit, min_score=min_score, max_score=max_score, cursor=cursor)
+    
+    def generate_recommendation_report(self, matches: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Generate a recommendation report in one streaming pass over the matches
+        
+        Memory use is constant: categories are returned as score ranges with
+        counts, to be paged through the top-candidates endpoint, rather than as
+        lists of matches.
+        """
+        summary = ScoreSummary()
+        category_counts = {name: 0 for name, _, _ in REPORT_CATEGORIES}
+        
+        for match in matches:
+            score = match.get('overall_match_score', 0)
+            summary.add(score)
+            for name, min_score, max_score in REPORT_CATEGORIES:
+                if score >= min_score and (max_score is None or score < max_score):
+                    category_counts[name] += 1
+                    break
+        
+        if summary.count == 0:
             return {
                 'total_candidates': 0,
-                'recommendations': [],
+                'recommendations': {'count': 0, 'min_score': 0.0, 'max_score': None},
                 'summary': {}
             }
         
-        # Categorize recommendations
-        highly_recommended = [m for m in matches if m.get('overall_match_score', 0) >= 0.8]
-        recommended = [m for m in matches if 0.6 <= m.get('overall_match_score', 0) < 0.8]
-        consider = [m for m in matches if 0.4 <= m.get('overall_match_score', 0) < 0.6]
-        
-        summary = {
-            'total_candidates': len(matches),
-            'highly_recommended': len(highly_recommended),
-            'recommended': len(recommended),
-            'consider': len(consider),
-            'average_score': sum(m.get('overall_match_score', 0) for m in matches) / len(matches)
-        }
-        
         return {
-            'summary': summary,
-            'recommendations': matches,
+            'summary': dict(
+                {'total_candidates': summary.count, 'average_score': summary.mean()},
+                **category_counts
+            ),
+            'distribution': {
+                'histogram': summary.histogram(),
+                'quantiles': {f'p{int(q * 100)}': summary.quantile(q) for q in REPORT_QUANTILES}
+            },
+            'recommendations': {'count': summary.count, 'min_score': 0.0, 'max_score': None},
             'categories': {
-                'highly_recommended': highly_recommended,
-                'recommended': recommended,
-                'consider': consider
+                name: {'count': category_counts[name], 'min_score': min_score, 'max_score': max_score}
+                for name, min_score, max_score in REPORT_CATEGORIES
             }
         }
 
+class ScoreSummary:
+    """Constant-memory running statistics over scores in [0, 1]
+    
+    Quantiles are estimated from a fine fixed-width histogram, so they are
+    accurate to within one bin width.
+    """
+    
+    def __init__(self, fine_bins: int = 1000, report_bins: int = 10):
+        self.fine_bins = fine_bins
+        self.report_bins = report_bins
+        self.counts = [0] * fine_bins
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+    
+    def add(self, score: float):
+        score = float(score)
+        self.count += 1
+        self.total += score
+        self.minimum = score if self.minimum is None else min(self.minimum, score)
+        self.maximum = score if self.maximum is None else max(self.maximum, score)
+        self.counts[min(max(int(score * self.fine_bins), 0), self.fine_bins - 1)] += 1
+    
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+    
+    def histogram(self) -> List[Dict[str, Any]]:
+        """Counts per report bin"""
+        width = self.fine_bins // self.report_bins
+        return [{
+            'min_score': round(i / self.report_bins, 6),
+            'max_score': round((i + 1) / self.report_bins, 6),
+            'count': sum(self.counts[i * width:(i + 1) * width])
+        } for i in range(self.report_bins)]
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate q-quantile, interpolated within the matching bin"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for i, bin_count in enumerate(self.counts):
+            if bin_count and seen + bin_count >= target:
+                fraction = (target - seen) / bin_count
+                estimate = (i + fraction) / self.fine_bins
+                return round(min(max(estimate, self.minimum), self.maximum), 6)
+            seen += bin_count
+        return self.maximum
+
 # Initialize recommendation engine
-rec_engine = RecommendationEngine()
+rec_engine = RecommendationEngine(store=match_store)
 
 @rec_bp.route('/top-candidates/<job_id>', methods=['GET'])
 def get_top_candidates(job_id):
     """Get top candidates for a specific job"""
     try:
         limit = int(request.args.get('limit', 10))
+        cursor = request.args.get('cursor')
+        min_score = request.args.get('min_score', type=float)
+        max_score = request.args.get('max_score', type=float)
         
-        # In a real implementation, this would fetch from database
-        # For now, we'll use mock data
-        mock_matches = [
-            {
-                'job_id': job_id,
-                'candidate_id': 'candidate_001',
-                'name': 'John Doe',
-                'overall_match_score': 0.85,
-                'skill_match_score': 0.9,
-                'experience_match_score': 0.8,
-                'education_match_score': 0.85,
-                'matched_skills': ['python', 'machine learning', 'sql'],
-                'missing_skills': ['kubernetes']
-            },
-            {
-                'job_id': job_id,
-                'candidate_id': 'candidate_002',
-                'name': 'Jane Smith',
-                'overall_match_score': 0.78,
-                'skill_match_score': 0.85,
-                'experience_match_score': 0.75,
-                'education_match_score': 0.8,
-                'matched_skills': ['python', 'data science', 'pandas'],
-                'missing_skills': ['docker', 'kubernetes']
-            }
-        ]
-        
-        top_candidates = rec_engine.get_top_candidates(mock_matches, limit)
+        try:
+            top_candidates, next_cursor = rec_engine.get_top_candidates_for_job(
+                job_id, limit, min_score=min_score, max_score=max_score, cursor=cursor
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         return jsonify({
             'job_id': job_id,
             'top_candidates': top_candidates,
-            'total_found': len(top_candidates)
+            'total_found': len(top_candidates),
+            'next_cursor': next_cursor
         }), 200
         
     except Exception as e:
@@ -107,44 +168,15 @@ def get_top_candidates(job_id):
 def get_recommendation_report(job_id):
     """Get detailed recommendation report for a job"""
     try:
-        # In a real implementation, this would fetch from database
-        mock_matches = [
-            {
-                'job_id': job_id,
-                'candidate_id': 'candidate_001',
-                'name': 'John Doe',
-                'overall_match_score': 0.85,
-                'skill_match_score': 0.9,
-                'experience_match_score': 0.8,
-                'education_match_score': 0.85,
-                'matched_skills': ['python', 'machine learning', 'sql'],
-                'missing_skills': ['kubernetes']
-            },
-            {
-                'job_id': job_id,
-                'candidate_id': 'candidate_002',
-                'name': 'Jane Smith',
-                'overall_match_score': 0.78,
-                'skill_match_score': 0.85,
-                'experience_match_score': 0.75,
-                'education_match_score': 0.8,
-                'matched_skills': ['python', 'data science', 'pandas'],
-                'missing_skills': ['docker', 'kubernetes']
-            },
-            {
-                'job_id': job_id,
-                'candidate_id': 'candidate_003',
-                'name': 'Bob Johnson',
-                'overall_match_score': 0.65,
-                'skill_match_score': 0.7,
-                'experience_match_score': 0.6,
-                'education_match_score': 0.7,
-                'matched_skills': ['java', 'spring', 'sql'],
-                'missing_skills': ['python', 'machine learning']
-            }
-        ]
+        report = rec_engine.generate_recommendation_report(match_store.iter_matches(job_id))
         
-        report = rec_engine.generate_recommendation_report(mock_matches)
+        # Link each category to its pages on the top-candidates endpoint
+        references = [report['recommendations']] + list(report.get('categories', {}).values())
+        for reference in references:
+            params = {'job_id': job_id, 'min_score': reference['min_score']}
+            if reference['max_score'] is not None:
+                params['max_score'] = reference['max_score']
+            reference['href'] = url_for('recommendation.get_top_candidates', **params)
         
         return jsonify(report), 200
         
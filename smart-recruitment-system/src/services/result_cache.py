@@ -0,0 +1,207 @@
+"""
+Result Cache Service
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from typing import Dict, Any, Optional, Tuple
+
+from utils.config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    stored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_stored_at ON results (stored_at);
+"""
+
+# Bump when scoring changes so persisted results from older code stop matching
+CACHE_FORMAT_VERSION = 1
+
+# Puts between pruning passes over the disk tier
+PRUNE_EVERY = 256
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace; the vectorizers tokenize both forms identically"""
+    return ' '.join((text or '').lower().split())
+
+
+class ResultCache:
+    """Bounded cache of computed similarity and match results
+
+    Keys are SHA-256 digests of the canonical JSON of a request's inputs and a
+    fingerprint of the settings that affect its scores (engine, weights,
+    vector store version), so a configuration or index change makes old
+    entries unreachable rather than stale. Values are JSON text. The memory
+    tier is an LRU bounded in bytes; the optional disk tier is an SQLite table
+    shared by worker processes that survives restarts.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float = 0, db_path: Optional[str] = None,
+                 max_disk_entries: int = 100000, enabled: bool = True):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.db_path = db_path
+        self.max_disk_entries = max_disk_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: 'OrderedDict[str, Tuple[str, Optional[float]]]' = OrderedDict()
+        self._total_bytes = 0
+        self._puts = 0
+        self._initialized = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(namespace: str, fingerprint: Dict[str, Any], inputs: Dict[str, Any]) -> str:
+        """Stable digest of a request's inputs and the configuration that scored them"""
+        payload = json.dumps([CACHE_FORMAT_VERSION, namespace, fingerprint, inputs],
+                             sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        if not self._initialized:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(SCHEMA)
+            self._initialized = True
+        return connection
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached JSON text for a key, or None on a miss"""
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._forget(key)
+                self.expirations += 1
+
+        value, expires_at = self._disk_get(key, now)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self._remember(key, value, expires_at)
+            self.hits += 1
+            self.disk_hits += 1
+            return value
+
+    def put(self, key: str, value: str):
+        """Store JSON text in memory and, when configured, on disk"""
+        if not self.enabled:
+            return
+
+        expires_at = time.time() + self.ttl if self.ttl > 0 else None
+        with self._lock:
+            self._remember(key, value, expires_at)
+            self._puts += 1
+            prune = self._puts % PRUNE_EVERY == 0
+
+        if self.db_path:
+            with closing(self._connect()) as connection, connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO results (key, value, expires_at, stored_at) VALUES (?, ?, ?, ?)',
+                    (key, value, expires_at, time.time())
+                )
+                if prune:
+                    self._prune(connection)
+
+    def _disk_get(self, key: str, now: float) -> Tuple[Optional[str], Optional[float]]:
+        if not self.db_path:
+            return None, None
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                'SELECT value, expires_at FROM results WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+                (key, now)
+            ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def _prune(self, connection: sqlite3.Connection):
+        """Drop expired rows and the oldest rows beyond the disk entry limit"""
+        connection.execute('DELETE FROM results WHERE expires_at IS NOT NULL AND expires_at <= ?', (time.time(),))
+        excess = connection.execute('SELECT COUNT(*) FROM results').fetchone()[0] - self.max_disk_entries
+        if excess > 0:
+            connection.execute(
+                'DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY stored_at LIMIT ?)', (excess,)
+            )
+
+    def _remember(self, key: str, value: str, expires_at: Optional[float]):
+        self._forget(key)
+        self._entries[key] = (value, expires_at)
+        self._total_bytes += len(value)
+        self._evict()
+
+    def _forget(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= len(entry[0])
+
+    def _evict(self):
+        """Drop least recently used entries until the memory tier fits"""
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (value, _) = self._entries.popitem(last=False)
+            self._total_bytes -= len(value)
+            self.evictions += 1
+
+    def invalidate(self) -> int:
+        """Drop every cached result, in memory and on disk; returns the memory entries dropped"""
+        with self._lock:
+            dropped = len(self._entries)
+            self._entries.clear()
+            self._total_bytes = 0
+        if self.db_path:
+            with closing(self._connect()) as connection, connection:
+                connection.execute('DELETE FROM results')
+        return dropped
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters for this process"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'entries': len(self._entries),
+                'size_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'disk': bool(self.db_path)
+            }
+
+
+# Initialize result cache
+result_cache = ResultCache(
+    Config.RESULT_CACHE_MAX_BYTES,
+    ttl=Config.RESULT_CACHE_TTL,
+    db_path=os.path.join(Config.PROCESSED_FOLDER, 'result_cache.db') if Config.RESULT_CACHE_DISK else None,
+    max_disk_entries=Config.RESULT_CACHE_DISK_MAX_ENTRIES,
+    enabled=Config.RESULT_CACHE_ENABLED
+)
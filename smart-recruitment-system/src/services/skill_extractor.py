@@ -0,0 +1,164 @@
+"""
+Skill Extraction Service
+"""
+
+import json
+import re
+import threading
+from typing import List, Dict, Any, Optional, Union
+
+from utils.config import Config
+
+# Default taxonomy used when SKILL_TAXONOMY_PATH is not configured
+DEFAULT_TAXONOMY = [
+    {'name': 'python'},
+    {'name': 'java'},
+    {'name': 'javascript', 'aliases': ['js']},
+    {'name': 'react', 'aliases': ['react.js', 'reactjs']},
+    {'name': 'angular', 'aliases': ['angularjs']},
+    {'name': 'vue', 'aliases': ['vue.js', 'vuejs']},
+    {'name': 'node.js', 'aliases': ['nodejs']},
+    {'name': 'sql'},
+    {'name': 'mongodb'},
+    {'name': 'postgresql', 'aliases': ['postgres']},
+    {'name': 'mysql'},
+    {'name': 'redis'},
+    {'name': 'docker'},
+    {'name': 'kubernetes', 'aliases': ['k8s']},
+    {'name': 'aws', 'aliases': ['amazon web services']},
+    {'name': 'azure'},
+    {'name': 'gcp', 'aliases': ['google cloud platform']},
+    {'name': 'machine learning'},
+    {'name': 'deep learning'},
+    {'name': 'ai', 'aliases': ['artificial intelligence']},
+    {'name': 'nlp', 'aliases': ['natural language processing']},
+    {'name': 'data science'},
+    {'name': 'data analysis'},
+    {'name': 'pandas'},
+    {'name': 'numpy'},
+    {'name': 'scikit-learn', 'aliases': ['sklearn']},
+    {'name': 'tensorflow'},
+    {'name': 'pytorch'},
+    {'name': 'git'},
+    {'name': 'linux'},
+    {'name': 'agile'},
+    {'name': 'scrum'},
+    {'name': 'rest api', 'aliases': ['rest apis', 'restful api']},
+    {'name': 'microservices'}
+]
+
+
+def _normalize(term: str) -> str:
+    """Lowercase and collapse whitespace"""
+    return ' '.join(term.lower().split())
+
+
+class SkillExtractor:
+    """Single-pass skill matcher compiled from a skill taxonomy
+
+    All skill names and aliases are merged into a trie and emitted as one
+    regular expression, so a text is scanned once regardless of taxonomy size.
+    Matches must start and end on word boundaries.
+    """
+
+    def __init__(self, taxonomy: List[Union[str, Dict[str, Any]]]):
+        self.skills: List[str] = []
+        self.aliases: Dict[str, str] = {}
+        self._rank: Dict[str, int] = {}
+
+        for entry in taxonomy:
+            if isinstance(entry, str):
+                entry = {'name': entry}
+            name = _normalize(entry.get('name', ''))
+            if not name or name in self._rank:
+                continue
+            self._rank[name] = len(self.skills)
+            self.skills.append(name)
+            for alias in [name] + list(entry.get('aliases', [])):
+                alias = _normalize(alias)
+                if alias:
+                    self.aliases.setdefault(alias, name)
+
+        self.pattern = self._compile(self.aliases.keys())
+
+    @classmethod
+    def from_file(cls, path: str) -> 'SkillExtractor':
+        """Load a taxonomy from a JSON list of names or {name, aliases} objects"""
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get('skills', [])
+        return cls(data)
+
+    @staticmethod
+    def _compile(aliases) -> Optional[re.Pattern]:
+        """Compile aliases into one trie-shaped regular expression"""
+        trie: Dict[str, Any] = {}
+        for alias in aliases:
+            node = trie
+            for char in alias:
+                node = node.setdefault(char, {})
+            node[''] = True
+
+        if not trie:
+            return None
+
+        def emit(node: Dict[str, Any]) -> str:
+            branches = []
+            for char in sorted(key for key in node if key):
+                token = r'\s+' if char == ' ' else re.escape(char)
+                branches.append(token + emit(node[char]))
+            if not branches:
+                return ''
+            body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            if '' in node:
+                # Optional longer continuation; greedy, so the longest alias wins
+                return '(?:' + body + ')?'
+            return body
+
+        return re.compile(r'(?<!\w)(' + emit(trie) + r')(?!\w)')
+
+    def extract(self, text: str) -> List[str]:
+        """Extract canonical skill names, in taxonomy order"""
+        if not text or self.pattern is None:
+            return []
+
+        found = set()
+        for match in self.pattern.finditer(text.lower()):
+            skill = self.aliases.get(_normalize(match.group(1)))
+            if skill:
+                found.add(skill)
+
+        return sorted(found, key=self._rank.__getitem__)
+
+    def extract_batch(self, texts: List[str]) -> List[List[str]]:
+        """Extract skills from many texts"""
+        return [self.extract(text) for text in texts]
+
+    def canonicalize(self, skill: str) -> str:
+        """Canonical name of a skill or alias; unknown skills are only normalised"""
+        normalized = _normalize(skill)
+        return self.aliases.get(normalized, normalized)
+
+    def canonicalize_all(self, skills: Optional[List[Any]]) -> List[str]:
+        """Distinct canonical names of a skill list, in order, skipping blanks and non-strings"""
+        return list(dict.fromkeys(
+            self.canonicalize(skill) for skill in skills or [] if isinstance(skill, str) and skill.strip()
+        ))
+
+
+_extractor: Optional[SkillExtractor] = None
+_extractor_lock = threading.Lock()
+
+
+def get_skill_extractor() -> SkillExtractor:
+    """Return the shared extractor, compiling the taxonomy on first use"""
+    global _extractor
+    if _extractor is None:
+        with _extractor_lock:
+            if _extractor is None:
+                if Config.SKILL_TAXONOMY_PATH:
+                    _extractor = SkillExtractor.from_file(Config.SKILL_TAXONOMY_PATH)
+                else:
+                    _extractor = SkillExtractor(DEFAULT_TAXONOMY)
+    return _extractor
@@ -0,0 +1,127 @@
+"""
+Skill Index Service
+"""
+
+import threading
+from collections import defaultdict
+from typing import List, Dict, Iterable, Tuple
+
+import numpy as np
+
+try:
+    from pyroaring import BitMap
+except ImportError:  # pyroaring not installed; fall back to sorted NumPy row arrays
+    BitMap = None
+
+
+class SkillIndex:
+    """Inverted index from each skill to the rows that list it
+
+    Posting lists are compressed Roaring bitmaps when pyroaring is installed
+    and sorted NumPy arrays otherwise. Rows are only ever added; callers pass
+    the pool of rows they are interested in (live candidates, a requested
+    subset) and every lookup is restricted to it by intersection.
+    """
+
+    def __init__(self):
+        self.n_rows = 0
+        self._postings: Dict[str, object] = {}
+        self._pending: Dict[str, List[int]] = {}  # Appended rows not yet merged into the NumPy postings
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_skill_lists(cls, skill_lists: Iterable[List[str]]) -> 'SkillIndex':
+        """Index row i of skill_lists as row i"""
+        index = cls()
+        grouped = defaultdict(list)
+        for row, skills in enumerate(skill_lists):
+            for skill in set(skills or []):
+                grouped[skill].append(row)
+            index.n_rows = row + 1
+        for skill, rows in grouped.items():
+            index._postings[skill] = BitMap(rows) if BitMap is not None else np.asarray(rows, dtype=np.int64)
+        return index
+
+    def add(self, row: int, skills: List[str]):
+        """Index one more row"""
+        with self._lock:
+            for skill in set(skills or []):
+                if BitMap is not None:
+                    self._postings.setdefault(skill, BitMap()).add(row)
+                else:
+                    self._pending.setdefault(skill, []).append(row)
+            self.n_rows = max(self.n_rows, row + 1)
+
+    def _posting(self, skill: str):
+        if skill in self._pending:
+            with self._lock:
+                pending = self._pending.pop(skill, None)
+                if pending:
+                    # Rows are appended in increasing order, so the merged array stays sorted
+                    existing = self._postings.get(skill, np.zeros(0, dtype=np.int64))
+                    self._postings[skill] = np.concatenate([existing, np.asarray(pending, dtype=np.int64)])
+        return self._postings.get(skill)
+
+    def _members(self, skill: str, pool) -> np.ndarray:
+        """Rows of the pool that list the skill"""
+        posting = self._posting(skill)
+        if posting is None:
+            return np.zeros(0, dtype=np.int64)
+        if BitMap is not None:
+            return np.frombuffer((posting & pool).to_array(), dtype=np.uint32).astype(np.int64)
+        posting = posting[posting < len(pool)]
+        return posting[pool[posting]]
+
+    def _count(self, skills: List[str], rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray]]:
+        """Distinct pool rows, the inverse mapping back to ``rows``, and each skill's members as pool positions"""
+        rows = np.asarray(rows, dtype=np.int64)
+        if np.all(rows[1:] > rows[:-1]):
+            # Already sorted and distinct, as live rows are
+            unique, inverse = rows, np.arange(len(rows))
+        else:
+            unique, inverse = np.unique(rows, return_inverse=True)
+        if BitMap is not None:
+            contiguous = len(unique) and unique[-1] - unique[0] + 1 == len(unique)
+            pool = BitMap(range(unique[0], unique[-1] + 1)) if contiguous else BitMap(unique.astype(np.uint32))
+        else:
+            pool = np.zeros(max(self.n_rows, int(unique[-1]) + 1 if len(unique) else 0), dtype=bool)
+            pool[unique] = True
+        members = [np.searchsorted(unique, self._members(skill, pool)) for skill in dict.fromkeys(skills)]
+        return unique, inverse, members
+
+    def match_counts(self, skills: List[str], rows: np.ndarray) -> np.ndarray:
+        """How many of the distinct skills each of the rows lists"""
+        unique, inverse, members = self._count(skills, rows)
+        counts = np.zeros(len(unique), dtype=np.int64)
+        for positions in members:
+            counts[positions] += 1
+        return counts[inverse]
+
+    def filter(self, skills: List[str], min_count: int, rows: np.ndarray) -> np.ndarray:
+        """The rows that list at least min_count of the skills, in their original order"""
+        rows = np.asarray(rows, dtype=np.int64)
+        if min_count <= 0:
+            return rows
+        return rows[self.match_counts(skills, rows) >= min_count]
+
+    def matches(self, skills: List[str], rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Matched skills of each row as indices into the distinct skills, with row offsets
+
+        This is the ``skill_indices``/``skill_offsets`` layout of MatchResultBatch.
+        """
+        unique, inverse, members = self._count(skills, rows)
+        positions = np.concatenate(members) if members else np.zeros(0, dtype=np.int64)
+        skill_ids = np.repeat(np.arange(len(members), dtype=np.int64), [len(m) for m in members])
+
+        # Group by row, skills in job order within each row
+        order = np.lexsort((skill_ids, positions))
+        skill_ids = skill_ids[order]
+        offsets = np.zeros(len(unique) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(positions, minlength=len(unique)), out=offsets[1:])
+
+        # Expand from distinct rows back to the requested rows
+        lengths = np.diff(offsets)[inverse]
+        row_offsets = np.zeros(len(inverse) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=row_offsets[1:])
+        gather = np.repeat(offsets[:-1][inverse] - row_offsets[:-1], lengths) + np.arange(row_offsets[-1])
+        return skill_ids[gather], row_offsets
@@ -0,0 +1,584 @@
+"""
+Candidate Vector Store
+"""
+
+import json
+import os
+import shutil
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; the store is then only safe within one process
+    fcntl = None
+
+from services.skill_extractor import get_skill_extractor
+from services.skill_index import SkillIndex
+from utils.config import Config
+
+CURRENT_FILE = 'CURRENT'
+DELTA_LOG = 'delta.log'
+ARRAY_FILES = ('data', 'indices', 'indptr', 'doc_freq')
+
+# Lock files: one guards delta log appends and the generation switch, the other serializes compactions
+APPEND_LOCK = 'append.lock'
+COMPACTION_LOCK = 'compaction.lock'
+
+# Rows per block when computing candidate norms, bounding the temporaries
+NORM_BLOCK_ROWS = 4096
+
+
+class CandidateVectorStore:
+    """Persistent candidate term vectors, memory-mapped on load
+
+    Raw term counts are stored per candidate and IDF weighting is derived from
+    the document frequencies at query time. A generation is a compacted base
+    segment plus an append-only delta log: adding a candidate appends a delta
+    row, removing one leaves a tombstone, and either only touches the document
+    frequencies of that candidate's terms. Compaction folds the log into a new
+    generation with document frequencies recounted from the live rows.
+
+    Worker processes share the directory: appends and the switch to a new
+    generation hold an exclusive lock on it, and compactions run one at a time.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.analyzer = CountVectorizer(stop_words='english').build_analyzer()
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._compactor: Optional[threading.Thread] = None
+        self._reset()
+
+    def _reset(self):
+        """Reset to an empty store"""
+        self.vocabulary: Dict[str, int] = {}
+        self._doc_freq = np.zeros(0, dtype=np.int64)
+        self.matrix = sp.csr_matrix((0, 0), dtype=np.float32)
+        self.candidate_ids: List[str] = []
+        self.candidate_skills: List[List[str]] = []
+        self.id_index: Dict[str, int] = {}
+        self.tombstones: Set[int] = set()
+        self._delta_data: List[float] = []
+        self._delta_indices: List[int] = []
+        self._delta_indptr: List[int] = [0]
+        self._delta = None
+        self._log_offset = 0
+        self._skill_index: Optional[SkillIndex] = None
+
+    @property
+    def doc_freq(self) -> np.ndarray:
+        return self._doc_freq[:len(self.vocabulary)]
+
+    @property
+    def n_docs(self) -> int:
+        return len(self.id_index)
+
+    @property
+    def n_rows(self) -> int:
+        """Rows in the base and delta segments, including tombstoned ones"""
+        return len(self.candidate_ids)
+
+    @property
+    def n_delta(self) -> int:
+        return len(self._delta_indptr) - 1
+
+    @property
+    def version(self) -> str:
+        """Changes whenever candidates are added, removed or compacted"""
+        return f'{self.generation}:{self._log_offset}'
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return candidate_id in self.id_index
+
+    def idf(self) -> np.ndarray:
+        """Smooth IDF, as computed by scikit-learn's TfidfTransformer"""
+        return np.log((1.0 + self.n_docs) / (1.0 + self.doc_freq)) + 1.0
+
+    def count_terms(self, text: str) -> Dict[str, int]:
+        """Term counts of one document"""
+        return dict(Counter(self.analyzer(text or '')))
+
+    def _row_terms(self, row: int) -> np.ndarray:
+        """Term indices of a stored row"""
+        n_base = self.matrix.shape[0]
+        if row < n_base:
+            return np.asarray(self.matrix.indices[self.matrix.indptr[row]:self.matrix.indptr[row + 1]])
+        start, end = self._delta_indptr[row - n_base], self._delta_indptr[row - n_base + 1]
+        return np.asarray(self._delta_indices[start:end], dtype=np.int64)
+
+    def _append_row(self, candidate_id: str, skills: List[str], terms: Dict[str, int]):
+        """Append a delta row, replacing any live row of the same candidate"""
+        if candidate_id in self.id_index:
+            self._delete_row(self.id_index.pop(candidate_id))
+
+        indices = []
+        for term in terms:
+            index = self.vocabulary.get(term)
+            if index is None:
+                index = self.vocabulary[term] = len(self.vocabulary)
+            indices.append(index)
+
+        # Grow the document-frequency buffer geometrically with the vocabulary
+        if len(self.vocabulary) > len(self._doc_freq):
+            grown = np.zeros(max(len(self.vocabulary), 2 * len(self._doc_freq)), dtype=np.int64)
+            grown[:len(self._doc_freq)] = self._doc_freq
+            self._doc_freq = grown
+        self._doc_freq[indices] += 1
+
+        self._delta_indices.extend(indices)
+        self._delta_data.extend(terms.values())
+        self._delta_indptr.append(len(self._delta_indices))
+        if self._skill_index is not None:
+            self._skill_index.add(self.n_rows, skills)
+        self.id_index[candidate_id] = self.n_rows
+        self.candidate_ids.append(candidate_id)
+        self.candidate_skills.append(list(skills))
+        self._delta = None
+
+    def _delete_row(self, row: int):
+        """Tombstone a row and retract its document frequencies"""
+        self._doc_freq[self._row_terms(row)] -= 1
+        self.tombstones.add(row)
+
+    def _apply(self, record: Dict[str, Any]):
+        """Apply one delta log record"""
+        candidate_id = record['id']
+        if record['op'] == 'add':
+            self._append_row(candidate_id, record.get('skills', []), record.get('terms', {}))
+        elif record['op'] == 'remove' and candidate_id in self.id_index:
+            self._delete_row(self.id_index.pop(candidate_id))
+
+    def _log_path(self, generation: Optional[int] = None) -> str:
+        return os.path.join(self.directory, f'generation-{generation or self.generation}', DELTA_LOG)
+
+    def _replay(self) -> int:
+        """Apply records appended to the delta log since it was last read"""
+        try:
+            log = open(self._log_path(), 'rb')
+        except FileNotFoundError:
+            return 0
+
+        applied = 0
+        with log:
+            log.seek(self._log_offset)
+            for line in log:
+                if not line.endswith(b'\n'):
+                    break  # Record still being written
+                self._apply(json.loads(line))
+                self._log_offset += len(line)
+                applied += 1
+        return applied
+
+    @contextmanager
+    def _file_lock(self, name: str = APPEND_LOCK):
+        """Hold an exclusive lock shared with the other processes using the directory
+
+        Never nested, and always taken before the thread lock.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, name), 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield  # Closing the file releases the lock
+
+    def _append_records(self, records: List[Dict[str, Any]]):
+        """Persist records to the delta log, then apply them"""
+        if self.generation == 0 and not self.refresh():
+            self.save()
+
+        with self._file_lock(), self._lock:
+            self._write_records(records)
+
+    def _write_records(self, records: List[Dict[str, Any]]):
+        """Append records to the current generation's log; the caller holds both locks"""
+        # A compaction may have switched generations since this process last looked
+        self.refresh()
+        payload = ''.join(json.dumps(record) + '\n' for record in records)
+        with open(self._log_path(), 'a', encoding='utf-8') as log:
+            log.write(payload)
+        self._replay()
+
+    def add_candidates(self, candidates: List[Dict[str, Any]]) -> int:
+        """Add or replace candidates and return the number indexed"""
+        # Keep only the last occurrence of each candidate in this batch
+        batch = {}
+        for candidate in candidates:
+            candidate_id = candidate.get('candidate_id')
+            if candidate_id:
+                batch[str(candidate_id)] = candidate
+        if not batch:
+            return 0
+
+        # Canonical skills, as the matcher compares them with canonical job skills
+        extractor = get_skill_extractor()
+        self._append_records([{
+            'op': 'add',
+            'id': candidate_id,
+            'skills': extractor.canonicalize_all(candidate.get('skills')),
+            'terms': self.count_terms(candidate.get('resume_text', ''))
+        } for candidate_id, candidate in batch.items()])
+        return len(batch)
+
+    def remove_candidates(self, candidate_ids: List[str]) -> int:
+        """Remove candidates and return the number that were indexed"""
+        with self._file_lock(), self._lock:
+            self.refresh()
+            removed = list(dict.fromkeys(str(cid) for cid in candidate_ids if str(cid) in self.id_index))
+            if removed:
+                self._write_records([{'op': 'remove', 'id': candidate_id} for candidate_id in removed])
+            return len(removed)
+
+    def rows_for(self, candidate_ids: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """Map candidate IDs to matrix rows, returning unknown IDs separately"""
+        rows = []
+        missing = []
+        for candidate_id in candidate_ids:
+            row = self.id_index.get(str(candidate_id))
+            if row is None:
+                missing.append(candidate_id)
+            else:
+                rows.append(row)
+        return np.asarray(rows, dtype=np.int64), missing
+
+    def live_rows(self) -> np.ndarray:
+        """Rows of every candidate that has not been removed or replaced"""
+        live = np.ones(self.n_rows, dtype=bool)
+        live[list(self.tombstones)] = False
+        return np.flatnonzero(live)
+
+    def skill_index(self) -> SkillIndex:
+        """Inverted skill index over every row, built on first use and extended as rows are appended"""
+        with self._lock:
+            if self._skill_index is None:
+                self._skill_index = SkillIndex.from_skill_lists(self.candidate_skills)
+            return self._skill_index
+
+    def _widen(self, matrix: sp.csr_matrix) -> sp.csr_matrix:
+        """View of a segment with as many columns as the current vocabulary"""
+        return sp.csr_matrix((matrix.data, matrix.indices, matrix.indptr),
+                             shape=(matrix.shape[0], len(self.vocabulary)), copy=False)
+
+    def _delta_matrix(self) -> sp.csr_matrix:
+        if self._delta is None:
+            self._delta = sp.csr_matrix(
+                (np.asarray(self._delta_data, dtype=np.float32), np.asarray(self._delta_indices, dtype=np.int32),
+                 np.asarray(self._delta_indptr, dtype=np.int64)),
+                shape=(self.n_delta, len(self.vocabulary))
+            )
+        return self._widen(self._delta)
+
+    def row_matrix(self, rows: np.ndarray) -> sp.csr_matrix:
+        """Raw term counts of the given rows, gathered from the base and delta segments"""
+        with self._lock:
+            rows = np.asarray(rows, dtype=np.int64)
+            n_base = self.matrix.shape[0]
+            in_base = rows < n_base
+            if in_base.all():
+                return self._widen(self.matrix[rows])
+
+            base_positions = np.flatnonzero(in_base)
+            delta_positions = np.flatnonzero(~in_base)
+            stacked = sp.vstack([
+                self._widen(self.matrix[rows[base_positions]]),
+                self._delta_matrix()[rows[delta_positions] - n_base]
+            ], format='csr')
+            order = np.concatenate([base_positions, delta_positions])
+            return stacked[np.argsort(order, kind='stable')]
+
+    @staticmethod
+    def _squared_norms(matrix: sp.csr_matrix, idf_squared: np.ndarray) -> np.ndarray:
+        """Squared IDF-weighted row norms, a block of rows at a time
+
+        Reads the (memory-mapped) arrays directly rather than materializing a
+        squared copy of the matrix.
+        """
+        indptr = np.asarray(matrix.indptr, dtype=np.int64)
+        squared = np.empty(matrix.shape[0], dtype=np.float64)
+        for start in range(0, matrix.shape[0], NORM_BLOCK_ROWS):
+            end = min(start + NORM_BLOCK_ROWS, matrix.shape[0])
+            first, last = indptr[start], indptr[end]
+            weighted = np.square(matrix.data[first:last], dtype=np.float64) * idf_squared[matrix.indices[first:last]]
+            cumulative = np.concatenate([[0.0], np.cumsum(weighted)])
+            squared[start:end] = cumulative[indptr[start + 1:end + 1] - first] - cumulative[indptr[start:end] - first]
+        return squared
+
+    def candidate_norms(self) -> np.ndarray:
+        """L2 norms of the IDF-weighted vectors of every row"""
+        with self._lock:
+            idf_squared = self.idf() ** 2
+            return np.sqrt(np.concatenate([
+                self._squared_norms(self.matrix, idf_squared),
+                self._squared_norms(self._delta_matrix(), idf_squared)
+            ]))
+
+    def row_norms(self, rows: np.ndarray, matrix: Optional[sp.csr_matrix] = None) -> np.ndarray:
+        """L2 norms of the IDF-weighted vectors of the given rows
+
+        Every add or remove changes the IDF of every term (through the
+        document count), so norms are not cached: they take one pass over the
+        rows' terms, as scoring those rows does, and writes cost nothing on
+        the next read. ``matrix`` may pass ``row_matrix(rows)`` if already
+        gathered.
+        """
+        with self._lock:
+            if matrix is None:
+                matrix = self.row_matrix(rows)
+            return np.sqrt(self._squared_norms(matrix, self.idf() ** 2))
+
+    def query_matrix(self, texts: List[str]) -> sp.csr_matrix:
+        """Vectorize query texts for scoring against raw candidate counts
+
+        Each row holds the normalised TF-IDF query weights multiplied by IDF
+        once more, so that ``query_matrix @ row_matrix(rows).T / row_norms(rows)``
+        is the cosine similarity.
+        """
+        return self.query_matrix_from_counts([self.count_terms(text) for text in texts])
+
+    def query_matrix_from_counts(self, term_counts: List[Dict[str, int]]) -> sp.csr_matrix:
+        """query_matrix for documents already reduced to term counts"""
+        with self._lock:
+            idf = self.idf()
+            unseen_idf = np.log(1.0 + self.n_docs) + 1.0
+            indptr = [0]
+            indices = []
+            data = []
+
+            for counts in term_counts:
+                row_indices = []
+                row_weights = []
+                unseen_norm = 0.0
+                for term, count in counts.items():
+                    index = self.vocabulary.get(term)
+                    if index is None:
+                        # Terms outside the vocabulary still count towards the query norm
+                        unseen_norm += (count * unseen_idf) ** 2
+                    else:
+                        row_indices.append(index)
+                        row_weights.append(count * idf[index])
+
+                weights = np.asarray(row_weights, dtype=np.float64)
+                norm = np.sqrt(weights @ weights + unseen_norm)
+                if norm > 0 and row_indices:
+                    indices.extend(row_indices)
+                    data.extend(weights * idf[row_indices] / norm)
+                indptr.append(len(indices))
+
+            return sp.csr_matrix(
+                (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+                shape=(len(term_counts), len(self.vocabulary))
+            )
+
+    def similarities(self, text: str, rows: Optional[np.ndarray] = None,
+                     term_counts: Optional[Dict[str, int]] = None) -> np.ndarray:
+        """Cosine similarity between a text (or its precomputed term counts) and stored candidates
+
+        All live candidates are scored unless rows are given.
+        """
+        with self._lock:
+            rows = self.live_rows() if rows is None else rows
+            if len(rows) == 0 or not self.vocabulary:
+                return np.zeros(len(rows))
+
+            query = self.query_matrix_from_counts([term_counts if term_counts is not None else self.count_terms(text)])
+            matrix = self.row_matrix(rows)
+            norms = self.row_norms(rows, matrix)
+
+            # One sparse matrix-vector product over the selected rows
+            dots = np.asarray((matrix @ query.T).todense()).ravel()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scores = np.where(norms > 0, dots / norms, 0.0)
+            return scores
+
+    def _current_generation(self) -> int:
+        """Read the generation pointer written by the last save"""
+        try:
+            with open(os.path.join(self.directory, CURRENT_FILE)) as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return 0
+
+    def save(self):
+        """Compact the live rows into a new generation and switch the pointer to it
+
+        Compactions in every process run one at a time. The snapshot is taken
+        under the lock, but the arrays are written without it, so queries and
+        appends continue meanwhile; records appended after the snapshot are
+        carried over into the new generation's log while appends are held off.
+        """
+        with self._compaction_lock, self._file_lock(COMPACTION_LOCK):
+            with self._lock:
+                self.refresh()
+                previous, offset = self.generation, self._log_offset
+                live = self.live_rows()
+                matrix = self.row_matrix(live)
+                candidate_ids = [self.candidate_ids[row] for row in live]
+                candidate_skills = [self.candidate_skills[row] for row in live]
+                terms = np.empty(len(self.vocabulary), dtype=object)
+                terms[list(self.vocabulary.values())] = list(self.vocabulary.keys())
+
+            # Recount document frequencies and drop terms no live candidate uses
+            doc_freq = np.bincount(matrix.indices, minlength=len(terms)).astype(np.int64)
+            used = np.flatnonzero(doc_freq)
+            remap = np.full(len(terms), -1, dtype=np.int32)
+            remap[used] = np.arange(len(used), dtype=np.int32)
+            # SciPy keeps int32 indptr as loaded (so still memory-mapped) but would copy int64 down to int32
+            indptr_dtype = np.int32 if matrix.nnz <= np.iinfo(np.int32).max else np.int64
+            arrays = {
+                'data': np.asarray(matrix.data, dtype=np.float32),
+                'indices': remap[matrix.indices],
+                'indptr': np.asarray(matrix.indptr, dtype=indptr_dtype),
+                'doc_freq': doc_freq[used]
+            }
+
+            os.makedirs(self.directory, exist_ok=True)
+            generation = max(previous, self._current_generation()) + 1
+            while True:
+                # Claim the directory exclusively, so concurrent compactions in other processes never share one
+                path = os.path.join(self.directory, f'generation-{generation}')
+                try:
+                    os.mkdir(path)
+                    break
+                except FileExistsError:
+                    generation += 1
+            for name, array in arrays.items():
+                np.save(os.path.join(path, f'{name}.npy'), array)
+
+            with open(os.path.join(path, 'meta.json'), 'w') as f:
+                json.dump({
+                    'shape': [len(live), len(used)],
+                    'vocabulary': {terms[index]: position for position, index in enumerate(used)},
+                    'candidate_ids': candidate_ids,
+                    'candidate_skills': candidate_skills
+                }, f)
+
+            with self._file_lock(), self._lock:
+                # Carry over complete records appended since the snapshot
+                tail = b''
+                if previous:
+                    try:
+                        with open(self._log_path(previous), 'rb') as log:
+                            log.seek(offset)
+                            tail = log.read()
+                    except FileNotFoundError:
+                        pass
+                with open(os.path.join(path, DELTA_LOG), 'wb') as log:
+                    log.write(tail[:tail.rfind(b'\n') + 1])
+
+                # Atomically switch readers to the new generation
+                pointer = os.path.join(self.directory, f'{CURRENT_FILE}.tmp')
+                with open(pointer, 'w') as f:
+                    f.write(str(generation))
+                os.replace(pointer, os.path.join(self.directory, CURRENT_FILE))
+
+                self.load()
+                self._remove_old_generations()
+
+    def needs_compaction(self) -> bool:
+        """Whether the delta log has grown large relative to the base segment"""
+        pending = self.n_delta + len(self.tombstones)
+        return pending > max(Config.VECTOR_COMPACTION_MIN_ROWS,
+                             Config.VECTOR_COMPACTION_RATIO * self.matrix.shape[0])
+
+    def compact(self, force: bool = False) -> bool:
+        """Fold the delta log into a new generation if it is due"""
+        self.refresh()
+        if not (force or self.needs_compaction()):
+            return False
+        self.save()
+        return True
+
+    def start_compaction(self, interval: float):
+        """Start the background compaction thread once per process"""
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            self._stop.clear()
+            self._compactor = threading.Thread(
+                target=self._compact_loop, args=(interval,), name='vector-compaction', daemon=True
+            )
+            self._compactor.start()
+
+    def stop_compaction(self, timeout: Optional[float] = None):
+        """Ask the background compaction thread to exit"""
+        self._stop.set()
+        if self._compactor is not None:
+            self._compactor.join(timeout)
+            self._compactor = None
+
+    def _compact_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.compact()
+            except Exception:
+                pass  # Retried on the next tick
+
+    def _remove_old_generations(self):
+        """Delete every generation but the current one; called with the compaction lock held
+
+        Processes that still map the old files keep them alive until they reload.
+        """
+        for name in os.listdir(self.directory):
+            if name.startswith('generation-') and name != f'generation-{self.generation}':
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def load(self, mmap: bool = True) -> bool:
+        """Load the current generation from disk, memory-mapping the base arrays"""
+        with self._lock:
+            while True:
+                generation = self._current_generation()
+                if generation == 0:
+                    return False
+
+                path = os.path.join(self.directory, f'generation-{generation}')
+                mmap_mode = 'r' if mmap else None
+                try:
+                    arrays = {
+                        name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode)
+                        for name in ARRAY_FILES
+                    }
+                    with open(os.path.join(path, 'meta.json')) as f:
+                        meta = json.load(f)
+                    break
+                except FileNotFoundError:
+                    # Readers take no file lock, so a compaction in another process may have
+                    # switched generations and removed this one since the pointer was read
+                    if self._current_generation() == generation:
+                        raise
+
+            self._reset()
+            self.vocabulary = meta['vocabulary']
+            self.candidate_ids = meta['candidate_ids']
+            self.candidate_skills = meta['candidate_skills']
+            self.id_index = {cid: i for i, cid in enumerate(self.candidate_ids)}
+            self._doc_freq = np.array(arrays['doc_freq'], dtype=np.int64)  # Updated in place
+            self.matrix = sp.csr_matrix(
+                (arrays['data'], arrays['indices'], arrays['indptr']),
+                shape=tuple(meta['shape']), copy=False
+            )
+            self.generation = generation
+            self._replay()
+            return True
+
+    def refresh(self) -> bool:
+        """Reload if another process has saved a newer generation, or apply its new log records"""
+        with self._lock:
+            if self._current_generation() > self.generation:
+                return self.load()
+            return self.generation > 0 and self._replay() > 0
+
+
+# Initialize candidate store
+candidate_store = CandidateVectorStore(os.path.join(Config.PROCESSED_FOLDER, 'candidate_vectors'))
@@ -0,0 +1,142 @@
+"""
+Text Vectorization Engines
+"""
+
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+class DocumentFrequency:
+    """Document-frequency statistic that can be computed per shard and merged"""
+
+    def __init__(self, n_features: int):
+        self.doc_freq = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+
+    @classmethod
+    def from_counts(cls, counts: sp.csr_matrix) -> 'DocumentFrequency':
+        """Statistic of the documents in a term-count matrix"""
+        stats = cls(counts.shape[1])
+        stats.update(counts)
+        return stats
+
+    def update(self, counts: sp.csr_matrix):
+        """Add the documents of a term-count matrix"""
+        counts = sp.csr_matrix(counts)
+        counts.sum_duplicates()
+        self.doc_freq += np.bincount(counts.indices[counts.data > 0], minlength=len(self.doc_freq))
+        self.n_docs += counts.shape[0]
+
+    def merge(self, other: 'DocumentFrequency') -> 'DocumentFrequency':
+        """Combine with a statistic computed over other documents"""
+        if len(other.doc_freq) != len(self.doc_freq):
+            raise ValueError('Cannot merge document frequencies of different dimensions')
+        self.doc_freq += other.doc_freq
+        self.n_docs += other.n_docs
+        return self
+
+    def idf(self) -> np.ndarray:
+        """Smooth IDF, as computed by scikit-learn's TfidfTransformer"""
+        return np.log((1.0 + self.n_docs) / (1.0 + self.doc_freq)) + 1.0
+
+
+_shard_pool = None
+_shard_pool_workers = 0
+_shard_pool_lock = threading.Lock()
+
+
+def get_shard_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the long-lived process pool that vectorizes hashing shards, sized to ``workers``"""
+    global _shard_pool, _shard_pool_workers
+    with _shard_pool_lock:
+        if _shard_pool is None or _shard_pool_workers != workers:
+            if _shard_pool is not None:
+                _shard_pool.shutdown(wait=False)
+            _shard_pool, _shard_pool_workers = ProcessPoolExecutor(max_workers=workers), workers
+        return _shard_pool
+
+
+def reset_shard_pool(broken: Optional[ProcessPoolExecutor] = None):
+    """Discard the shard pool, e.g. after it broke or in a forked worker where its processes do not exist
+
+    With ``broken``, the pool is only discarded if it is still the current one.
+    """
+    global _shard_pool
+    with _shard_pool_lock:
+        if broken is not None and _shard_pool is not broken:
+            return
+        pool, _shard_pool = _shard_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _vectorize_shard(n_features: int, texts: List[str]) -> Tuple[sp.csr_matrix, DocumentFrequency]:
+    """Vectorize one shard in a worker process"""
+    counts = HashingEngine(n_features).transform(texts)
+    return counts, DocumentFrequency.from_counts(counts)
+
+
+class HashingEngine:
+    """Stateless feature-hashing vectorizer
+
+    Texts map to term counts in a fixed ``n_features``-dimensional space
+    without fitting a vocabulary, so any shard can be vectorized anywhere and
+    the results stacked. IDF weighting is kept apart as a DocumentFrequency.
+    """
+
+    def __init__(self, n_features: int = 2 ** 20):
+        self.n_features = n_features
+        self._vectorizer = HashingVectorizer(
+            n_features=n_features, stop_words='english', alternate_sign=False, norm=None
+        )
+
+    def transform(self, texts: List[str]) -> sp.csr_matrix:
+        """Raw term counts"""
+        return self._vectorizer.transform([text or '' for text in texts]).tocsr()
+
+    def vectorize_shards(self, texts: List[str], workers: int = 1,
+                         shard_size: int = 1000) -> Tuple[sp.csr_matrix, DocumentFrequency]:
+        """Vectorize texts in independent shards, in parallel when workers > 1
+
+        Only batches of more than one shard go to the shared process pool;
+        smaller ones are vectorized in this process, where nothing has to be
+        pickled across.
+        """
+        shards = [texts[i:i + shard_size] for i in range(0, len(texts), shard_size)]
+        results = None
+        if workers > 1 and len(shards) > 1:
+            pool = get_shard_pool(workers)
+            try:
+                results = list(pool.map(_vectorize_shard, [self.n_features] * len(shards), shards))
+            except BrokenProcessPool:
+                # Start afresh next time; vectorize this batch here
+                reset_shard_pool(broken=pool)
+        if results is None:
+            results = [_vectorize_shard(self.n_features, shard) for shard in shards]
+
+        stats = DocumentFrequency(self.n_features)
+        for _, shard_stats in results:
+            stats.merge(shard_stats)
+        matrix = sp.vstack([counts for counts, _ in results], format='csr') if results else \
+            sp.csr_matrix((0, self.n_features))
+        return matrix, stats
+
+    @staticmethod
+    def weight(counts: sp.csr_matrix, stats: Optional[DocumentFrequency] = None) -> sp.csr_matrix:
+        """L2-normalised TF or TF-IDF vectors"""
+        if stats is not None:
+            counts = counts @ sp.diags(stats.idf())
+        return normalize(counts, norm='l2', copy=True).tocsr()
+
+    def fit_transform(self, texts: List[str], use_idf: bool = True, workers: int = 1,
+                      shard_size: int = 1000) -> sp.csr_matrix:
+        """Normalised vectors, with IDF merged from the shards of the texts themselves"""
+        counts, stats = self.vectorize_shards(texts, workers, shard_size)
+        return self.weight(counts, stats if use_idf else None)
@@ -12,17 +12,63 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 16777216))
     
+    # Server Configuration
+    SERVER_HOST = os.getenv('FLASK_HOST', '0.0.0.0')
+    SERVER_PORT = int(os.getenv('FLASK_PORT', 5000))
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', os.cpu_count() or 1))
+    SERVER_THREADS = int(os.getenv('SERVER_THREADS', 4))
+    SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', 120))
+    
     # File Upload Configuration
     UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'src/data/uploads')
     PROCESSED_FOLDER = os.getenv('PROCESSED_FOLDER', 'src/data/processed')
+    EXTRACTION_WORKERS = int(os.getenv('EXTRACTION_WORKERS', os.cpu_count() or 1))
+    EXTRACTION_TIMEOUT = float(os.getenv('EXTRACTION_TIMEOUT', 30))
+    EXTRACTION_KILL_GRACE = float(os.getenv('EXTRACTION_KILL_GRACE', 10))
+    PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', 50))
+    PDF_MAX_CHARS = int(os.getenv('PDF_MAX_CHARS', 200000))
+    UPLOAD_SNIFF_BYTES = int(os.getenv('UPLOAD_SNIFF_BYTES', 8192))
+    PERSIST_UPLOADS = os.getenv('PERSIST_UPLOADS', 'True').lower() == 'true'
+    EXTRACTION_CACHE_MAX_BYTES = int(os.getenv('EXTRACTION_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+    INGESTION_WORKERS = int(os.getenv('INGESTION_WORKERS', 2))
+    INGESTION_POLL_INTERVAL = float(os.getenv('INGESTION_POLL_INTERVAL', 1.0))
     
     # API Configuration
     API_VERSION = os.getenv('API_VERSION', 'v1')
     API_RATE_LIMIT = int(os.getenv('API_RATE_LIMIT', 100))
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+    METRICS_MULTIPROCESS_DIR = os.getenv('METRICS_MULTIPROCESS_DIR', '')
+    METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 5.0))
+    
+    # NLP Configuration
+    NLTK_AUTO_DOWNLOAD = os.getenv('NLTK_AUTO_DOWNLOAD', 'False').lower() == 'true'
+    NLP_PRELOAD = os.getenv('NLP_PRELOAD', 'False').lower() == 'true'
+    NLP_BATCH_SIZE = int(os.getenv('NLP_BATCH_SIZE', 256))
+    NLP_N_PROCESS = int(os.getenv('NLP_N_PROCESS', 1))
+    SKILL_TAXONOMY_PATH = os.getenv('SKILL_TAXONOMY_PATH', '')
+    KEYWORD_SCORING = os.getenv('KEYWORD_SCORING', 'frequency')
+    BM25_K1 = float(os.getenv('BM25_K1', 1.2))
+    BM25_B = float(os.getenv('BM25_B', 0.75))
     
     # ML Configuration
     MIN_MATCH_THRESHOLD = float(os.getenv('MIN_MATCH_THRESHOLD', 0.3))
     MAX_RECOMMENDATIONS = int(os.getenv('MAX_RECOMMENDATIONS', 10))
+    MATCH_JOB_BLOCK_SIZE = int(os.getenv('MATCH_JOB_BLOCK_SIZE', 256))
+    MATCH_CANDIDATE_BLOCK_SIZE = int(os.getenv('MATCH_CANDIDATE_BLOCK_SIZE', 4096))
+    VECTORIZER_ENGINE = os.getenv('VECTORIZER_ENGINE', 'tfidf')
+    TFIDF_MAX_FEATURES = int(os.getenv('TFIDF_MAX_FEATURES', 0))
+    HASHING_N_FEATURES = int(os.getenv('HASHING_N_FEATURES', 2 ** 20))
+    HASHING_USE_IDF = os.getenv('HASHING_USE_IDF', 'True').lower() == 'true'
+    HASHING_WORKERS = int(os.getenv('HASHING_WORKERS', 1))
+    HASHING_SHARD_SIZE = int(os.getenv('HASHING_SHARD_SIZE', 1000))
+    VECTOR_COMPACTION_INTERVAL = float(os.getenv('VECTOR_COMPACTION_INTERVAL', 300))
+    VECTOR_COMPACTION_RATIO = float(os.getenv('VECTOR_COMPACTION_RATIO', 0.2))
+    VECTOR_COMPACTION_MIN_ROWS = int(os.getenv('VECTOR_COMPACTION_MIN_ROWS', 1000))
+    RESULT_CACHE_ENABLED = os.getenv('RESULT_CACHE_ENABLED', 'True').lower() == 'true'
+    RESULT_CACHE_MAX_BYTES = int(os.getenv('RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    RESULT_CACHE_TTL = float(os.getenv('RESULT_CACHE_TTL', 0))
+    RESULT_CACHE_DISK = os.getenv('RESULT_CACHE_DISK', 'False').lower() == 'true'
+    RESULT_CACHE_DISK_MAX_ENTRIES = int(os.getenv('RESULT_CACHE_DISK_MAX_ENTRIES', 100000))
     
     @classmethod
     def to_dict(cls) -> Dict[str, Any]:
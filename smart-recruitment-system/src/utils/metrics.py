@@ -0,0 +1,233 @@
+"""
+In-process latency metrics
+"""
+
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.config import Config
+
+PROMETHEUS_MIMETYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Bucket upper bounds in seconds, growing by sqrt(2) from 10us to about 95s
+BUCKETS: List[float] = [1e-5 * 2 ** (i / 2) for i in range(47)]
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram with interpolated quantiles"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        index = bisect.bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'counts': list(self.counts), 'count': self.count, 'sum': self.sum, 'max': self.max}
+
+    def merge(self, snapshot: Dict[str, Any]):
+        """Add the observations of another histogram's snapshot"""
+        with self._lock:
+            self.counts = [a + b for a, b in zip(self.counts, snapshot['counts'])]
+            self.count += snapshot['count']
+            self.sum += snapshot['sum']
+            self.max = max(self.max, snapshot['max'])
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation within its bucket"""
+        with self._lock:
+            counts, count, largest = list(self.counts), self.count, self.max
+        if count == 0:
+            return None
+
+        rank = q * count
+        cumulative = 0
+        for index, bucket_count in enumerate(counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = BUCKETS[index - 1] if index > 0 else 0.0
+                upper = BUCKETS[index] if index < len(BUCKETS) else lower
+                return min(lower + (upper - lower) * (rank - cumulative) / bucket_count, largest)
+            cumulative += bucket_count
+        return largest
+
+
+class MetricsRegistry:
+    """Named, labelled latency histograms rendered in the Prometheus text format
+
+    With a ``multiprocess_dir``, each process writes snapshots of its
+    histograms there, and rendering merges the snapshots of every process, so
+    a scrape of any worker reports the whole server.
+    """
+
+    def __init__(self, enabled: bool = True, multiprocess_dir: Optional[str] = None):
+        self.enabled = enabled
+        self.multiprocess_dir = multiprocess_dir
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram())
+        return histogram
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Record one duration"""
+        if self.enabled:
+            self.histogram(name, **labels).observe(seconds)
+
+    @contextmanager
+    def _timed(self, name: str, labels: Dict[str, str]):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(name, **labels).observe(time.perf_counter() - start)
+
+    def span(self, stage: str):
+        """Time a named stage into stage_duration_seconds; a shared no-op when disabled"""
+        if not self.enabled:
+            return _NOOP
+        return self._timed('stage_duration_seconds', {'stage': stage})
+
+    def timed(self, stage: str):
+        """Decorator form of span, checking whether metrics are enabled on each call"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self._timed('stage_duration_seconds', {'stage': stage}):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def _snapshot_path(self) -> str:
+        return os.path.join(self.multiprocess_dir, f'metrics-{os.getpid()}.json')
+
+    def flush(self):
+        """Write this process's histograms to the multiprocess directory"""
+        if not self.multiprocess_dir:
+            return
+        with self._lock:
+            items = list(self._histograms.items())
+        snapshot = [[name, labels, histogram.snapshot()] for (name, labels), histogram in items]
+
+        os.makedirs(self.multiprocess_dir, exist_ok=True)
+        path = self._snapshot_path()
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(f'{path}.tmp', path)
+
+    def clear_multiprocess_dir(self):
+        """Drop snapshots left by a previous run; called once before workers start"""
+        if self.multiprocess_dir and os.path.isdir(self.multiprocess_dir):
+            for name in os.listdir(self.multiprocess_dir):
+                if name.startswith('metrics-'):
+                    os.remove(os.path.join(self.multiprocess_dir, name))
+
+    def start_flushing(self, interval: float):
+        """Flush snapshots periodically from a background thread, once per process"""
+        if not (self.enabled and self.multiprocess_dir):
+            return
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, args=(interval,),
+                                             name='metrics-flush', daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self, interval: float):
+        while True:
+            time.sleep(interval)
+            try:
+                self.flush()
+            except OSError:
+                pass  # Retried on the next tick
+
+    def _merged_histograms(self) -> Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram]:
+        """Histograms of every process that wrote to the multiprocess directory"""
+        self.flush()
+        merged: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+        for name in os.listdir(self.multiprocess_dir):
+            if not (name.startswith('metrics-') and name.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(self.multiprocess_dir, name)) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue  # Removed or replaced while listing
+            for metric, labels, histogram in snapshot:
+                key = (metric, tuple(tuple(label) for label in labels))
+                merged.setdefault(key, Histogram()).merge(histogram)
+        return merged
+
+    def render(self) -> str:
+        """Prometheus text exposition of every histogram as a summary"""
+        if self.multiprocess_dir:
+            items = sorted(self._merged_histograms().items())
+        else:
+            with self._lock:
+                items = sorted(self._histograms.items())
+
+        lines = []
+        seen = set()
+        for (name, labels), histogram in items:
+            metric = f'srs_{name}'
+            if metric not in seen:
+                seen.add(metric)
+                if name in self._help:
+                    lines.append(f'# HELP {metric} {self._help[name]}')
+                lines.append(f'# TYPE {metric} summary')
+
+            label_text = ','.join(f'{key}="{_escape(value)}"' for key, value in labels)
+            for q in QUANTILES:
+                value = histogram.quantile(q)
+                quantile_labels = ','.join(filter(None, [label_text, f'quantile="{q}"']))
+                lines.append(f'{metric}{{{quantile_labels}}} {"NaN" if value is None else repr(value)}')
+            suffix = f'{{{label_text}}}' if label_text else ''
+            lines.append(f'{metric}_sum{suffix} {histogram.sum!r}')
+            lines.append(f'{metric}_count{suffix} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+_NOOP = nullcontext()
+
+# Initialize metrics registry
+metrics = MetricsRegistry(enabled=Config.METRICS_ENABLED, multiprocess_dir=Config.METRICS_MULTIPROCESS_DIR or None)
+metrics.describe('http_request_duration_seconds', 'HTTP request latency by endpoint, method and status')
+metrics.describe('stage_duration_seconds', 'Latency of named processing stages')
@@ -0,0 +1,108 @@
+"""
+Response streaming utilities
+"""
+
+import codecs
+import json
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Set
+
+from flask import Response, request, stream_with_context
+
+try:
+    import orjson
+except ImportError:  # Optional fast path
+    orjson = None
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+def dumps(obj: Any) -> bytes:
+    """Compact JSON encoding, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return _encoder.encode(obj).encode('utf-8')
+
+def iter_json_array(stream: BinaryIO, chunk_size: int = 65536) -> Iterator[Any]:
+    """Yield the elements of a JSON array as they are read from a binary stream
+    
+    Only the element being decoded is held in memory. Raises ValueError if
+    the body is not a well-formed JSON array.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    buffer = ''
+    position = 0
+    eof = False
+    
+    def fill():
+        nonlocal buffer, position, eof
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + text_decoder.decode(chunk or b'', final=eof)
+        position = 0
+    
+    def next_char() -> str:
+        """Skip whitespace and return the next character, or '' at the end"""
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n':
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if eof:
+                return ''
+            fill()
+    
+    if next_char() != '[':
+        raise ValueError('Expected a JSON array')
+    position += 1
+    if next_char() == ']':
+        return
+    
+    while True:
+        next_char()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise ValueError(f'Invalid JSON array element: {e.msg}')
+                fill()
+                continue
+            if not eof and (end == len(buffer) or buffer[end] not in ' \t\r\n,]'):
+                fill()  # A number could continue in the next chunk
+                continue
+            break
+        position = end
+        yield value
+        
+        separator = next_char()
+        if separator == ']':
+            return
+        if separator != ',':
+            raise ValueError('Expected , or ] in JSON array')
+        position += 1
+
+def wants_ndjson() -> bool:
+    """Whether the client opted in to a streamed NDJSON response"""
+    return (request.args.get('stream', '').lower() == 'ndjson' or
+            request.accept_mimetypes.best == NDJSON_MIMETYPE)
+
+def excluded_fields() -> Set[str]:
+    """Fields the client asked to leave out, e.g. ?exclude=extracted_text"""
+    return {field.strip() for field in request.args.get('exclude', '').split(',') if field.strip()}
+
+def without_fields(record: Dict[str, Any], exclude: Set[str]) -> Dict[str, Any]:
+    """Copy of a record without the excluded fields"""
+    if not exclude:
+        return record
+    return {key: value for key, value in record.items() if key not in exclude}
+
+def ndjson_response(records: Iterable[Dict[str, Any]], exclude: Set[str] = frozenset()) -> Response:
+    """Stream records as newline-delimited JSON as they are produced"""
+    def generate():
+        for record in records:
+            yield dumps(without_fields(record, exclude)) + b'\n'
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
@@ -0,0 +1,19 @@
+"""
+Timing utilities
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+# Seconds spent in each startup stage, in the order they ran
+boot_timings: Dict[str, float] = {}
+
+@contextmanager
+def boot_stage(name: str):
+    """Record how long a startup stage takes"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        boot_timings[name] = round(time.perf_counter() - start, 6)
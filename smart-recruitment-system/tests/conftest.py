@@ -0,0 +1,17 @@
+"""
+Test configuration: point the services at a throwaway data directory before they are imported
+"""
+
+import os
+import sys
+import tempfile
+
+DATA_DIR = tempfile.mkdtemp(prefix='srs-tests-')
+os.environ['UPLOAD_FOLDER'] = os.path.join(DATA_DIR, 'uploads')
+os.environ['PROCESSED_FOLDER'] = os.path.join(DATA_DIR, 'processed')
+os.environ['PERSIST_UPLOADS'] = 'False'
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
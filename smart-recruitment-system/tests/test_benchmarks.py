@@ -0,0 +1,46 @@
+"""
+Tests for the benchmark suite and its synthetic corpus
+"""
+
+import json
+
+from corpus import generate_corpus
+from run_benchmarks import compare, main
+from services.file_processor import extract_text_from_docx, extract_text_from_pdf
+
+
+def test_corpus_is_deterministic_and_extractable(tmp_path):
+    first = generate_corpus(str(tmp_path / 'a'), resumes=3, jobs=2, seed=7)
+    second = generate_corpus(str(tmp_path / 'b'), resumes=3, jobs=2, seed=7)
+
+    assert first['candidates'] == second['candidates']
+    assert first['jobs'] == second['jobs']
+    assert len(first['files']['pdf']) == len(first['files']['docx']) == 3
+
+    words = first['candidates'][0]['resume_text'].split()
+    for text in (extract_text_from_pdf(first['files']['pdf'][0]), extract_text_from_docx(first['files']['docx'][0])):
+        assert words[0] in text and words[-1] in text
+
+
+def test_compare_flags_only_regressions_beyond_the_threshold():
+    baseline = {'benchmarks': {'fast': {'median': 1.0}, 'slow': {'median': 1.0}, 'gone': {'median': 1.0}}}
+    results = {'benchmarks': {'fast': {'median': 1.1}, 'slow': {'median': 1.5}, 'new': {'median': 9.0},
+                              'skipped': {'skipped': 'missing data'}}}
+
+    assert compare(results, baseline, threshold=0.2) == ['slow']
+
+
+def test_main_writes_results_and_fails_on_a_regression(tmp_path):
+    output = tmp_path / 'results.json'
+    args = ['--resumes', '4', '--jobs', '2', '--formats', 'txt', '--repeat', '1', '--warmup', '0',
+            '--filter', 'ml.', 'recommendation.', '--output', str(output)]
+
+    assert main(args) == 0
+    results = json.loads(output.read_text())
+    assert set(results['benchmarks']) >= {'ml.match_job_with_candidates', 'recommendation.generate_report'}
+
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps({'benchmarks': {
+        name: {'median': result['median'] / 100} for name, result in results['benchmarks'].items()
+    }}))
+    assert main(args + ['--baseline', str(baseline)]) == 1
@@ -0,0 +1,34 @@
+"""
+Tests for the keyword corpus statistics
+"""
+
+import math
+
+import pytest
+
+from services.corpus_stats import CorpusStats
+
+
+@pytest.fixture
+def stats(tmp_path):
+    return CorpusStats(str(tmp_path / 'corpus.db'))
+
+
+def test_bm25_scores_stay_finite_over_empty_documents(stats):
+    # Documents with no terms of three letters or more, once stop words are removed
+    stats.add_documents([('empty', ''), ('stop', 'the and of'), ('short', 'a b c')])
+    assert stats.totals() == (3, 0)
+
+    keywords, = stats.top_keywords(['python developer python'], scoring='bm25')
+
+    assert [term for term, _ in keywords] == ['python', 'developer']
+    assert all(math.isfinite(score) and score > 0 for _, score in keywords)
+
+
+def test_bm25_ranks_terms_rare_in_the_corpus_first(stats):
+    stats.add_documents((f'doc_{i}', 'developer team') for i in range(10))
+    stats.add_documents([('rare', 'kubernetes developer')])
+
+    keywords, = stats.top_keywords(['developer kubernetes'], scoring='bm25')
+
+    assert [term for term, _ in keywords] == ['kubernetes', 'developer']
@@ -0,0 +1,227 @@
+"""
+Tests for the file processing service
+"""
+
+import io
+import signal
+import time
+import uuid
+import zipfile
+
+import pytest
+
+from corpus import write_docx, write_pdf
+from services import file_processor
+from services.extraction_cache import extraction_cache
+from utils.config import Config
+
+
+def fake_extract(content, file_type):
+    """Stand-in for _timed_extract_text that is slow, hangs or gets stuck on request"""
+    if b'stuck' in content:
+        # Like a parse stuck in C code, which the worker's alarm cannot interrupt
+        signal.signal(signal.SIGALRM, signal.SIG_IGN)
+        time.sleep(60)
+    if b'hang' in content:
+        time.sleep(60)
+    if b'slow' in content:
+        time.sleep(2.5)
+    return content.decode('latin-1').split('\n', 1)[1], 0.0
+
+
+def pdf(body):
+    # Unique per test run, so the extraction cache never answers
+    return f'%PDF-1.4\n{body} {uuid.uuid4().hex}'.encode('latin-1')
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    file_processor.reset_extraction_pool(terminate=True)
+    monkeypatch.setattr(file_processor, '_timed_extract_text', fake_extract)
+    yield
+    file_processor.reset_extraction_pool(terminate=True)
+
+
+def test_hung_extraction_fails_alone_in_its_worker(fake_pool, monkeypatch):
+    monkeypatch.setattr(Config, 'EXTRACTION_TIMEOUT', 3)
+    uploads = [('a.pdf', pdf('python developer')), ('hang.pdf', pdf('hang')), ('b.pdf', pdf('java developer'))]
+
+    pool = file_processor.get_extraction_pool()
+    results = list(file_processor.process_resumes(uploads, '/unused'))
+
+    assert results[0]['extracted_text'].startswith('python developer')
+    assert results[1] == {'filename': 'hang.pdf', 'error': 'Text extraction timed out'}
+    assert results[2]['extracted_text'].startswith('java developer')
+
+    # The worker's own deadline fired, so no worker (or other request's work) was lost
+    assert file_processor.get_extraction_pool() is pool
+    assert all(process.is_alive() for process in pool._processes.values())
+
+    later = list(file_processor.process_resumes([('c.pdf', pdf('sql analyst'))], '/unused'))
+    assert later[0]['extracted_text'].startswith('sql analyst')
+
+
+def test_stuck_worker_is_killed_and_lost_files_resubmitted_together(fake_pool, monkeypatch):
+    monkeypatch.setattr(Config, 'EXTRACTION_WORKERS', 4)
+    monkeypatch.setattr(Config, 'EXTRACTION_TIMEOUT', 3)
+    monkeypatch.setattr(Config, 'EXTRACTION_KILL_GRACE', 0.5)
+    # Three slow files finish before the stuck worker is killed; the next three are still running
+    uploads = [('stuck.pdf', pdf('stuck'))] + [(f'slow{i}.pdf', pdf(f'slow {i}')) for i in range(6)]
+
+    pool = file_processor.get_extraction_pool()
+    results = file_processor.process_resumes(uploads, '/unused')
+    workers = list(pool._processes.values())
+    finished = [(time.monotonic(), result) for result in results]
+
+    assert finished[0][1] == {'filename': 'stuck.pdf', 'error': 'Text extraction timed out'}
+    assert [result['extracted_text'].split(' ')[:2] for _, result in finished[1:]] == [
+        ['slow', str(i)] for i in range(6)]
+    assert file_processor.get_extraction_pool() is not pool
+    for process in workers:
+        process.join(5)
+        assert not process.is_alive()
+
+    # The lost files ran side by side on the new pool rather than one per wait
+    retried = [at for at, _ in finished[4:]]
+    assert retried[-1] - retried[0] < 1.0
+
+
+def make_pdf(tmp_path, pages, lines_per_page=5):
+    text = '\n'.join(f'page {page} line {line}' for page in range(pages) for line in range(lines_per_page))
+    path = tmp_path / 'resume.pdf'
+    write_pdf(str(path), text, lines_per_page=lines_per_page)
+    return path.read_bytes()
+
+
+def test_pdf_extraction_stops_at_page_limit(tmp_path):
+    content = make_pdf(tmp_path, pages=6)
+
+    pages = list(file_processor.iter_pdf_text(content, max_pages=2, max_chars=0))
+    assert len(pages) == 2
+    assert 'page 1 line 4' in pages[1]
+
+    text = file_processor.extract_text_from_pdf(content, max_pages=0, max_chars=0)
+    assert 'page 0 line 0' in text and 'page 5 line 4' in text
+
+
+def test_pdf_extraction_truncates_at_character_limit(tmp_path):
+    content = make_pdf(tmp_path, pages=6)
+    full = list(file_processor.iter_pdf_text(content, max_pages=0, max_chars=0))
+
+    limit = len(full[0]) + 10
+    pages = list(file_processor.iter_pdf_text(content, max_pages=0, max_chars=limit))
+    assert len(pages) == 2
+    assert pages[0] == full[0]
+    assert pages[1] == full[1][:10]
+    assert sum(map(len, pages)) == limit
+
+
+def test_duplicate_in_batch_survives_cache_eviction(fake_pool, monkeypatch):
+    monkeypatch.setattr(extraction_cache, 'max_bytes', 100)
+    a, b = pdf('python developer'), pdf('java developer')
+
+    results = list(file_processor.process_resumes([('a.pdf', a), ('b.pdf', b), ('copy.pdf', a)], '/unused'))
+
+    # Storing b evicted a, so the copy must come from the first result
+    assert extraction_cache.get(extraction_cache.digest(a)) is None
+    assert results[2]['filename'] == 'copy.pdf'
+    assert results[2]['cached'] is True
+    assert results[2]['file_id'] == results[0]['file_id']
+    assert results[2]['extracted_text'] == results[0]['extracted_text']
+
+
+def test_duplicate_of_failed_file_reports_the_same_error(fake_pool, monkeypatch):
+    monkeypatch.setattr(Config, 'EXTRACTION_TIMEOUT', 1)
+    hung = pdf('hang')
+
+    results = list(file_processor.process_resumes([('a.pdf', hung), ('copy.pdf', hung)], '/unused'))
+
+    assert results == [{'filename': 'a.pdf', 'error': 'Text extraction timed out'},
+                       {'filename': 'copy.pdf', 'error': 'Text extraction timed out'}]
+
+
+def make_docx(tmp_path, text='Python developer'):
+    path = tmp_path / 'resume.docx'
+    write_docx(str(path), text, ['python'])
+    return path.read_bytes()
+
+
+def make_zip(name):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr(name, 'not a word document')
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('use_magic', [True, False])
+def test_file_type_is_sniffed_from_content(tmp_path, monkeypatch, use_magic):
+    if not use_magic:
+        monkeypatch.setattr(file_processor, 'magic', None)
+    elif file_processor.magic is None:
+        pytest.skip('python-magic is not available')
+
+    assert file_processor.detect_file_type(make_pdf(tmp_path, pages=1)) == 'pdf'
+    assert file_processor.detect_file_type(make_docx(tmp_path)) == 'docx'
+    assert file_processor.detect_file_type(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b'\0' * 512) == 'doc'
+    assert file_processor.detect_file_type(make_zip('data.csv')) is None
+    assert file_processor.detect_file_type(b'MZ\x90\x00 not a resume') is None
+
+
+def test_misnamed_upload_is_routed_by_its_content(fake_pool, tmp_path):
+    results = list(file_processor.process_resumes(
+        [('resume.docx', pdf('python developer')), ('notes.pdf', b'plain text, not a resume')], '/unused'
+    ))
+
+    assert results[0]['file_type'] == 'pdf'
+    assert results[0]['declared_type'] == 'docx'
+    assert results[1] == {'filename': 'notes.pdf', 'error': 'Unsupported file type'}
+
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+MC_NS = 'http://schemas.openxmlformats.org/markup-compatibility/2006'
+
+
+def make_wordml_docx(body):
+    document = (f'<?xml version="1.0" encoding="UTF-8"?>'
+                f'<w:document xmlns:w="{W_NS}" xmlns:mc="{MC_NS}"><w:body>{body}</w:body></w:document>')
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('[Content_Types].xml', '<Types/>')
+        archive.writestr('word/document.xml', document)
+    return buffer.getvalue()
+
+
+def test_fast_docx_path_reads_the_same_text_as_python_docx(tmp_path):
+    from docx import Document
+
+    document = Document()
+    document.sections[0].header.paragraphs[0].text = 'Jane Doe - Resume'
+    document.add_paragraph('Senior Python developer')
+    table = document.add_table(rows=2, cols=2)
+    for row, (skill, level) in zip(table.rows, [('python', 'Advanced'), ('sql', 'Intermediate')]):
+        row.cells[0].text, row.cells[1].text = skill, level
+    document.add_paragraph('Built data pipelines')
+    path = tmp_path / 'resume.docx'
+    document.save(str(path))
+    content = path.read_bytes()
+
+    fast = file_processor._extract_docx_xml(content)
+    slow = file_processor._extract_docx_object_model(content)
+
+    assert fast.splitlines() == ['Jane Doe - Resume', 'Senior Python developer', 'python', 'Advanced',
+                                 'sql', 'Intermediate', 'Built data pipelines']
+    assert sorted(filter(None, fast.splitlines())) == sorted(filter(None, slow.splitlines()))
+
+
+def test_fast_docx_path_handles_breaks_and_text_box_fallbacks():
+    body = (
+        '<w:p><w:r><w:t>Skills:</w:t><w:tab/><w:t>Python</w:t><w:br/><w:t>SQL</w:t></w:r></w:p>'
+        '<w:p><w:r><mc:AlternateContent>'
+        '<mc:Choice><w:txbxContent><w:p><w:r><w:t>Boxed text</w:t></w:r></w:p></w:txbxContent></mc:Choice>'
+        '<mc:Fallback><w:txbxContent><w:p><w:r><w:t>Boxed text</w:t></w:r></w:p></w:txbxContent></mc:Fallback>'
+        '</mc:AlternateContent></w:r><w:r><w:t>Anchor</w:t></w:r></w:p>'
+    )
+
+    text = file_processor.extract_text_from_docx(make_wordml_docx(body))
+
+    assert text == 'Skills:\tPython\nSQL\nBoxed text\nAnchor'
@@ -0,0 +1,70 @@
+"""
+Tests for the asynchronous ingestion queue
+"""
+
+import time
+
+import pytest
+
+from services.ingestion import IngestionQueue
+from utils.config import Config
+
+
+def slow_handler(payloads):
+    for payload in payloads:
+        time.sleep(0.8)
+        yield {'value': payload['value'] * 2}
+
+
+def wait_for(queue, ingestion_id, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = queue.get_status(ingestion_id)
+        if status['status'] in ('completed', 'failed'):
+            return status
+        time.sleep(0.05)
+    raise AssertionError('ingestion job did not finish')
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'INGESTION_POLL_INTERVAL', 0.05)
+    queue = IngestionQueue(str(tmp_path / 'ingestion.db'), str(tmp_path / 'staging'), workers=1, lease_seconds=0.6)
+    queue.register_handler('double', slow_handler)
+    yield queue
+    queue.stop(5)
+
+
+def test_lease_is_renewed_while_a_long_item_runs(queue):
+    other = IngestionQueue(queue.db_path, queue.staging_dir, workers=1, lease_seconds=0.6)
+    ingestion_id = queue.submit('double', [{'value': 1}, {'value': 2}, {'value': 3}])
+    while queue.get_status(ingestion_id, include_items=False)['status'] == 'queued':
+        time.sleep(0.01)
+
+    # Every item outlasts the lease; another worker must still never take the job over
+    deadline = time.time() + 1.5
+    while time.time() < deadline:
+        assert other._claim() is None
+        time.sleep(0.05)
+
+    status = wait_for(queue, ingestion_id)
+    assert status['status'] == 'completed'
+    assert [item['result'] for item in status['items']] == [{'value': 2}, {'value': 4}, {'value': 6}]
+
+
+def test_worker_survives_an_error_outside_the_handler(queue, monkeypatch):
+    claim = queue._claim
+    calls = []
+
+    def flaky_claim():
+        calls.append(None)
+        if len(calls) == 1:
+            raise RuntimeError('database is gone')
+        return claim()
+
+    monkeypatch.setattr(queue, '_claim', flaky_claim)
+    ingestion_id = queue.submit('double', [{'value': 5}])
+
+    status = wait_for(queue, ingestion_id)
+    assert status['status'] == 'completed'
+    assert status['items'][0]['result'] == {'value': 10}
@@ -0,0 +1,97 @@
+"""
+Tests for stored job postings
+"""
+
+import functools
+import json
+import uuid
+
+import pytest
+from flask import Flask
+
+from services import file_processor
+from services.file_processor import file_bp
+from services.job_store import job_store
+from services.ml_matcher import ml_bp
+
+
+def make_job(job_id, skills=('Python', ' SQL ')):
+    return {
+        'job_id': job_id,
+        'title': 'Python developer',
+        'description': 'Backend python and sql work',
+        'requirements': {'skills': list(skills), 'experience': '3+ years'},
+        'salary_range': {'min': 1, 'max': 2}
+    }
+
+
+def make_app():
+    app = Flask(__name__)
+    app.register_blueprint(file_bp, url_prefix='/api/files')
+    app.register_blueprint(ml_bp, url_prefix='/api/ml')
+    return app.test_client()
+
+
+def test_stored_job_keeps_uploaded_skills_and_matches_like_inline():
+    client = make_app()
+    job = make_job(f'job_{uuid.uuid4().hex}')
+    assert client.post('/api/files/upload-jobs', json=[job]).status_code == 200
+
+    stored = job_store.get_job(job['job_id'])
+    assert stored['requirements'] == job['requirements']
+    assert stored['features']['skills'] == ['python', 'sql']
+
+    candidates = [
+        {'candidate_id': 'cand_0', 'resume_text': 'python sql developer', 'skills': ['Python', ' SQL ']},
+        {'candidate_id': 'cand_1', 'resume_text': 'java developer', 'skills': ['python']}
+    ]
+    by_id = client.post('/api/ml/match', json={'job_id': job['job_id'], 'candidates': candidates})
+    inline = client.post('/api/ml/match', json={'job': job, 'candidates': candidates})
+
+    assert by_id.status_code == inline.status_code == 200
+    assert by_id.get_json()['matches'] == inline.get_json()['matches']
+
+
+def test_stored_job_skills_match_candidate_skills_canonically():
+    client = make_app()
+    job = make_job(f'job_{uuid.uuid4().hex}', skills=['Python', 'PostgreSQL'])
+    client.post('/api/files/upload-jobs', json=[job])
+
+    candidates = [{'candidate_id': 'cand_0', 'resume_text': 'python developer', 'skills': ['python', 'postgres']}]
+    response = client.post('/api/ml/match', json={'job_id': job['job_id'], 'candidates': candidates})
+
+    match, = response.get_json()['matches']
+    assert match['matched_skills'] == ['python', 'postgresql']
+    assert match['missing_skills'] == []
+    assert match['skill_match_score'] == 1.0
+
+
+@pytest.mark.parametrize('requirements', ['python', {'skills': 'python'}, {'skills': [], 'education': 3}])
+def test_malformed_requirements_are_rejected_per_posting(requirements):
+    prefix = uuid.uuid4().hex
+    jobs = [make_job(f'{prefix}_0'), dict(make_job(f'{prefix}_1'), requirements=requirements), make_job(f'{prefix}_2')]
+
+    response = make_app().post('/api/files/upload-jobs', json=jobs)
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['job_ids'] == [f'{prefix}_0', f'{prefix}_2']
+    assert [error['position'] for error in body['errors']] == [1]
+    assert job_store.get_job(f'{prefix}_1') is None
+
+
+def test_malformed_upload_reports_postings_already_stored(monkeypatch):
+    monkeypatch.setattr(file_processor, 'store_job_postings',
+                        functools.partial(file_processor.store_job_postings, chunk_size=2))
+    prefix = uuid.uuid4().hex
+    jobs = [make_job(f'{prefix}_{i}') for i in range(3)]
+    body = json.dumps(jobs)[:-1] + ', {"job_id": '
+
+    response = make_app().post('/api/files/upload-jobs', data=body, content_type='application/json')
+
+    assert response.status_code == 400
+    stored = response.get_json()['job_ids']
+    assert stored == [job['job_id'] for job in jobs[:2]]
+    found, missing = job_store.get_jobs([job['job_id'] for job in jobs])
+    assert [job['job_id'] for job in found] == stored
+    assert missing == [jobs[2]['job_id']]
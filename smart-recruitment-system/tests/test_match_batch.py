@@ -0,0 +1,52 @@
+"""
+Tests for the columnar match result batch
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from models.match_batch import MatchResultBatch
+from services.ml_matcher import MLMatcher
+
+SKILLS = ['python', 'java', 'sql', 'aws', 'docker']
+
+
+def make_inputs(n=40, seed=0):
+    rng = random.Random(seed)
+    job = {'job_id': 'job_001', 'requirements': {'skills': ['python', 'sql', 'aws']}}
+    candidate_ids = [f'cand_{i:03d}' for i in range(n)]
+    skill_lists = [rng.sample(SKILLS, rng.randint(0, 4)) for _ in range(n)]
+    similarities = np.array([rng.random() for _ in range(n)])
+    return job, candidate_ids, skill_lists, similarities
+
+
+def test_batch_rows_match_per_pair_records():
+    matcher = MLMatcher()
+    job, candidate_ids, skill_lists, similarities = make_inputs()
+
+    batch = MatchResultBatch.from_scores(job, candidate_ids, skill_lists, similarities, matcher.weights)
+
+    for match, candidate_id, skills, similarity in zip(batch.iter_dicts(), candidate_ids, skill_lists, similarities):
+        expected = matcher._match_record(job, candidate_id, skills, similarity)
+        assert match['candidate_id'] == candidate_id
+        for field in ('match_score', 'skill_match_score', 'overall_match_score'):
+            assert match[field] == pytest.approx(expected[field])
+        assert sorted(match['matched_skills']) == sorted(expected['matched_skills'])
+        assert sorted(match['missing_skills']) == sorted(expected['missing_skills'])
+
+
+def test_top_k_and_threshold_only_reorder_records():
+    job, candidate_ids, skill_lists, similarities = make_inputs()
+    batch = MatchResultBatch.from_scores(job, candidate_ids, skill_lists, similarities, MLMatcher().weights)
+    full = batch.sorted().to_dicts()
+
+    assert batch.top_k(7).to_dicts() == full[:7]
+    assert batch.top_k(0).to_dicts() == []
+    assert batch.top_k(len(batch) + 5).to_dicts() == full
+
+    kept = batch.threshold(0.5).sorted().to_dicts()
+    assert kept == [match for match in full if match['overall_match_score'] >= 0.5]
+    # Skill lists are shared, not copied, by the derived batches
+    assert batch.threshold(0.5).skill_indices is batch.skill_indices
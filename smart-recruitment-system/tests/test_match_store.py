@@ -0,0 +1,66 @@
+"""
+Tests for the match store
+"""
+
+import pytest
+
+from models.match_batch import MatchResultBatch
+from services.match_store import MatchStore, decode_cursor, encode_cursor
+
+WEIGHTS = {'text': 0.4, 'skills': 0.4, 'experience': 0.1, 'education': 0.1}
+
+
+def make_batch(n=25):
+    job = {'job_id': 'job_001', 'requirements': {'skills': ['python', 'sql', 'aws']}}
+    candidate_ids = [f'cand_{i:03d}' for i in range(n)]
+    skills = [['python', 'sql', 'aws'][:i % 4] for i in range(n)]
+    # Few distinct scores, so pages split runs of ties
+    similarities = [(i % 3) / 4 for i in range(n)]
+    return MatchResultBatch.from_scores(job, candidate_ids, skills, similarities, WEIGHTS)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MatchStore(str(tmp_path / 'matches.db'))
+
+
+def test_keyset_pages_round_trip_the_full_ranking(store):
+    batch = make_batch()
+    assert store.save_batch(batch) == len(batch)
+
+    expected = sorted(((match['overall_match_score'], match['candidate_id']) for match in batch.iter_dicts()),
+                      reverse=True)
+    pages, cursor = [], None
+    while True:
+        page, cursor = store.top_matches('job_001', limit=4, cursor=cursor)
+        pages.append(page)
+        if cursor is None:
+            break
+
+    assert all(len(page) == 4 for page in pages[:-1])
+    assert [(match['overall_match_score'], match['candidate_id']) for page in pages for match in page] == expected
+    assert list(store.iter_matches('job_001', page_size=3)) == [match for page in pages for match in page]
+
+
+def test_saved_rows_keep_their_scores_and_skills(store):
+    batch = make_batch(6)
+    store.save_batch(batch)
+
+    stored = {match['candidate_id']: match for match in store.iter_matches('job_001')}
+    for match in batch.iter_dicts():
+        assert stored[match['candidate_id']] == {key: match[key] for key in stored[match['candidate_id']]}
+
+
+def test_save_batch_writes_only_the_returned_rows(store):
+    batch = make_batch().top_k(5)
+
+    assert store.save_batch(batch) == 5
+    assert store.count('job_001') == 5
+    assert {match['candidate_id'] for match in store.iter_matches('job_001')} == \
+        {match['candidate_id'] for match in batch.iter_dicts()}
+
+
+def test_cursor_encoding():
+    assert decode_cursor(encode_cursor(0.75, 'cand_007')) == (0.75, 'cand_007')
+    with pytest.raises(ValueError):
+        decode_cursor('not a cursor')
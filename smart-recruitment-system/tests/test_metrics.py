@@ -0,0 +1,71 @@
+"""
+Tests for the latency metrics registry
+"""
+
+import multiprocessing
+
+from utils.metrics import Histogram, MetricsRegistry
+
+
+def parse(text):
+    values = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            values[name] = float(value)
+    return values
+
+
+def test_quantiles_and_totals():
+    registry = MetricsRegistry()
+    for i in range(1, 101):
+        registry.observe('stage_duration_seconds', i / 1000, stage='parse')
+
+    values = parse(registry.render())
+    assert values['srs_stage_duration_seconds_count{stage="parse"}'] == 100
+    assert abs(values['srs_stage_duration_seconds_sum{stage="parse"}'] - 5.05) < 1e-9
+    # Buckets grow by sqrt(2), so interpolated quantiles are within that factor
+    assert 0.05 / 2 ** 0.5 <= values['srs_stage_duration_seconds{stage="parse",quantile="0.5"}'] <= 0.05 * 2 ** 0.5
+
+
+def test_histogram_merge_adds_observations():
+    first, second = Histogram(), Histogram()
+    first.observe(0.001)
+    second.observe(0.5)
+    second.observe(2.0)
+
+    first.merge(second.snapshot())
+
+    assert first.count == 3
+    assert first.sum == 2.501
+    assert first.max == 2.0
+    assert first.quantile(0.99) == 2.0
+
+
+def observe_in_worker(directory):
+    registry = MetricsRegistry(multiprocess_dir=directory)
+    for _ in range(3):
+        registry.observe('http_request_duration_seconds', 0.2, endpoint='/api/ml/match')
+    registry.flush()
+
+
+def test_render_merges_every_worker(tmp_path):
+    directory = str(tmp_path / 'metrics')
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=observe_in_worker, args=(directory,)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(30)
+        assert worker.exitcode == 0
+
+    registry = MetricsRegistry(multiprocess_dir=directory)
+    registry.observe('http_request_duration_seconds', 0.1, endpoint='/api/ml/match')
+    values = parse(registry.render())
+
+    assert values['srs_http_request_duration_seconds_count{endpoint="/api/ml/match"}'] == 7
+    assert abs(values['srs_http_request_duration_seconds_sum{endpoint="/api/ml/match"}'] - 1.3) < 1e-9
+
+    registry.clear_multiprocess_dir()
+    registry.reset()
+    assert parse(registry.render()) == {}
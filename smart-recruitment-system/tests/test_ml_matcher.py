@@ -0,0 +1,193 @@
+"""
+Tests for the ML matching service
+"""
+
+import random
+import uuid
+
+import numpy as np
+from flask import Flask
+
+from services import ml_matcher, vectorizers
+from services.match_store import MatchStore
+from services.ml_matcher import MLMatcher, ml_bp
+from services.result_cache import result_cache
+from services.vectorizers import DocumentFrequency, HashingEngine
+from utils.config import Config
+
+SKILLS = ['python', 'java', 'sql', 'aws', 'docker', 'react']
+WORDS = ['python', 'java', 'developer', 'cloud', 'data', 'api', 'frontend', 'backend', 'team']
+
+
+def make_candidates(n, seed=0):
+    rng = random.Random(seed)
+    return [{
+        'candidate_id': f'cand_{i:03d}',
+        'resume_text': ' '.join(rng.choices(WORDS, k=25)),
+        'skills': rng.sample(SKILLS, rng.randint(0, 4))
+    } for i in range(n)]
+
+
+def make_jobs(n, seed=1):
+    rng = random.Random(seed)
+    return [{
+        'job_id': f'job_{i:03d}',
+        'title': 'Engineer',
+        'description': ' '.join(rng.choices(WORDS, k=10)),
+        'requirements': {'skills': rng.sample(SKILLS, 3)}
+    } for i in range(n)]
+
+
+def ranking(results):
+    return [[(match['candidate_id'], round(match['overall_match_score'], 12)) for match in result['matches']]
+            for result in results]
+
+
+def test_batch_similarity_agrees_with_per_pair_scores():
+    matcher = MLMatcher(engine='tfidf')
+    job_text = 'Platform engineer with kubernetes and python'
+    # Over a thousand filler terms, each more frequent in the pool than the job's rare skill
+    fillers = [f'filler{i:04d}' for i in range(1200)]
+    texts = [' '.join(fillers[i::40]) * 3 for i in range(40)]
+    texts[7] += ' kubernetes'
+    texts[19] += ' python'
+
+    pairs = np.array([matcher.calculate_similarity(job_text, text) for text in texts])
+    batch = matcher.calculate_batch_similarity(job_text, texts)
+
+    # Pool-wide IDF rescales scores, but a candidate shares terms with the job exactly when it did per pair
+    assert np.array_equal(batch > 0, pairs > 0)
+    assert batch[7] > 0 and batch[19] > 0
+    # A pool of one candidate is the pair itself
+    for text in (texts[7], texts[19], texts[0]):
+        assert np.isclose(matcher.calculate_batch_similarity(job_text, [text])[0],
+                          matcher.calculate_similarity(job_text, text))
+
+
+def test_blocked_top_k_does_not_depend_on_block_sizes(monkeypatch):
+    matcher = MLMatcher()
+    jobs, candidates = make_jobs(7), make_candidates(50)
+
+    expected = ranking(matcher.match_jobs_batch(jobs, candidates=candidates, top_k=5))
+    monkeypatch.setattr(Config, 'MATCH_JOB_BLOCK_SIZE', 2)
+    monkeypatch.setattr(Config, 'MATCH_CANDIDATE_BLOCK_SIZE', 3)
+
+    assert ranking(matcher.match_jobs_batch(jobs, candidates=candidates, top_k=5)) == expected
+
+
+def test_blocked_top_k_is_the_head_of_the_full_ranking():
+    matcher = MLMatcher()
+    jobs, candidates = make_jobs(3), make_candidates(40)
+
+    full = matcher.match_jobs_batch(jobs, candidates=candidates, top_k=len(candidates))
+    top = matcher.match_jobs_batch(jobs, candidates=candidates, top_k=5)
+
+    for full_result, top_result in zip(full, top):
+        scores = [match['overall_match_score'] for match in full_result['matches']]
+        assert scores == sorted(scores, reverse=True)
+        assert ranking([top_result]) == ranking([dict(full_result, matches=full_result['matches'][:5])])
+
+
+def test_hashing_engine_shards_merge_to_the_unsharded_vectors():
+    texts = [candidate['resume_text'] for candidate in make_candidates(23)]
+    engine = HashingEngine(2 ** 12)
+
+    counts = engine.transform(texts)
+    expected = engine.weight(counts, DocumentFrequency.from_counts(counts))
+
+    for workers, shard_size in [(1, 5), (2, 4), (1, 1000)]:
+        vectors = engine.fit_transform(texts, workers=workers, shard_size=shard_size)
+        assert abs(vectors - expected).max() < 1e-12
+
+
+def test_hashing_shard_pool_is_reused_across_calls():
+    texts = [candidate['resume_text'] for candidate in make_candidates(12)]
+    engine = HashingEngine(2 ** 12)
+    vectorizers.reset_shard_pool()
+
+    engine.fit_transform(texts, workers=2, shard_size=4)
+    pool = vectorizers.get_shard_pool(2)
+    workers = set(pool._processes)
+    assert workers
+    engine.fit_transform(texts, workers=2, shard_size=4)
+    assert vectorizers.get_shard_pool(2) is pool
+    assert set(pool._processes) == workers
+
+    vectorizers.reset_shard_pool()
+    assert vectorizers.get_shard_pool(2) is not pool
+    vectorizers.reset_shard_pool()
+
+
+def test_hashing_matcher_scores_do_not_depend_on_sharding(monkeypatch):
+    jobs, candidates = make_jobs(3), make_candidates(30)
+    matcher = MLMatcher(engine='hashing')
+    whole = matcher.match_jobs_batch(jobs, candidates=candidates, top_k=10)
+
+    monkeypatch.setattr(Config, 'HASHING_SHARD_SIZE', 4)
+    assert ranking(matcher.match_jobs_batch(jobs, candidates=candidates, top_k=10)) == ranking(whole)
+
+
+def test_engine_is_not_part_of_store_backed_cache_keys():
+    tfidf, hashing = MLMatcher(engine='tfidf'), MLMatcher(engine='hashing')
+
+    assert tfidf.fingerprint('3:120') == hashing.fingerprint('3:120')
+    assert tfidf.fingerprint() != hashing.fingerprint()
+
+
+def make_client():
+    app = Flask(__name__)
+    app.register_blueprint(ml_bp, url_prefix='/api/ml')
+    return app.test_client()
+
+
+def match_payload(candidates, **overrides):
+    job = dict(make_jobs(1)[0], job_id=f'job_{uuid.uuid4().hex}')
+    return dict({'job': job, 'candidates': candidates, 'top_k': 5}, **overrides)
+
+
+def test_match_cache_key_ignores_candidate_order_case_and_whitespace():
+    client = make_client()
+    candidates = make_candidates(12)
+    payload = match_payload(candidates)
+    variant = dict(payload, job=dict(payload['job'], description='  ' + payload['job']['description'].upper()),
+                   candidates=[dict(candidate, resume_text=candidate['resume_text'].replace(' ', '\n  '),
+                                    skills=list(reversed(candidate['skills'])))
+                               for candidate in reversed(candidates)])
+
+    first = client.post('/api/ml/match', json=payload).get_json()
+    hits = result_cache.hits + result_cache.disk_hits
+    cached = client.post('/api/ml/match', json=variant).get_json()
+    assert result_cache.hits + result_cache.disk_hits == hits + 1
+    assert cached == first
+
+    # The variant scores the same when computed afresh
+    result_cache.invalidate()
+    fresh = client.post('/api/ml/match', json=variant).get_json()
+    assert sorted(ranking([fresh])[0]) == sorted(ranking([first])[0])
+
+    changed = dict(payload, job=dict(payload['job'], requirements={'skills': ['react']}))
+    hits = result_cache.hits + result_cache.disk_hits
+    client.post('/api/ml/match', json=changed)
+    assert result_cache.hits + result_cache.disk_hits == hits
+
+
+def test_cache_hit_rewrites_its_rows_to_the_match_store(tmp_path, monkeypatch):
+    client = make_client()
+    payload = match_payload(make_candidates(8))
+    job_id = payload['job']['job_id']
+    expected = client.post('/api/ml/match', json=payload).get_json()['matches']
+
+    # A reset store, then other rows for the job (another filter) and a stale score for a returned candidate
+    store = MatchStore(str(tmp_path / 'matches.db'))
+    monkeypatch.setattr(ml_matcher, 'match_store', store)
+    stale = dict(expected[0], overall_match_score=0.0)
+    store.save_matches([stale, dict(expected[0], candidate_id='cand_other', overall_match_score=0.01)])
+
+    hits = result_cache.hits + result_cache.disk_hits
+    client.post('/api/ml/match', json=payload)
+    assert result_cache.hits + result_cache.disk_hits == hits + 1
+
+    stored = {match['candidate_id']: match['overall_match_score']
+              for match in store.top_matches(job_id, limit=20)[0]}
+    assert stored == dict({match['candidate_id']: match['overall_match_score'] for match in expected},
+                          cand_other=0.01)
@@ -0,0 +1,121 @@
+"""
+Tests for the NLP service
+"""
+
+import threading
+import time
+
+import nltk
+import pytest
+
+from services import nlp_engine
+from utils.config import Config
+
+
+@pytest.fixture
+def no_models(monkeypatch):
+    monkeypatch.setattr(nlp_engine, '_models', {})
+
+
+def test_models_load_lazily_and_once(no_models):
+    assert nlp_engine._models == {}
+    calls = []
+
+    def loader():
+        calls.append(None)
+        time.sleep(0.05)
+        return object()
+
+    threads = [threading.Thread(target=nlp_engine._get_model, args=('slow', loader)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert nlp_engine._get_model('slow', loader) is nlp_engine._models['slow']
+
+
+def test_warmup_reports_missing_nltk_data_without_downloading(no_models, monkeypatch):
+    def missing(resource):
+        raise LookupError(resource)
+
+    def download(*args, **kwargs):
+        raise AssertionError('downloaded at startup')
+
+    monkeypatch.setattr(Config, 'NLTK_AUTO_DOWNLOAD', False)
+    monkeypatch.setattr(nltk.data, 'find', missing)
+    monkeypatch.setattr(nltk, 'download', download)
+
+    timings = nlp_engine.warmup(include_spacy=False, ignore_missing=True)
+
+    assert not timings['stop_words']['loaded']
+    assert 'python -m nltk.downloader stopwords' in timings['stop_words']['error']
+    assert timings['skill_extractor']['loaded']
+    assert 'stop_words' not in nlp_engine._models
+
+    with pytest.raises(LookupError):
+        nlp_engine.warmup(include_spacy=False)
+
+
+def test_app_boots_without_loading_models(no_models, monkeypatch):
+    from main import create_app
+
+    monkeypatch.setattr(Config, 'NLP_PRELOAD', False)
+    client = create_app(background_workers=False).test_client()
+
+    timings = client.get('/health/startup').get_json()
+    assert 'load_candidate_store' in timings['boot_timings']
+    assert 'nlp_warmup' not in timings['boot_timings']
+    assert nlp_engine._models == {}
+
+
+class CountingLemmatizer:
+    def __init__(self):
+        self.calls = []
+
+    def lemmatize(self, token):
+        self.calls.append(token)
+        return token[:-1] if token.endswith('s') else token
+
+
+@pytest.fixture
+def fake_nltk(monkeypatch):
+    lemmatizer = CountingLemmatizer()
+    monkeypatch.setattr(nlp_engine, 'get_tokenizer', lambda: str.split)
+    monkeypatch.setattr(nlp_engine, 'get_lemmatizer', lambda: lemmatizer)
+    monkeypatch.setattr(nlp_engine, 'get_stop_words', lambda: {'the', 'and', 'with'})
+    return lemmatizer
+
+
+def test_preprocess_batch_matches_one_document_at_a_time(fake_nltk):
+    texts = ['Built the APIs, and services!', 'Deployed services with Docker', '', None]
+
+    batched = nlp_engine.preprocess_batch(texts)
+
+    assert batched == [nlp_engine.preprocess_batch([text])[0] for text in texts]
+    assert batched[0] == ['built', 'api', 'service']
+    assert batched[2] == [] and batched[3] == []
+
+
+def test_preprocess_batch_lemmatizes_each_distinct_token_once(fake_nltk):
+    nlp_engine.preprocess_batch(['services services apis', 'apis and services'])
+
+    assert sorted(fake_nltk.calls) == ['apis', 'services']
+
+
+def test_preprocess_batch_endpoint(fake_nltk):
+    from flask import Flask
+
+    app = Flask(__name__)
+    app.register_blueprint(nlp_engine.nlp_bp, url_prefix='/api/nlp')
+    client = app.test_client()
+
+    response = client.post('/api/nlp/preprocess-text-batch', json={'texts': ['Python developers', 'SQL reports']})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['total_documents'] == 2
+    assert [result['processed_tokens'] for result in body['results']] == [['python', 'developer'], ['sql', 'report']]
+
+    assert client.post('/api/nlp/preprocess-text-batch', json={'texts': []}).status_code == 400
+    assert client.post('/api/nlp/preprocess-text-batch', json={'texts': ['x'], 'engine': 'gensim'}).status_code == 400
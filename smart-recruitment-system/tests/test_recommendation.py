@@ -0,0 +1,46 @@
+"""
+Tests for the recommendation service
+"""
+
+import random
+
+import numpy as np
+
+from services.recommendation import REPORT_CATEGORIES, RecommendationEngine, ScoreSummary
+
+
+def make_matches(n, seed=0):
+    rng = random.Random(seed)
+    return [{'candidate_id': f'cand_{i:04d}', 'overall_match_score': rng.random()} for i in range(n)]
+
+
+def test_report_counts_match_a_full_pass_over_the_scores():
+    matches = make_matches(2000)
+    scores = [match['overall_match_score'] for match in matches]
+
+    # A generator: the report must not need the matches twice
+    report = RecommendationEngine().generate_recommendation_report(iter(matches))
+
+    assert report['summary']['total_candidates'] == len(scores)
+    assert abs(report['summary']['average_score'] - sum(scores) / len(scores)) < 1e-9
+    for name, min_score, max_score in REPORT_CATEGORIES:
+        expected = sum(1 for score in scores if score >= min_score and (max_score is None or score < max_score))
+        assert report['summary'][name] == expected
+        assert report['categories'][name]['count'] == expected
+    assert sum(bin_['count'] for bin_ in report['distribution']['histogram']) == len(scores)
+
+
+def test_quantiles_are_within_one_bin_of_numpy():
+    scores = [match['overall_match_score'] for match in make_matches(5000, seed=3)]
+    summary = ScoreSummary()
+    for score in scores:
+        summary.add(score)
+
+    for q in (0.25, 0.5, 0.75, 0.9):
+        assert abs(summary.quantile(q) - np.quantile(scores, q)) <= 1 / summary.fine_bins
+
+
+def test_empty_report():
+    report = RecommendationEngine().generate_recommendation_report(iter([]))
+    assert report['total_candidates'] == 0
+    assert report['recommendations']['count'] == 0
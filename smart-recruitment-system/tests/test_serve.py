@@ -0,0 +1,41 @@
+"""
+Tests for the production server entry point
+"""
+
+import gc
+
+import serve
+from utils.config import Config
+from utils.metrics import metrics
+
+
+def test_main_preloads_before_forking(monkeypatch):
+    calls = []
+    monkeypatch.setattr(metrics, 'multiprocess_dir', None)
+    monkeypatch.setattr(gc, 'freeze', lambda: calls.append('freeze'))
+    monkeypatch.setattr(serve, 'warmup', lambda **kwargs: calls.append('warmup') or {})
+    monkeypatch.setattr(serve.RecruitmentServer, 'run', lambda self: calls.append(('run', self)))
+
+    serve.main()
+
+    assert calls[:2] == ['warmup', 'freeze']
+    server = calls[2][1]
+    assert server.cfg.preload_app
+    assert server.cfg.workers == Config.SERVER_WORKERS
+    assert server.cfg.threads == Config.SERVER_THREADS
+    assert server.cfg.post_fork is serve.post_fork
+    assert server.load().name == 'main'
+    assert metrics.multiprocess_dir
+
+
+def test_post_fork_restarts_per_process_state(monkeypatch):
+    calls = []
+    monkeypatch.setattr(serve, 'reset_extraction_pool', lambda: calls.append('reset_extraction_pool'))
+    monkeypatch.setattr(serve, 'reset_shard_pool', lambda: calls.append('reset_shard_pool'))
+    monkeypatch.setattr(serve, 'start_background_workers', lambda: calls.append('start_background_workers'))
+    metrics.observe('stage_duration_seconds', 0.1, stage='copied.from.master')
+
+    serve.post_fork(server=None, worker=None)
+
+    assert calls == ['reset_extraction_pool', 'reset_shard_pool', 'start_background_workers']
+    assert 'copied.from.master' not in metrics.render()
@@ -0,0 +1,51 @@
+"""
+Tests for the skill extractor
+"""
+
+import re
+
+from services.skill_extractor import DEFAULT_TAXONOMY, SkillExtractor
+
+
+def reference_extract(extractor, text):
+    """Linear scan over every alias with word boundaries"""
+    text = ' '.join(text.lower().split())
+    found = {skill for alias, skill in extractor.aliases.items()
+             if re.search(r'(?<!\w)' + re.escape(alias) + r'(?!\w)', text)}
+    return sorted(found, key=extractor.skills.index)
+
+
+def test_matches_linear_scan_of_aliases():
+    extractor = SkillExtractor(DEFAULT_TAXONOMY)
+    texts = [
+        'Senior Python developer, AWS and k8s; some Machine   Learning and NLP.',
+        'JavaScript and TypeScript, no plain Java here',
+        ''
+    ]
+    for text in texts:
+        assert extractor.extract(text) == reference_extract(extractor, text)
+
+
+def test_longest_alias_wins():
+    extractor = SkillExtractor(DEFAULT_TAXONOMY)
+
+    # 'js' inside 'node.js' and 'react.js' is not reported separately
+    assert extractor.extract('Built REST APIs with Node.js, React.js and PostgreSQL on Google Cloud Platform') == [
+        'react', 'node.js', 'postgresql', 'gcp', 'rest api'
+    ]
+
+
+def test_word_boundaries_and_aliases():
+    extractor = SkillExtractor(DEFAULT_TAXONOMY)
+
+    assert extractor.extract('javascript') == ['javascript']
+    assert extractor.extract('reactjs, sklearn, postgres') == ['react', 'postgresql', 'scikit-learn']
+    assert extractor.extract('pythonic airflow') == []
+
+
+def test_custom_taxonomy_and_canonicalize():
+    extractor = SkillExtractor(['Go', {'name': 'Rust', 'aliases': ['rust-lang']}])
+
+    assert extractor.extract('rust-lang and go') == ['go', 'rust']
+    assert extractor.canonicalize(' RUST-lang ') == 'rust'
+    assert extractor.canonicalize('Elixir') == 'elixir'
@@ -0,0 +1,67 @@
+"""
+Tests for the inverted skill index
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from services import skill_index
+from services.skill_index import SkillIndex
+
+SKILLS = ['python', 'java', 'sql', 'aws', 'docker', 'react', 'go', 'rust']
+
+
+@pytest.fixture(params=['roaring', 'numpy'])
+def backend(request, monkeypatch):
+    if request.param == 'roaring':
+        if skill_index.BitMap is None:
+            pytest.skip('pyroaring is not installed')
+    else:
+        monkeypatch.setattr(skill_index, 'BitMap', None)
+    return request.param
+
+
+def make_skill_lists(n, seed=0):
+    rng = random.Random(seed)
+    return [rng.sample(SKILLS, rng.randint(0, 5)) for _ in range(n)]
+
+
+def reference_matches(job_skills, skill_lists, rows):
+    """The per-candidate set loop the index replaces"""
+    distinct = list(dict.fromkeys(job_skills))
+    return [[i for i, skill in enumerate(distinct) if skill in set(skill_lists[row])] for row in rows]
+
+
+def split(indices, offsets):
+    return [indices[offsets[i]:offsets[i + 1]].tolist() for i in range(len(offsets) - 1)]
+
+
+@pytest.mark.parametrize('incremental', [False, True])
+def test_index_agrees_with_the_set_loop(backend, incremental):
+    skill_lists = make_skill_lists(300)
+    if incremental:
+        index = SkillIndex.from_skill_lists(skill_lists[:100])
+        for row in range(100, len(skill_lists)):
+            index.add(row, skill_lists[row])
+    else:
+        index = SkillIndex.from_skill_lists(skill_lists)
+
+    rng = random.Random(1)
+    pools = [
+        np.arange(len(skill_lists)),
+        np.arange(40, 90),
+        np.array(sorted(rng.sample(range(len(skill_lists)), 120))),
+        np.array([rng.randrange(len(skill_lists)) for _ in range(80)]),  # Unsorted, with repeats
+        np.zeros(0, dtype=np.int64)
+    ]
+    for job_skills in (['python', 'sql', 'python', 'aws'], ['rust'], ['cobol', 'go'], []):
+        for rows in pools:
+            expected = reference_matches(job_skills, skill_lists, rows)
+
+            assert index.match_counts(job_skills, rows).tolist() == [len(matched) for matched in expected]
+            assert split(*index.matches(job_skills, rows)) == expected
+            for min_count in (0, 1, 2, 3):
+                kept = [row for row, matched in zip(rows.tolist(), expected) if len(matched) >= min_count]
+                assert index.filter(job_skills, min_count, rows).tolist() == kept
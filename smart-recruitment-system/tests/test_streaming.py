@@ -0,0 +1,50 @@
+"""
+Tests for NDJSON streaming and incremental JSON array parsing
+"""
+
+import io
+import json
+
+import pytest
+from flask import Flask
+
+from services.ml_matcher import ml_bp
+from utils.streaming import iter_json_array
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 65536])
+def test_iter_json_array_matches_json_loads(chunk_size):
+    values = [{'job_id': 'job_1', 'skills': ['c++', 'sql']}, 12345678901234567890, -0.5e-3, 'café ☃',
+              [], {}, None, True, [1, [2, [3]]]]
+    body = ('\ufeff [ ' + ' ,\n'.join(json.dumps(value, ensure_ascii=False) for value in values) + ' ] ').encode('utf-8')
+
+    assert list(iter_json_array(io.BytesIO(body), chunk_size=chunk_size)) == values
+
+
+@pytest.mark.parametrize('body', [b'{"jobs": []}', b'[1, 2', b'[1 2]', b'[1, }'])
+def test_iter_json_array_rejects_malformed_bodies(body):
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.BytesIO(body), chunk_size=2))
+
+
+def test_match_streams_ndjson_records():
+    app = Flask(__name__)
+    app.register_blueprint(ml_bp, url_prefix='/api/ml')
+    payload = {
+        'job': {'title': 'Python developer', 'description': 'python sql', 'requirements': {'skills': ['python']}},
+        'candidates': [
+            {'candidate_id': f'cand_{i}', 'resume_text': text, 'skills': skills}
+            for i, (text, skills) in enumerate([('python sql developer', ['python']), ('java', []), ('sql', [])])
+        ],
+        'top_k': 2
+    }
+
+    response = app.test_client().post('/api/ml/match?stream=ndjson&exclude=missing_skills', json=payload)
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    records = [json.loads(line) for line in response.data.decode('utf-8').splitlines()]
+    assert records[0] == {'type': 'summary', 'job_id': None, 'total_candidates': 3}
+    assert [record['type'] for record in records[1:]] == ['match', 'match']
+    assert records[1]['candidate_id'] == 'cand_0'
+    assert all('missing_skills' not in record for record in records)
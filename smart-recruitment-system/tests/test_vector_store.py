@@ -0,0 +1,172 @@
+"""
+Tests for the candidate vector store
+"""
+
+import multiprocessing
+import os
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from services.vector_store import CandidateVectorStore
+
+WORDS = ['python', 'java', 'developer', 'cloud', 'data', 'api', 'frontend', 'backend', 'team', 'sql']
+
+
+def make_candidates(start, n):
+    rng = np.random.default_rng(start)
+    return [{
+        'candidate_id': f'cand_{i:05d}',
+        'resume_text': ' '.join(rng.choice(WORDS, size=12)),
+        'skills': list(rng.choice(WORDS, size=2, replace=False))
+    } for i in range(start, start + n)]
+
+
+def reference_similarities(job_text, candidates):
+    """Cosine similarities from a TF-IDF fit over exactly the live candidates"""
+    vectorizer = TfidfVectorizer(stop_words='english')
+    matrix = vectorizer.fit_transform([candidate['resume_text'] for candidate in candidates])
+    query = vectorizer.transform([job_text])
+    return (matrix @ query.T).toarray().ravel()
+
+
+def test_append_compact_reload_keeps_scores(tmp_path):
+    store = CandidateVectorStore(str(tmp_path))
+    candidates = make_candidates(0, 40)
+    store.add_candidates(candidates[:25])
+    store.save()
+    store.add_candidates(candidates[25:])
+    store.remove_candidates(['cand_00003', 'cand_00030'])
+    live = [candidate for candidate in candidates if candidate['candidate_id'] not in ('cand_00003', 'cand_00030')]
+
+    job_text = 'python developer with cloud and sql'
+    rows, _ = store.rows_for([candidate['candidate_id'] for candidate in live])
+    expected = reference_similarities(job_text, live)
+    assert np.allclose(store.similarities(job_text, rows), expected)
+
+    store.compact(force=True)
+    reloaded = CandidateVectorStore(str(tmp_path))
+    assert reloaded.load()
+    assert len(reloaded) == len(live)
+    rows, missing = reloaded.rows_for([candidate['candidate_id'] for candidate in live])
+    assert not missing
+    assert np.allclose(reloaded.similarities(job_text, rows), expected)
+
+
+def test_candidate_norms_match_the_dense_computation(tmp_path):
+    store = CandidateVectorStore(str(tmp_path))
+    store.add_candidates(make_candidates(0, 30))
+    store.save()
+    store.add_candidates(make_candidates(30, 5))
+
+    matrix = store.row_matrix(np.arange(store.n_rows)).toarray()
+    expected = np.linalg.norm(matrix * store.idf(), axis=1)
+    assert np.allclose(store.candidate_norms(), expected)
+    rows = np.array([33, 2, 31, 2])
+    assert np.allclose(store.row_norms(rows), expected[rows])
+
+
+def test_scoring_after_a_write_only_reads_the_scored_rows(tmp_path, monkeypatch):
+    store = CandidateVectorStore(str(tmp_path))
+    candidates = make_candidates(0, 200)
+    store.add_candidates(candidates[:150])
+    store.save()
+    store.add_candidates(candidates[150:])
+    store.remove_candidates(['cand_00010'])
+
+    normed = []
+    squared_norms = CandidateVectorStore._squared_norms
+    monkeypatch.setattr(CandidateVectorStore, '_squared_norms',
+                        staticmethod(lambda matrix, idf_squared: normed.append(matrix.shape[0])
+                                     or squared_norms(matrix, idf_squared)))
+
+    ids = ['cand_00003', 'cand_00120', 'cand_00180']
+    rows, _ = store.rows_for(ids)
+    scores = store.similarities('python developer with cloud and sql', rows)
+
+    assert normed == [len(rows)]
+    live = [candidate for candidate in candidates if candidate['candidate_id'] != 'cand_00010']
+    expected = reference_similarities('python developer with cloud and sql', live)
+    positions = [i for i, candidate in enumerate(live) if candidate['candidate_id'] in ids]
+    assert np.allclose(scores, expected[positions])
+
+
+def test_candidate_skills_are_stored_canonically(tmp_path):
+    store = CandidateVectorStore(str(tmp_path))
+    store.add_candidates([{'candidate_id': 'cand_0', 'resume_text': 'python', 'skills': ['Python', ' postgres ', 'python']}])
+
+    assert store.candidate_skills == [['python', 'postgresql']]
+
+
+def is_memory_mapped(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def test_base_arrays_stay_memory_mapped(tmp_path):
+    store = CandidateVectorStore(str(tmp_path))
+    store.add_candidates(make_candidates(0, 10))
+    store.save()
+
+    assert store.matrix.indptr.dtype == np.int32
+    for array in (store.matrix.data, store.matrix.indices, store.matrix.indptr):
+        assert is_memory_mapped(array)
+
+
+def test_load_follows_a_generation_replaced_while_reading(tmp_path):
+    directory = str(tmp_path)
+    writer = CandidateVectorStore(directory)
+    writer.add_candidates(make_candidates(0, 5))
+    stale = writer.generation
+    writer.add_candidates(make_candidates(5, 5))
+    writer.save()
+    assert not os.path.exists(os.path.join(directory, f'generation-{stale}'))
+
+    # The pointer was read just before another process compacted
+    reader = CandidateVectorStore(directory)
+    pointers = iter([stale])
+    reader._current_generation = lambda: next(pointers, writer.generation)
+
+    assert reader.load()
+    assert reader.generation == writer.generation
+    assert len(reader) == 10
+
+
+def append_batches(directory, start, batches, size):
+    store = CandidateVectorStore(directory)
+    store.load()
+    for batch in range(batches):
+        store.add_candidates(make_candidates(start + batch * size, size))
+
+
+def compact_repeatedly(directory, times):
+    store = CandidateVectorStore(directory)
+    store.load()
+    for _ in range(times):
+        store.compact(force=True)
+
+
+def test_concurrent_appends_survive_compaction_in_other_processes(tmp_path):
+    directory = str(tmp_path)
+    store = CandidateVectorStore(directory)
+    store.add_candidates(make_candidates(0, 5))
+
+    context = multiprocessing.get_context('fork')
+    processes = [
+        context.Process(target=append_batches, args=(directory, 1000, 30, 5)),
+        context.Process(target=append_batches, args=(directory, 2000, 30, 5)),
+        context.Process(target=compact_repeatedly, args=(directory, 15)),
+        context.Process(target=compact_repeatedly, args=(directory, 15))
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(120)
+        assert process.exitcode == 0
+
+    reloaded = CandidateVectorStore(directory)
+    reloaded.load()
+    assert len(reloaded) == 5 + 2 * 30 * 5